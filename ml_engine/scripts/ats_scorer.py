@@ -0,0 +1,289 @@
+"""
+📊 CV Builder - Batch ATS Scorer
+Calcula o ATS score de milhares de textos contra todas as indústrias de uma vez
+
+Mesma semântica do calculateATSScore exportado para o backend:
+- keyword encontrada = substring (case-insensitive) do texto
+- must_have vale 3 pontos, strong vale 2
+- score = pontos / pontos máximos * 100 (máx. 100, arredondado)
+
+Em vez de um loop por keyword por texto, cada texto é percorrido uma vez
+pelo autómato de keywords (keyword_matcher.py) e o resultado forma uma
+matriz esparsa documento × keyword (presença) que é multiplicada pela
+matriz de pesos keyword × indústria.
+
+Uso:
+    python scripts/ats_scorer.py
+    python scripts/ats_scorer.py --input cvs.jsonl --field text --output scores.csv
+"""
+
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from keyword_matcher import KeywordMatcher
+from dataset_io import ATS_KEYWORDS_DIR, DATASETS_DIR, ML_ENGINE_DIR, find_dataset, iter_examples
+
+# Pesos por nível de keyword (iguais ao calculateATSScore)
+TIER_WEIGHTS = {
+    'must_have': 3,
+    'strong': 2,
+    'supporting': 0
+}
+
+# Mapeamento das listas dos arquivos por indústria (datasets/ats_keywords/*.json)
+# para os níveis do backend; as restantes listas são 'supporting'
+INDUSTRY_TIERS = {
+    'action_verbs.high_priority': 'must_have',
+    'action_verbs.medium_priority': 'strong',
+    'action_verbs.leadership': 'strong'
+}
+
+# Listas com placeholders ("reduziu CAC em X%") não são keywords literais
+IGNORED_CATEGORIES = {'metadata', 'quantifiable_terms'}
+
+def _iter_keyword_lists(data: dict, prefix: str = '') -> Iterator[Tuple[str, List[str]]]:
+    """Percorre listas de keywords em qualquer profundidade: (caminho, keywords)"""
+    for key, value in data.items():
+        if not prefix and key in IGNORED_CATEGORIES:
+            continue
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, list):
+            yield path, [keyword for keyword in value if isinstance(keyword, str) and keyword.strip()]
+        elif isinstance(value, dict):
+            yield from _iter_keyword_lists(value, path)
+
+class ATSScorer:
+    """Scorer vetorizado sobre os conjuntos de keywords de várias indústrias"""
+
+    def __init__(self, industries: Dict[str, Dict[str, List[str]]], weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            industries: {indústria: {nível: [keywords]}} com níveis de TIER_WEIGHTS
+            weights: pesos por nível (default: TIER_WEIGHTS)
+        """
+        self.weights = {**TIER_WEIGHTS, **(weights or {})}
+        self.industries = list(industries)
+        self.keywords = industries
+
+        # Vocabulário de keywords únicas (lowercase) e matriz de pesos keyword × indústria
+        vocabulary = {}
+        rows, cols, values = [], [], []
+        for col, industry in enumerate(self.industries):
+            for tier, keywords in industries[industry].items():
+                weight = self.weights.get(tier, 0)
+                if not weight:
+                    continue
+                for keyword in keywords:
+                    term = keyword.lower()
+                    rows.append(vocabulary.setdefault(term, len(vocabulary)))
+                    cols.append(col)
+                    values.append(weight)
+
+        self.terms = list(vocabulary)
+        # Entradas repetidas somam-se (como no loop do JS)
+        self.weight_matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float64), (rows, cols)),
+            shape=(len(self.terms), len(self.industries))
+        )
+        self.max_scores = np.asarray(self.weight_matrix.sum(axis=0)).ravel()
+        self.matcher = KeywordMatcher(self.terms)
+
+    # ========== LOADERS ==========
+
+    @classmethod
+    def from_industry_files(cls, ats_dir: Path, weights: Optional[Dict[str, float]] = None) -> "ATSScorer":
+        """Carrega datasets/ats_keywords/*.json (uma indústria por arquivo)"""
+        industries = {}
+        for path in sorted(Path(ats_dir).glob("*.json")):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            tiers = {}
+            for list_path, keywords in _iter_keyword_lists(data):
+                tier = INDUSTRY_TIERS.get(list_path, 'supporting')
+                tiers.setdefault(tier, []).extend(keywords)
+            industries[path.stem] = tiers
+
+        return cls(industries, weights)
+
+    @classmethod
+    def from_processed(cls, path: Path, weights: Optional[Dict[str, float]] = None) -> "ATSScorer":
+        """Carrega datasets/processed/ats_keywords.json (formato must_have/strong do backend)"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        industries = {
+            area: {tier: keywords for tier, keywords in area_data.items() if isinstance(keywords, list)}
+            for area, area_data in data.items()
+            if area != 'metadata' and isinstance(area_data, dict)
+        }
+        return cls(industries, weights)
+
+    # ========== SCORING ==========
+
+    def document_term_matrix(self, texts: List[str]) -> sparse.csr_matrix:
+        """Matriz esparsa (textos × keywords) com 1 onde a keyword é substring do texto"""
+        # Uma passagem do autómato por texto, independente do número de keywords
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            hits = self.matcher.find_ids(text)
+            rows.extend([row] * len(hits))
+            cols.extend(hits)
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(texts), len(self.terms))
+        )
+
+    def raw_scores(self, texts: List[str]) -> np.ndarray:
+        """Scores normalizados (0-100, sem arredondar): matriz textos × indústrias"""
+        return self._normalized_scores(self.document_term_matrix(texts))
+
+    def _normalized_scores(self, matrix: sparse.csr_matrix) -> np.ndarray:
+        """Scores 0-100 de uma matriz textos × keywords"""
+        points = np.asarray((matrix @ self.weight_matrix).todense())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = np.where(self.max_scores > 0, points / self.max_scores * 100, 0.0)
+        return np.minimum(100.0, normalized)
+
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """ATS scores inteiros (textos × indústrias), arredondados como Math.round"""
+        return np.floor(self.raw_scores(texts) + 0.5).astype(np.int64)
+
+    def iter_scores(self, texts: Iterable[str], batch_size: int = 10000) -> Iterator[np.ndarray]:
+        """Scores por lotes, para corpora que não cabem em memória"""
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) == batch_size:
+                yield self.score_batch(batch)
+                batch = []
+        if batch:
+            yield self.score_batch(batch)
+
+    def score_texts(self, texts: List[str], industries: List[str]) -> List[dict]:
+        """Análise de vários textos (cada um na sua indústria), no formato do calculateATSScore
+
+        Cada texto passa uma vez pelo autómato; os scores saem de uma única
+        multiplicação esparsa para o lote todo.
+        """
+        matrix = self.document_term_matrix(texts)
+        normalized = self._normalized_scores(matrix)
+
+        results = []
+        for row, industry in enumerate(industries):
+            tiers = self.keywords.get(industry, {})
+            found_terms = {self.terms[term_id] for term_id in matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]}
+
+            found_keywords = []
+            missing_keywords = []
+            for tier in ('must_have', 'strong'):
+                for keyword in tiers.get(tier, []):
+                    if keyword.lower() in found_terms:
+                        found_keywords.append(keyword)
+                    elif tier == 'must_have':
+                        missing_keywords.append(keyword)
+
+            col = self.industries.index(industry) if industry in self.industries else None
+            score = float(normalized[row, col]) if col is not None else 0.0
+            results.append({
+                'score': int(np.floor(score + 0.5)),
+                'foundKeywords': found_keywords,
+                'missingKeywords': missing_keywords[:5],
+                'recommendation': 'good' if score >= 70 else 'needs_improvement'
+            })
+        return results
+
+    def score_text(self, text: str, industry: str) -> dict:
+        """Análise de um texto numa indústria, no formato do calculateATSScore"""
+        return self.score_texts([text], [industry])[0]
+
+def _read_texts(path: Optional[Path], field: str, datasets_dir: Path) -> Iterator[Tuple[str, str]]:
+    """Textos a pontuar: (id, texto)"""
+    if path is None:
+        # Default: textos melhorados do dataset de melhoria de texto (JSON ou shards JSONL)
+        dataset = find_dataset(datasets_dir, "text_improvement.json")
+        if dataset is None:
+            raise FileNotFoundError(f"text_improvement not found in {datasets_dir}")
+        # Índice dentro da secção, como nas referências do validador
+        positions = {}
+        for section, example in iter_examples(dataset):
+            idx = positions.get(section, 0)
+            positions[section] = idx + 1
+            yield example.get('id', f'{section}_{idx}'), example.get(field, '')
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == '.jsonl':
+            for idx, line in enumerate(f):
+                if line.strip():
+                    record = json.loads(line)
+                    yield str(record.get('id', idx)), record.get(field, '')
+        else:
+            for idx, line in enumerate(f):
+                yield str(idx), line.rstrip('\n')
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Calcula ATS scores em lote para todas as indústrias")
+    parser.add_argument("--input", type=Path, help="Arquivo .jsonl (um CV por linha) ou .txt (um texto por linha)")
+    parser.add_argument("--field", default="improved", help="Campo com o texto nos registos JSON (default: improved)")
+    parser.add_argument("--output", type=Path, default=ML_ENGINE_DIR / "datasets" / "ats_scores.csv", help="CSV de saída")
+    parser.add_argument("--ats-dir", type=Path, default=ATS_KEYWORDS_DIR, help="Pasta com as keywords por indústria")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Textos por lote (default: 10000)")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    print("\n" + "="*70)
+    print("📊 CV Builder - Batch ATS Scoring")
+    print("="*70)
+    print()
+
+    scorer = ATSScorer.from_industry_files(args.ats_dir)
+    print(f"🔑 {len(scorer.terms)} keywords em {len(scorer.industries)} indústrias: {', '.join(scorer.industries)}")
+
+    records = _read_texts(args.input, args.field, DATASETS_DIR)
+    total = 0
+    start = time.perf_counter()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', *scorer.industries, 'best_industry'])
+
+        batch_ids, batch_texts = [], []
+
+        def flush():
+            scores = scorer.score_batch(batch_texts)
+            best = scores.argmax(axis=1)
+            for record_id, row, best_col in zip(batch_ids, scores, best):
+                writer.writerow([record_id, *row.tolist(), scorer.industries[best_col]])
+
+        for record_id, text in records:
+            batch_ids.append(record_id)
+            batch_texts.append(text)
+            if len(batch_texts) == args.batch_size:
+                flush()
+                total += len(batch_texts)
+                batch_ids, batch_texts = [], []
+        if batch_texts:
+            flush()
+            total += len(batch_texts)
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"✅ {total} textos pontuados em {elapsed:.2f}s ({rate:,.0f} textos/s)")
+    print(f"📁 Resultados: {args.output.absolute()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+⏱️ CV Builder - Pipeline Benchmark
+Mede o desempenho de generate → validate → export com datasets sintéticos
+
+Para cada escala, sintetiza datasets com a forma produzida pelo
+CVDatasetGenerator e mede, cada etapa num processo novo:
+- CVDatasetGenerator.save_all_datasets
+- DatasetValidator.validate_all (modos configuráveis: sequencial, streaming, paralelo)
+- BackendExporter.export_all
+
+Regista tempo (wall e CPU), pico de memória (RSS do processo e, com
+--tracemalloc, pico de alocações Python), itens/s e tamanho dos outputs
+num JSON para comparar entre commits. Com --scaling, text_improvement é
+gerado em shards JSONL e a validação paralela é medida para cada nº de
+workers (speedup e eficiência face ao primeiro).
+
+Uso:
+    python scripts/benchmark_pipeline.py --scale 1k
+    python scripts/benchmark_pipeline.py --scale 100k --skills 10000 --validate-modes default stream workers=4
+    python scripts/benchmark_pipeline.py --scale 1k --compare benchmarks/results/anterior.json
+    python scripts/benchmark_pipeline.py --scale 100k --scaling 1 2 4 8
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+
+from generate_datasets import CVDatasetGenerator
+from validate_datasets import DatasetValidator
+from export_to_backend import BackendExporter
+from metrics import peak_rss_mb
+from dataset_io import BENCHMARK_RESULTS_DIR
+
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1M': 1_000_000
+}
+
+SECTIONS = ['experience', 'summary', 'education', 'skills']
+INDUSTRIES = ['technology', 'marketing', 'healthcare', 'project_management', 'customer_support']
+SENIORITIES = ['junior', 'mid-level', 'senior']
+ACTION_VERBS = ['Desenvolvi', 'Implementei', 'Geri', 'Liderei', 'Otimizei', 'Aumentei', 'Reduzi']
+WEAK_OPENINGS = ['Trabalhei em', 'Fiz', 'Ajudei com', 'Participei em', 'Tratei de']
+TOOLS = ['React', 'Node.js', 'Python', 'AWS', 'Docker', 'SQL', 'Google Ads', 'SEO', 'Kubernetes', 'Excel']
+TOPICS = ['aplicações web', 'campanhas digitais', 'pipelines de dados', 'projetos', 'equipas', 'processos']
+PRIORITIES = ['high', 'medium', 'low']
+
+# ========== DATASETS SINTÉTICOS ==========
+
+def synthesize_text_examples(count: int, seed: int = 42) -> List[Dict]:
+    """Exemplos de melhoria de texto com a forma do generate_text_improvement_dataset"""
+    rng = random.Random(seed)
+    created_at = datetime.now().isoformat()
+    examples = []
+
+    for idx in range(count):
+        section = SECTIONS[idx % len(SECTIONS)]
+        verb = rng.choice(ACTION_VERBS)
+        tool_a, tool_b = rng.sample(TOOLS, 2)
+        topic = rng.choice(TOPICS)
+        metric = rng.randint(5, 80)
+        examples.append({
+            "id": f"{section[:3]}_{idx:07d}",
+            "original": f"{rng.choice(WEAK_OPENINGS)} {topic}",
+            "section": section,
+            "improved": f"{verb} {topic} com {tool_a} e {tool_b}, resultando em melhoria de {metric}% na eficiência e {rng.randint(2, 50)} entregas por trimestre",
+            "improvements": ["verbo de ação forte", "tecnologias específicas", "quantificação de resultados"],
+            "keywords": [verb.lower(), tool_a, tool_b, f"{metric}%", topic],
+            "ats_score": rng.randint(60, 98),
+            "quality_score": rng.randint(60, 98),
+            "industry": rng.choice(INDUSTRIES),
+            "seniority": rng.choice(SENIORITIES),
+            "created_at": created_at,
+            "language": "pt-PT"
+        })
+
+    return examples
+
+def synthesize_skills_database(count: int, seed: int = 42) -> Dict:
+    """Base de skills {área: {categoria: [skills]}} com a forma do generate_skills_database"""
+    rng = random.Random(seed)
+    areas = [f"area_{i:02d}" for i in range(max(1, count // 500))]
+    categories = [f"category_{i:02d}" for i in range(10)]
+    database = {area: {category: [] for category in categories} for area in areas}
+
+    for idx in range(count):
+        area = areas[idx % len(areas)]
+        category = categories[(idx // len(areas)) % len(categories)]
+        database[area][category].append({
+            "name": f"Skill {idx:06d}",
+            "priority": rng.choice(PRIORITIES),
+            "demand_score": rng.randint(40, 99),
+            "salary_impact": f"+{rng.randint(1, 30)}%",
+            "category": category,
+            "related_skills": [f"Skill {rng.randrange(count):06d}" for _ in range(4)]
+        })
+
+    return database
+
+def synthesize_ats_keywords(seed: int = 42) -> Dict:
+    """Keywords ATS por área com a forma do generate_ats_keywords"""
+    rng = random.Random(seed)
+    return {
+        industry: {
+            "must_have": rng.sample([verb.lower() for verb in ACTION_VERBS], 5),
+            "strong": rng.sample(TOOLS, 5),
+            "metrics": ["ROI", "conversão", "uptime", "utilizadores"]
+        }
+        for industry in INDUSTRIES
+    }
+
+class SyntheticDatasetGenerator(CVDatasetGenerator):
+    """CVDatasetGenerator que devolve datasets sintéticos pré-construídos"""
+
+    def __init__(self, output_dir: Path, text_data: List[Dict], skills_data: Dict, ats_data: Dict,
+                 output_format: str = "json", shard_size: int = 50000):
+        super().__init__(output_dir, output_format=output_format, shard_size=shard_size)
+        self._text_data = text_data
+        self._skills_data = skills_data
+        self._ats_data = ats_data
+
+    def generate_text_improvement_dataset(self) -> List[Dict]:
+        return self._text_data
+
+    def generate_skills_database(self) -> Dict:
+        return self._skills_data
+
+    def generate_ats_keywords(self) -> Dict:
+        return self._ats_data
+
+# ========== MEDIÇÃO ==========
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+def _parse_validate_mode(mode: str) -> dict:
+    """'default' | 'stream' | 'workers=N' | 'stream+workers=N' -> kwargs do DatasetValidator"""
+    options = {}
+    for part in mode.split('+'):
+        if part == 'stream':
+            options['streaming'] = True
+        elif part.startswith('workers='):
+            options['workers'] = int(part.split('=', 1)[1]) or os.cpu_count() or 1
+        elif part != 'default':
+            raise ValueError(f"Modo de validação desconhecido: {mode}")
+    return options
+
+def _run_stage(stage: str, config: dict, conn):
+    """Executa uma etapa num processo novo e envia as métricas pelo pipe"""
+    work_dir = Path(config['work_dir'])
+    datasets_dir = work_dir / "processed"
+    backend_dir = work_dir / "backend"
+    examples = config['examples']
+    skills = config['skills']
+
+    if stage == 'generate':
+        # Dados sintetizados fora da medição
+        generator = SyntheticDatasetGenerator(
+            datasets_dir,
+            synthesize_text_examples(examples, config['seed']),
+            synthesize_skills_database(skills, config['seed']),
+            synthesize_ats_keywords(config['seed']),
+            output_format=config['text_format'],
+            shard_size=config['shard_size']
+        )
+        run = generator.save_all_datasets
+        items = examples + skills
+        output_dir = datasets_dir
+    elif stage.startswith('validate'):
+        validator = DatasetValidator(datasets_dir=datasets_dir, **_parse_validate_mode(config['mode']))
+        run = validator.validate_all
+        items = examples + skills
+        output_dir = None
+    elif stage == 'export':
+        run = BackendExporter(force=True, datasets_dir=datasets_dir, backend_dir=backend_dir).export_all
+        items = examples + skills
+        output_dir = backend_dir
+    else:
+        raise ValueError(f"Etapa desconhecida: {stage}")
+
+    if config['tracemalloc']:
+        tracemalloc.start()
+
+    output = io.StringIO()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with redirect_stdout(output if not config['verbose'] else sys.stdout):
+        success = run()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    traced_peak = None
+    if config['tracemalloc']:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    conn.send({
+        'stage': stage,
+        'mode': config.get('mode'),
+        'success': success is not False,
+        'wall_s': round(wall, 4),
+        'cpu_s': round(cpu, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'tracemalloc_peak_mb': traced_peak,
+        'items': items,
+        'items_per_s': round(items / wall, 1) if wall > 0 else None,
+        'output_bytes': _dir_size(output_dir) if output_dir else None
+    })
+    conn.close()
+
+def run_stage(stage: str, config: dict) -> dict:
+    """Corre uma etapa isolada (spawn) para o pico de RSS ser só dessa etapa"""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_run_stage, args=(stage, config, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {'stage': stage, 'mode': config.get('mode'), 'success': False, 'error': 'stage process crashed'}
+    process.join()
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(examples: int, skills: int, validate_modes: List[str], seed: int = 42,
+                  use_tracemalloc: bool = False, verbose: bool = False, work_dir: Optional[Path] = None,
+                  text_format: str = "json", shard_size: int = 50000) -> dict:
+    """Corre generate → validate (cada modo) → export e devolve os resultados"""
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix="cv_builder_bench_")
+        work_dir = Path(temp_dir)
+
+    config = {
+        'work_dir': str(work_dir),
+        'examples': examples,
+        'skills': skills,
+        'seed': seed,
+        'text_format': text_format,
+        'shard_size': shard_size,
+        'tracemalloc': use_tracemalloc,
+        'verbose': verbose
+    }
+
+    stages = []
+    try:
+        stages.append(run_stage('generate', config))
+        for mode in validate_modes:
+            stages.append(run_stage('validate', {**config, 'mode': mode}))
+        stages.append(run_stage('export', config))
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'commit': _git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'examples': examples,
+        'skills': skills,
+        'text_format': text_format,
+        'shard_size': shard_size,
+        'stages': stages
+    }
+
+def _stage_key(stage: dict) -> str:
+    return f"{stage['stage']}[{stage['mode']}]" if stage.get('mode') else stage['stage']
+
+def print_results(results: dict, baseline: Optional[dict] = None):
+    """Tabela de resultados (com variação face a um baseline, se existir)"""
+    previous = {_stage_key(stage): stage for stage in (baseline or {}).get('stages', [])}
+
+    print(f"\n📊 {results['examples']:,} exemplos, {results['skills']:,} skills (commit {results['commit'] or '?'})")
+    print("-"*70)
+    for stage in results['stages']:
+        key = _stage_key(stage)
+        if 'error' in stage:
+            print(f"   ❌ {key}: {stage['error']}")
+            continue
+        rss = f"{stage['peak_rss_mb']:.0f} MB" if stage['peak_rss_mb'] is not None else "n/a"
+        line = f"   {'✅' if stage['success'] else '⚠️ '} {key:<28} {stage['wall_s']:>8.2f}s  {rss:>8}  {stage['items_per_s'] or 0:>12,.0f} itens/s"
+        if key in previous and previous[key].get('wall_s'):
+            delta = (stage['wall_s'] / previous[key]['wall_s'] - 1) * 100
+            line += f"  ({delta:+.1f}% vs baseline)"
+        print(line)
+
+def print_scaling(results: dict, workers: List[int]):
+    """Speedup e eficiência da validação paralela face ao primeiro nº de workers"""
+    timings = {stage['mode']: stage.get('wall_s') for stage in results['stages'] if stage['stage'] == 'validate'}
+    base_workers = workers[0]
+    base = timings.get(f"workers={base_workers}")
+
+    print(f"\n📈 Escalabilidade da validação ({results['cpu_count']} cores, shards de {results['shard_size']:,} exemplos)")
+    print("-"*70)
+    for count in workers:
+        wall = timings.get(f"workers={count}")
+        if not wall or not base:
+            print(f"   workers={count:<4} n/a")
+            continue
+        speedup = base / wall
+        print(f"   workers={count:<4} {wall:>8.2f}s  speedup {speedup:>5.2f}x  eficiência {speedup * base_workers / count:>6.1%}")
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline generate → validate → export")
+    parser.add_argument("--scale", choices=list(SCALES), nargs='+', default=['1k'], help="Escalas a medir (default: 1k)")
+    parser.add_argument("--examples", type=int, help="Número de exemplos (substitui --scale)")
+    parser.add_argument("--skills", type=int, default=10000, help="Número de skills (default: 10000)")
+    parser.add_argument("--validate-modes", nargs='+', default=['default', 'stream'],
+                        help="Modos do validador: default, stream, workers=N, stream+workers=N")
+    parser.add_argument("--text-format", choices=["json", "jsonl"], default="json",
+                        help="Formato de text_improvement gerado (jsonl = shards, necessários para --workers)")
+    parser.add_argument("--shard-size", type=int, help="Exemplos por shard com --text-format jsonl "
+                        "(default: 50000; com --scaling, ~4 shards por worker)")
+    parser.add_argument("--scaling", type=int, nargs='+', metavar="N",
+                        help="Mede a validação paralela com N workers cada (shards JSONL; substitui --validate-modes)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Medir também o pico de alocações Python (mais lento)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed dos dados sintéticos")
+    parser.add_argument("--output", type=Path, help="JSON de resultados (default: benchmarks/results/<data>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="JSON de um benchmark anterior para comparar")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar o output das etapas")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    print("\n" + "="*70)
+    print("⏱️  CV Builder - Pipeline Benchmark")
+    print("="*70)
+
+    sizes = [args.examples] if args.examples else [SCALES[scale] for scale in args.scale]
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    validate_modes = args.validate_modes
+    text_format = args.text_format
+    if args.scaling:
+        # Só os shards JSONL são divididos pelos workers
+        validate_modes = [f"workers={count}" for count in args.scaling]
+        text_format = "jsonl"
+
+    runs = []
+    for examples in sizes:
+        shard_size = args.shard_size or (max(1000, examples // (max(args.scaling) * 4)) if args.scaling else 50000)
+        results = run_benchmark(examples, args.skills, validate_modes, args.seed, args.tracemalloc, args.verbose,
+                                text_format=text_format, shard_size=shard_size)
+        previous = next((run for run in (baseline or {}).get('runs', []) if run['examples'] == examples), None)
+        print_results(results, previous)
+        if args.scaling:
+            print_scaling(results, args.scaling)
+        runs.append(results)
+
+    output = args.output or BENCHMARK_RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{runs[0]['commit'] or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({'runs': runs}, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "="*70)
+    print(f"📁 Resultados: {output.absolute()}")
+
+if __name__ == "__main__":
+    main()
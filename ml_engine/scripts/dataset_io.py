@@ -0,0 +1,216 @@
+"""
+🧱 CV Builder - Sharded JSONL Datasets
+Leitura e escrita de datasets em shards JSONL (opcionalmente gzip) por secção
+
+Formato (uma pasta por dataset, ex: datasets/processed/text_improvement/):
+- <secção>-00000.jsonl[.gz]  um exemplo por linha, até shard_size linhas
+- index.json                 metadata + lista de shards por secção
+                             (arquivo, nº de exemplos, sha256 do conteúdo)
+
+Cada shard pode ser lido, validado ou treinado de forma independente, por
+isso os consumidores fazem streaming e paralelizam por shard sem carregar
+o dataset inteiro. O mesmo dataset pode existir como <nome>.json
+(documento único) ou <nome>/index.json; find_dataset resolve qual usar.
+
+Uso:
+    python scripts/generate_datasets.py --format jsonl --shard-size 50000 --compress
+"""
+
+import json
+import gzip
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from json_stream import JSONStreamReader
+
+INDEX_FILENAME = "index.json"
+SHARD_FORMAT = "jsonl"
+SHARD_FORMAT_VERSION = "1.0.0"
+
+# Pastas por omissão, relativas ao ml_engine/ (os scripts funcionam a partir de qualquer CWD)
+ML_ENGINE_DIR = Path(__file__).resolve().parent.parent
+DATASETS_DIR = ML_ENGINE_DIR / "datasets" / "processed"
+RAW_DATASETS_DIR = ML_ENGINE_DIR / "datasets" / "raw"
+ATS_KEYWORDS_DIR = ML_ENGINE_DIR / "datasets" / "ats_keywords"
+BACKEND_DATA_DIR = ML_ENGINE_DIR.parent / "backend" / "src" / "data"
+MODELS_DIR = ML_ENGINE_DIR / "models"
+BENCHMARK_RESULTS_DIR = ML_ENGINE_DIR / "benchmarks" / "results"
+
+def open_text(path: Path, mode: str = "r"):
+    """Abre um arquivo de texto UTF-8, descomprimindo/comprimindo se terminar em .gz"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        # Nível 6: quase o tamanho do 9 com metade do tempo de compressão
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+class ShardedJSONLWriter:
+    """Escreve exemplos numa pasta de shards JSONL, agrupados por secção numa só passagem"""
+
+    def __init__(self, output_dir: Path, shard_size: int = 50000, compress: bool = False,
+                 sections: Iterable[str] = ()):
+        """
+        Args:
+            output_dir: pasta do dataset (é recriada)
+            shard_size: máximo de exemplos por shard
+            compress: gzip em cada shard
+            sections: ordem preferida das secções no índice
+        """
+        self.output_dir = Path(output_dir)
+        self.shard_size = shard_size
+        self.compress = compress
+        self.shards: Dict[str, List[dict]] = {section: [] for section in sections}
+        self._open: Dict[str, tuple] = {}
+
+        if self.output_dir.exists():
+            shutil.rmtree(self.output_dir)
+        self.output_dir.mkdir(parents=True)
+
+    def _shard_for(self, section: str):
+        current = self._open.get(section)
+        if current and current[2]["count"] < self.shard_size:
+            return current
+
+        if current:
+            self._close_shard(section)
+        shards = self.shards.setdefault(section, [])
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        entry = {"file": f"{section}-{len(shards):05d}{suffix}", "count": 0}
+        shards.append(entry)
+        current = (open_text(self.output_dir / entry["file"], "w"), hashlib.sha256(), entry)
+        self._open[section] = current
+        return current
+
+    def _close_shard(self, section: str):
+        f, digest, entry = self._open.pop(section)
+        f.close()
+        entry["sha256"] = digest.hexdigest()
+
+    def write(self, section: str, example: dict):
+        """Acrescenta um exemplo ao shard atual da secção"""
+        f, digest, entry = self._shard_for(section)
+        line = json.dumps(example, ensure_ascii=False) + "\n"
+        f.write(line)
+        digest.update(line.encode("utf-8"))
+        entry["count"] += 1
+
+    def close(self, metadata: Optional[dict] = None) -> Path:
+        """Fecha os shards abertos e escreve o index.json; devolve o caminho do índice"""
+        for section in list(self._open):
+            self._close_shard(section)
+
+        index = {
+            "format": SHARD_FORMAT,
+            "version": SHARD_FORMAT_VERSION,
+            "compression": "gzip" if self.compress else None,
+            "total_examples": sum(shard["count"] for shards in self.shards.values() for shard in shards),
+            "metadata": metadata or {},
+            "sections": self.shards
+        }
+        index_path = self.output_dir / INDEX_FILENAME
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        return index_path
+
+def is_sharded(path: Path) -> bool:
+    """True se a pasta contém um índice de shards JSONL"""
+    index_path = Path(path) / INDEX_FILENAME
+    if not index_path.is_file():
+        return False
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("format") == SHARD_FORMAT
+    except (json.JSONDecodeError, AttributeError):
+        return False
+
+def find_dataset(datasets_dir: Path, filename: str) -> Optional[Path]:
+    """Localiza um dataset: pasta de shards (<stem>/) ou documento JSON (<stem>.json)"""
+    datasets_dir = Path(datasets_dir)
+    sharded = datasets_dir / Path(filename).stem
+    if is_sharded(sharded):
+        return sharded
+    document = datasets_dir / filename
+    return document if document.exists() else None
+
+def iter_sharded_datasets(datasets_dir: Path) -> Iterator[Path]:
+    """Pastas de datasets em shards dentro de datasets_dir"""
+    for path in sorted(Path(datasets_dir).iterdir()):
+        if path.is_dir() and is_sharded(path):
+            yield path
+
+def remove_dataset(datasets_dir: Path, filename: str, keep: str):
+    """Remove o outro formato de um dataset ('json' ou 'jsonl' é o que fica)"""
+    datasets_dir = Path(datasets_dir)
+    if keep == "jsonl":
+        document = datasets_dir / filename
+        if document.is_file():
+            document.unlink()
+    else:
+        sharded = datasets_dir / Path(filename).stem
+        if is_sharded(sharded):
+            shutil.rmtree(sharded)
+
+def load_index(dataset_dir: Path) -> dict:
+    """Lê o index.json de uma pasta de shards"""
+    with open(Path(dataset_dir) / INDEX_FILENAME, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def iter_shards(dataset_dir: Path, index: Optional[dict] = None) -> Iterator[Tuple[str, int, Path, int]]:
+    """Shards pela ordem do índice: (secção, offset na secção, caminho, nº de exemplos)"""
+    index = index or load_index(dataset_dir)
+    for section, shards in index.get("sections", {}).items():
+        offset = 0
+        for shard in shards:
+            yield section, offset, Path(dataset_dir) / shard["file"], shard.get("count", 0)
+            offset += shard.get("count", 0)
+
+def iter_shard(path: Path) -> Iterator[dict]:
+    """Exemplos de um shard (linhas vazias são ignoradas)"""
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def iter_examples(path: Path, sections: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, dict]]:
+    """(secção, exemplo) de um dataset em shards ou de um documento JSON com by_section"""
+    wanted = set(sections) if sections is not None else None
+    path = Path(path)
+
+    if path.is_dir():
+        for section, _, shard_path, _ in iter_shards(path):
+            if wanted is None or section in wanted:
+                for example in iter_shard(shard_path):
+                    yield section, example
+        return
+
+    # Documento único: streaming para não carregar o JSON inteiro
+    with open(path, "r", encoding="utf-8") as f:
+        reader = JSONStreamReader(f)
+        for key in reader.iter_object():
+            if key != "by_section":
+                reader.skip_value()
+                continue
+            for section in reader.iter_object():
+                if (wanted is None or section in wanted) and reader.peek_type() == "array":
+                    for example in reader.iter_items():
+                        yield section, example
+                else:
+                    reader.skip_value()
+
+def load_sharded(dataset_dir: Path) -> dict:
+    """Reconstrói o documento {metadata, by_section} a partir dos shards"""
+    index = load_index(dataset_dir)
+    by_section = {section: [] for section in index.get("sections", {})}
+    for section, _, shard_path, _ in iter_shards(dataset_dir, index):
+        by_section[section].extend(iter_shard(shard_path))
+    return {"metadata": index.get("metadata", {}), "by_section": by_section}
+
+def load_dataset(path: Path) -> dict:
+    """Carrega um dataset (pasta de shards ou documento JSON) como dict"""
+    path = Path(path)
+    if path.is_dir():
+        return load_sharded(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
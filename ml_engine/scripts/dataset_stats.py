@@ -0,0 +1,295 @@
+"""
+📈 CV Builder - Dataset Statistics
+Estatísticas vetorizadas (pandas/NumPy) dos exemplos e das skills
+
+As estatísticas do validador (nº de exemplos e médias por secção) vêm de
+acumuladores de memória constante (SectionStats: contagens e somas dos scores
+válidos). Só o relatório precisa dos exemplos todos: para ele, os exemplos de
+text_improvement são guardados em colunas compactas (ExampleColumns, que
+também acumula as somas): secção, indústria e senioridade como códigos de categoria,
+ats_score/quality_score válidos em float64 (NaN se inválidos) e o nº de
+keywords, ~30 bytes por exemplo. As keywords são contadas por secção
+(Counter) em vez de guardadas. As colunas são acrescentadas por blocos
+(secção, shard JSONL, shard de um worker) e juntam-se com merge(), por isso
+ambas as classes servem todos os modos de validação. As skills usam o DataFrame da tabela
+achatada (skills_table.py).
+
+Sobre estas tabelas, médias, percentis, histogramas, breakdowns por
+secção/indústria/senioridade e tabelas de frequência de keywords são
+operações vetorizadas, rápidas mesmo com milhões de linhas. O relatório
+substitui correr à mão o notebooks/dataset_analysis.ipynb.
+
+Uso:
+    stats = SectionStats()                           # ou ExampleColumns() para o relatório
+    stats.add('experience', examples, ats_scores, quality_scores)
+    stats.section_breakdown()                        # estatísticas do validador
+    write_report(build_report({'text_improvement': columns, 'skills_by_area': skills_frame}),
+                 Path("report.json"))
+"""
+
+import json
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SCORE_COLUMNS = ('ats_score', 'quality_score')
+CATEGORY_COLUMNS = ('section', 'industry', 'seniority')
+PERCENTILES = (5, 25, 50, 75, 95)
+SCORE_BINS = np.arange(0, 101, 10)
+VALID_PRIORITIES = ('high', 'medium', 'low')
+TOP_KEYWORDS = 25
+TOP_SECTION_KEYWORDS = 10
+TOP_SKILLS = 15
+
+class SectionStats:
+    """Por secção: nº de exemplos e soma/contagem dos scores válidos (memória constante)"""
+
+    def __init__(self):
+        # Secção -> [exemplos, soma ats, nº ats, soma quality, nº quality] (ordem de aparecimento)
+        self.sections: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return int(sum(totals[0] for totals in self.sections.values()))
+
+    def add(self, section: str, examples: list, ats_scores: list, quality_scores: list):
+        """Acumula um bloco de exemplos de uma secção com os scores já validados (None = inválido)"""
+        totals = self.sections.setdefault(section, [0, 0.0, 0, 0.0, 0])
+        totals[0] += len(examples)
+        for offset, scores in ((1, ats_scores), (3, quality_scores)):
+            values = np.array(scores, dtype=np.float64)
+            valid = ~np.isnan(values)
+            totals[offset] += float(values[valid].sum())
+            totals[offset + 1] += int(valid.sum())
+
+    def merge(self, other: "SectionStats"):
+        """Junta os acumuladores de outro bloco (ex: de um worker)"""
+        for section, other_totals in other.sections.items():
+            totals = self.sections.setdefault(section, [0, 0.0, 0, 0.0, 0])
+            for i, value in enumerate(other_totals):
+                totals[i] += value
+
+    def section_breakdown(self) -> Dict[str, dict]:
+        """Estatísticas por secção do validador: nº de exemplos e médias dos scores válidos"""
+        return {
+            section: {
+                'count': int(count),
+                'avg_ats_score': ats_total / ats_count if ats_count else 0,
+                'avg_quality_score': quality_total / quality_count if quality_count else 0
+            }
+            for section, (count, ats_total, ats_count, quality_total, quality_count) in self.sections.items()
+        }
+
+class ExampleColumns(SectionStats):
+    """Colunas compactas dos exemplos de texto (para o relatório), acrescentadas por blocos"""
+
+    def __init__(self):
+        super().__init__()
+        # Valor -> código de cada coluna categórica (ordem de aparecimento)
+        self.levels: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORY_COLUMNS}
+        self.chunks: List[Dict[str, np.ndarray]] = []
+        self.keywords: Dict[str, Counter] = {}
+
+    def _code(self, column: str, value: str) -> int:
+        levels = self.levels[column]
+        return levels.setdefault(value, len(levels))
+
+    def _codes(self, column: str, values: list) -> np.ndarray:
+        """Códigos globais de uma coluna (-1 = em falta ou não é string)"""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        if not len(uniques):
+            return np.full(len(values), -1, dtype=np.int32)
+        mapping = np.array([self._code(column, value) for value in uniques], dtype=np.int32)
+        return np.where(codes >= 0, mapping[codes], -1).astype(np.int32)
+
+    def add(self, section: str, examples: list, ats_scores: list, quality_scores: list):
+        """Acrescenta um bloco de exemplos de uma secção com os scores já validados (None = inválido)"""
+        super().add(section, examples, ats_scores, quality_scores)
+        section_code = self._code('section', section)
+        records = [example if type(example) is dict else {} for example in examples]
+        if not records:
+            return
+
+        self.chunks.append({
+            'section': np.full(len(records), section_code, dtype=np.int32),
+            'industry': self._codes('industry', [r.get('industry') if type(r.get('industry')) is str else None
+                                                 for r in records]),
+            'seniority': self._codes('seniority', [r.get('seniority') if type(r.get('seniority')) is str else None
+                                                   for r in records]),
+            'ats_score': np.array(ats_scores, dtype=np.float64),
+            'quality_score': np.array(quality_scores, dtype=np.float64),
+            'keyword_count': np.array([len(r['keywords']) if type(r.get('keywords')) is list else 0
+                                       for r in records], dtype=np.int32)
+        })
+        self.keywords.setdefault(section, Counter()).update(
+            keyword for r in records if type(r.get('keywords')) is list
+            for keyword in r['keywords'] if type(keyword) is str
+        )
+
+    def merge(self, other: "ExampleColumns"):
+        """Junta outro bloco de colunas (ex: de um worker), a seguir aos existentes"""
+        super().merge(other)
+        mappings = {
+            column: np.array([self._code(column, value) for value in other.levels[column]], dtype=np.int32)
+            for column in CATEGORY_COLUMNS
+        }
+        for chunk in other.chunks:
+            chunk = dict(chunk)
+            for column, mapping in mappings.items():
+                codes = chunk[column]
+                chunk[column] = np.where(codes >= 0, mapping[np.maximum(codes, 0)] if len(mapping) else -1, -1)
+            self.chunks.append(chunk)
+        for section, counts in other.keywords.items():
+            self.keywords.setdefault(section, Counter()).update(counts)
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame com uma linha por exemplo (colunas categóricas + numéricas)"""
+        def column(name: str, dtype) -> np.ndarray:
+            return np.concatenate([chunk[name] for chunk in self.chunks]) if self.chunks else np.array([], dtype=dtype)
+
+        data = {
+            name: pd.Categorical.from_codes(column(name, np.int32), categories=list(self.levels[name]))
+            for name in CATEGORY_COLUMNS
+        }
+        for name in SCORE_COLUMNS:
+            data[name] = column(name, np.float64)
+        data['keyword_count'] = column('keyword_count', np.int32)
+        return pd.DataFrame(data)
+
+def _float(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+def describe(values: pd.Series) -> dict:
+    """count, média, desvio, mínimo, percentis e máximo (ignora NaN)"""
+    values = values.dropna().to_numpy(dtype=np.float64)
+    if not len(values):
+        return {'count': 0}
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        'count': int(len(values)),
+        'mean': _float(values.mean()),
+        'std': _float(values.std()),
+        'min': _float(values.min()),
+        **{f'p{p}': _float(value) for p, value in zip(PERCENTILES, percentiles)},
+        'max': _float(values.max())
+    }
+
+def histogram(values: pd.Series, bins: np.ndarray = SCORE_BINS) -> Dict[str, int]:
+    """Contagem por intervalo ("70-80"); o último intervalo inclui o limite superior"""
+    counts, edges = np.histogram(values.dropna().to_numpy(dtype=np.float64), bins=bins)
+    return {f'{edges[i]:g}-{edges[i + 1]:g}': int(count) for i, count in enumerate(counts)}
+
+def group_stats(frame: pd.DataFrame, by, columns: tuple) -> Dict[str, dict]:
+    """Por grupo: nº de linhas e média/p25/p50/p75 de cada coluna (groupby vetorizado)"""
+    grouped = frame.groupby(list(by) if isinstance(by, tuple) else by, observed=True)
+    sizes = grouped.size()
+    means = grouped[list(columns)].mean()
+    quantiles = grouped[list(columns)].quantile([0.25, 0.5, 0.75])
+    by_quantile = {q: quantiles.xs(q, level=-1) for q in (0.25, 0.5, 0.75)}
+
+    report = {}
+    for key, size in sizes.items():
+        name = '/'.join(key) if isinstance(key, tuple) else str(key)
+        report[name] = {'count': int(size)}
+        for column in columns:
+            report[name][column] = {
+                'mean': _float(means.loc[key, column]),
+                **{f'p{int(q * 100)}': _float(by_quantile[q].loc[key, column]) for q in by_quantile}
+            }
+    return report
+
+def valid_skills(frame: pd.DataFrame) -> pd.DataFrame:
+    """Skills (objetos) com demand_score e priority fora do schema anulados"""
+    skills = frame[frame['is_skill']]
+    return skills.assign(
+        demand_score=skills['demand_score'].where(skills['demand_score'].between(0, 100)),
+        priority=skills['priority'].where(skills['priority'].isin(VALID_PRIORITIES))
+    )
+
+def skills_summary(frame: pd.DataFrame) -> dict:
+    """Distribuição de prioridades e demand_score médio das skills válidas"""
+    skills = valid_skills(frame)
+    demand = skills['demand_score'].dropna()
+    return {
+        'priority_distribution': {
+            priority: int(count) for priority, count in skills['priority'].dropna().value_counts(sort=False).items()
+        },
+        'avg_demand_score': float(demand.mean()) if len(demand) else 0
+    }
+
+def keyword_table(counts: Counter, examples: int, top: int) -> List[dict]:
+    """Keywords mais frequentes: ocorrências e fração dos exemplos"""
+    if not counts:
+        return []
+    series = pd.Series(counts, dtype=np.int64).nlargest(top)
+    return [
+        {'keyword': keyword, 'count': int(count), 'per_example': _float(count / examples) if examples else None}
+        for keyword, count in series.items()
+    ]
+
+def text_report(columns: ExampleColumns) -> dict:
+    frame = columns.frame()
+    section_sizes = frame['section'].value_counts(sort=False)
+    total_keywords = sum(columns.keywords.values(), Counter())
+    return {
+        'examples': int(len(frame)),
+        'scores': {column: {**describe(frame[column]), 'histogram': histogram(frame[column])} for column in SCORE_COLUMNS},
+        'keywords_per_example': describe(frame['keyword_count']),
+        'by_section': group_stats(frame, 'section', SCORE_COLUMNS),
+        'by_industry': group_stats(frame, 'industry', SCORE_COLUMNS),
+        'by_seniority': group_stats(frame, 'seniority', SCORE_COLUMNS),
+        'by_industry_seniority': group_stats(frame, ('industry', 'seniority'), SCORE_COLUMNS),
+        'keywords': {
+            'unique': len(total_keywords),
+            'occurrences': int(sum(total_keywords.values())),
+            'top': keyword_table(total_keywords, len(frame), TOP_KEYWORDS),
+            'by_section': {
+                section: keyword_table(counts, int(section_sizes.get(section, 0)), TOP_SECTION_KEYWORDS)
+                for section, counts in columns.keywords.items()
+            }
+        }
+    }
+
+def skills_report(frame: pd.DataFrame) -> dict:
+    skills = valid_skills(frame)
+    skills = skills.assign(path=skills['area'] + '.' + skills['category'])
+    top = skills.dropna(subset=['demand_score']).nlargest(TOP_SKILLS, 'demand_score', keep='first')
+    return {
+        'skills': int(len(skills)),
+        'demand_score': {**describe(skills['demand_score']), 'histogram': histogram(skills['demand_score'])},
+        **skills_summary(frame),
+        'priority_by_area': {
+            area: {priority: int(count) for priority, count in row.items() if count}
+            for area, row in pd.crosstab(skills['area'], skills['priority']).iterrows()
+        },
+        'by_area': group_stats(skills, 'area', ('demand_score',)),
+        'by_category': group_stats(skills, 'path', ('demand_score',)),
+        'top_by_demand': [
+            {'name': name, 'area': area, 'category': category, 'priority': priority, 'demand_score': _float(score)}
+            for name, area, category, priority, score
+            in top[['name', 'area', 'category', 'priority', 'demand_score']].itertuples(index=False)
+        ]
+    }
+
+def build_report(tables: dict, datasets_dir: Path = None) -> dict:
+    """Relatório de distribuições a partir das tabelas do validador ({dataset: tabela})"""
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'datasets_dir': str(datasets_dir) if datasets_dir else None
+    }
+    if 'text_improvement' in tables:
+        report['text_improvement'] = text_report(tables['text_improvement'])
+    if 'skills_by_area' in tables:
+        report['skills_by_area'] = skills_report(tables['skills_by_area'])
+    return report
+
+def write_report(report: dict, path: Path):
+    """Grava o relatório em JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
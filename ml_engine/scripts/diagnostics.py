@@ -0,0 +1,158 @@
+"""
+🩺 CV Builder - Validation Diagnostics
+Registo dos problemas encontrados pela validação, com memória limitada
+
+Cada problema é um código (ex: 'missing_field') com parâmetros, não uma
+string formatada. O registo guarda um contador por código e só os primeiros
+`max_samples` parâmetros de cada código; as mensagens são formatadas apenas
+quando mostradas ou exportadas. Num dataset com um problema sistemático em
+milhões de exemplos, a memória e o tempo ficam iguais aos de uns poucos.
+
+Os registos de workers/shards juntam-se com merge() pela ordem dos dados,
+por isso as amostras são sempre os primeiros casos de cada código.
+
+Uso:
+    diagnostics = Diagnostics(max_samples=10)
+    diagnostics.add('missing_field', ref='exp_001', field='keywords')
+    diagnostics.errors                      # nº total de erros
+    for message in diagnostics.messages('error', limit=15):
+        print(message)
+    diagnostics.write(Path("diagnostics.json"))
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_MAX_SAMPLES = 10
+
+SEVERITY_PREFIX = {
+    'error': "❌ ",
+    'warning': "⚠️  "
+}
+
+# Código: (severidade, mensagem); listas nos parâmetros são mostradas separadas por vírgulas
+CODES = {
+    # Estrutura dos documentos
+    'missing_key': ('error', "Missing '{key}' key in {where}"),
+    'missing_optional_key': ('warning', "Missing '{key}' key (opcional)"),
+    'missing_metadata': ('warning', "Missing 'metadata' in {where} (opcional mas recomendado)"),
+    'section_type': ('error', "Section '{section}' should be a list, got {actual}"),
+    'area_type': ('error', "Area '{area}' should be an object, got {actual}"),
+    'skills_area_type': ('error', "Area '{area}' should be an object or a list of skills, got {actual}"),
+    'category_unexpected_type': ('warning', "Category '{category}' has unexpected type: {actual}"),
+    'role_levels_type': ('error', "Role '{role}' should have levels as object"),
+    'role_no_levels': ('warning', "Role '{role}' has no seniority levels"),
+    # Shards JSONL
+    'shard_missing': ('error', "Missing shard file: {shard}"),
+    'shard_unreadable': ('error', "Shard {shard} could not be read: {reason}"),
+    'shard_count_mismatch': ('error', "Shard {shard} has {count} examples, index says {expected}"),
+    # Campos (validadores compilados dos schemas, ver schema_compiler.py)
+    'missing_field': ('error', "[{ref}] Missing required field: '{field}'"),
+    'empty_field': ('error', "[{ref}] Field '{field}' is empty"),
+    'too_short': ('error', "[{ref}] '{field}' is too short ({count} < {minimum})"),
+    'wrong_type': ('error', "[{ref}] '{field}' should be {expected}, got {actual}"),
+    'out_of_range': ('error', "[{ref}] '{field}' out of range ({minimum}-{maximum}): {value}"),
+    'invalid_enum': ('error', "[{ref}] Invalid {field}: '{value}' (must be: {allowed})"),
+    'format_mismatch': ('error', "[{ref}] '{field}' should be in format '{format}', got '{value}'"),
+    'unexpected_format': ('warning', "[{ref}] '{field}' should be in format '{format}', got '{value}'"),
+    'missing_recommended': ('warning', "[{ref}] Missing '{field}' field (recomendado)"),
+    'empty_list': ('warning', "[{ref}] '{field}' list is empty"),
+    'few_items': ('warning', "[{ref}] Only {count} items in '{field}' (recommended: {minimum}+)"),
+    'low_score': ('warning', "[{ref}] Low {score} score: {value}"),
+    # Texto melhorado
+    'identical_text': ('warning', "[{ref}] 'improved' is identical to 'original'"),
+    'much_shorter_text': ('warning', "[{ref}] 'improved' is much shorter than 'original' ({improved} vs {original} chars)"),
+    'shorter_text': ('warning', "[{ref}] 'improved' is shorter than 'original'"),
+    'no_action_verb': ('warning', "[{ref}] 'improved' doesn't contain strong action verbs"),
+    'near_duplicate': ('warning', "Near-duplicate cluster ({size} examples, Jaccard >= {threshold:.2f}): {examples}")
+}
+
+def format_diagnostic(code: str, params: dict) -> str:
+    """Mensagem legível de um registo (com o emoji da severidade)"""
+    severity, template = CODES[code]
+    values = {
+        name: ', '.join(str(item) for item in value) if isinstance(value, (list, tuple)) else value
+        for name, value in params.items()
+    }
+    return SEVERITY_PREFIX[severity] + template.format(**values)
+
+class Diagnostics:
+    """Contador por código + amostra dos primeiros `max_samples` registos de cada código"""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[dict]] = {}
+
+    def add(self, code: str, **params):
+        """Regista um problema; os parâmetros só são guardados enquanto houver lugar na amostra"""
+        count = self.counts.get(code)
+        if count is None:
+            if code not in CODES:
+                raise KeyError(f"Unknown diagnostic code '{code}'")
+            count = 0
+            self.samples[code] = []
+        self.counts[code] = count + 1
+        if count < self.max_samples:
+            self.samples[code].append(params)
+
+    def merge(self, other: "Diagnostics"):
+        """Junta outro registo (ex: de um worker), a seguir aos registos já existentes"""
+        for code, count in other.counts.items():
+            samples = self.samples.setdefault(code, [])
+            samples.extend(other.samples.get(code, [])[:max(self.max_samples - len(samples), 0)])
+            self.counts[code] = self.counts.get(code, 0) + count
+
+    def total(self, severity: str) -> int:
+        return sum(count for code, count in self.counts.items() if CODES[code][0] == severity)
+
+    @property
+    def errors(self) -> int:
+        return self.total('error')
+
+    @property
+    def warnings(self) -> int:
+        return self.total('warning')
+
+    def codes(self, severity: Optional[str] = None) -> List[str]:
+        """Códigos registados, do mais frequente para o menos (ordem estável entre modos de validação)"""
+        return sorted(
+            (code for code in self.counts if severity is None or CODES[code][0] == severity),
+            key=lambda code: (CODES[code][0] != 'error', -self.counts[code], code)
+        )
+
+    def messages(self, severity: str, limit: Optional[int] = None, per_code: Optional[int] = None) -> Iterator[str]:
+        """Mensagens das amostras, código a código, formatadas só agora"""
+        shown = 0
+        for code in self.codes(severity):
+            for params in self.samples.get(code, [])[:per_code]:
+                if limit is not None and shown >= limit:
+                    return
+                shown += 1
+                yield format_diagnostic(code, params)
+
+    def to_dict(self) -> dict:
+        return {
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'max_samples': self.max_samples,
+            'codes': {
+                code: {
+                    'severity': CODES[code][0],
+                    'count': self.counts[code],
+                    'samples': [
+                        {'message': format_diagnostic(code, params), **params}
+                        for params in self.samples.get(code, [])
+                    ]
+                }
+                for code in self.codes()
+            }
+        }
+
+    def write(self, path: Path):
+        """Exporta contadores e amostras em JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
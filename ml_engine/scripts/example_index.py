@@ -0,0 +1,221 @@
+"""
+🧭 CV Builder - Similar Example Index
+Índice vetorial dos textos 'original' de text_improvement para few-shot prompting
+
+Cada texto vira um vetor TF-IDF de n-gramas de caracteres (trigramas,
+minúsculas, sem acentos), com hashing FNV-1a 32-bit para um espaço de
+dimensão fixa e norma L2. A similaridade é o cosseno (produto interno).
+
+O hashing é simples de reproduzir em JavaScript: o exportador envia um
+índice invertido por secção (feature -> idf + linhas e pesos) e o helper
+findSimilarExamples do index.js calcula o top-k sem percorrer a secção.
+
+Uso:
+    python scripts/example_index.py --query "Trabalhei com React" --section experience --k 5
+"""
+
+import argparse
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from dataset_io import DATASETS_DIR, find_dataset, load_dataset
+
+NGRAM = 3
+N_FEATURES = 1 << 18
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+def normalize(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços colapsados (igual ao JS do backend)"""
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    folded = ''.join(char for char in decomposed if not ('\u0300' <= char <= '\u036f'))
+    return ' '.join(folded.split())
+
+def fnv1a(text: str) -> int:
+    """FNV-1a 32-bit sobre os code points (o JS usa Math.imul com o mesmo primo)"""
+    h = FNV_OFFSET
+    for char in text:
+        h ^= ord(char)
+        h = (h * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+def ngram_counts(text: str, n_features: int = N_FEATURES, ngram: int = NGRAM) -> Dict[int, int]:
+    """Contagens dos n-gramas de caracteres (com espaço nas pontas) por feature"""
+    padded = f" {normalize(text)} "
+    counts: Dict[int, int] = {}
+    for start in range(max(len(padded) - ngram + 1, 0)):
+        feature = fnv1a(padded[start:start + ngram]) % n_features
+        counts[feature] = counts.get(feature, 0) + 1
+    return counts
+
+def _count_matrix(texts: Iterable[str], n_features: int, ngram: int) -> sparse.csr_matrix:
+    indptr = [0]
+    indices = []
+    values = []
+    for text in texts:
+        counts = ngram_counts(text or '', n_features, ngram)
+        indices.extend(counts)
+        values.extend(counts.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(len(indptr) - 1, n_features)
+    )
+
+def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+class ExampleIndex:
+    """Matriz esparsa normalizada (exemplos × features) com queries top-k em lote"""
+
+    def __init__(self, n_features: int = N_FEATURES, ngram: int = NGRAM):
+        self.n_features = n_features
+        self.ngram = ngram
+        self.idf: Optional[np.ndarray] = None
+        self.matrix: Optional[sparse.csr_matrix] = None
+
+    def fit(self, texts: List[str]) -> "ExampleIndex":
+        """Constrói o índice; idf suavizado como no scikit-learn: ln((1+n)/(1+df)) + 1"""
+        counts = _count_matrix(texts, self.n_features, self.ngram)
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        self.idf = np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1
+        self.matrix = _l2_normalize(counts @ sparse.diags(self.idf)).tocsr()
+        return self
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """Vetores normalizados de novas queries (features desconhecidas não contam)"""
+        counts = _count_matrix(texts, self.n_features, self.ngram)
+        # Features sem documentos não podem contribuir para nenhum cosseno
+        weights = np.where(np.bincount(self.matrix.indices, minlength=self.n_features) > 0, self.idf, 0.0)
+        return _l2_normalize(counts @ sparse.diags(weights)).tocsr()
+
+    def query(self, texts: List[str], k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k por query: (índices, similaridades), ambos (queries × k), -1 onde não há resultados"""
+        scores = (self.transform(texts) @ self.matrix.T).toarray()
+        k = min(k, scores.shape[1])
+        indices = np.full((len(texts), k), -1, dtype=np.int64)
+        similarities = np.zeros((len(texts), k))
+        if k == 0:
+            return indices, similarities
+
+        # Candidatos: tudo o que empata com o k-ésimo score (argpartition escolhe empates ao acaso)
+        kth = -np.partition(-scores, k - 1, axis=1)[:, k - 1]
+        for row, threshold in enumerate(kth):
+            candidates = np.flatnonzero((scores[row] >= threshold) & (scores[row] > 0))
+            # Score descendente, empates pela posição (como no JS)
+            top = candidates[np.lexsort((candidates, -scores[row, candidates]))][:k]
+            indices[row, :len(top)] = top
+            similarities[row, :len(top)] = scores[row, top]
+        return indices, similarities
+
+    def postings(self, rows: List[int], precision: int = 4) -> Dict[str, list]:
+        """Índice invertido para export: {feature: [idf, linha, peso, linha, peso, ...]}
+
+        `rows` mapeia cada linha da matriz para a posição do exemplo na secção.
+        """
+        postings: Dict[int, list] = {}
+        coo = self.matrix.tocoo()
+        for row, feature, weight in zip(coo.row, coo.col, coo.data):
+            entry = postings.get(feature)
+            if entry is None:
+                entry = postings[feature] = [round(float(self.idf[feature]), precision)]
+            entry.extend((int(rows[row]), round(float(weight), precision)))
+        return {str(feature): postings[feature] for feature in sorted(postings)}
+
+def select_examples(examples: List[dict], limit: Optional[int]) -> List[int]:
+    """Posições dos exemplos a indexar, pela ordem da secção
+
+    Originais repetidos (após normalização) entram uma só vez, o que evita
+    devolver k cópias do mesmo exemplo; com `limit` ficam os de melhor
+    quality_score/ats_score.
+    """
+    def score(idx: int) -> tuple:
+        example = examples[idx]
+        quality = example.get('quality_score')
+        ats = example.get('ats_score')
+        return (
+            -(quality if isinstance(quality, (int, float)) else 0),
+            -(ats if isinstance(ats, (int, float)) else 0),
+            idx
+        )
+
+    best: Dict[str, int] = {}
+    for idx, example in enumerate(examples):
+        if not isinstance(example, dict) or not isinstance(example.get('original'), str):
+            continue
+        key = normalize(example['original'])
+        if key and (key not in best or score(idx) < score(best[key])):
+            best[key] = idx
+
+    candidates = sorted(best.values(), key=score)
+    if limit is not None:
+        candidates = candidates[:limit]
+    return sorted(candidates)
+
+def build_export(data: dict, max_examples_per_section: Optional[int] = 5000,
+                 n_features: int = N_FEATURES, ngram: int = NGRAM) -> dict:
+    """Índices invertidos por secção para o módulo example_index.js"""
+    sections = {}
+    for section, examples in data.get('by_section', {}).items():
+        if not isinstance(examples, list):
+            continue
+        rows = select_examples(examples, max_examples_per_section)
+        if not rows:
+            continue
+        index = ExampleIndex(n_features, ngram).fit([examples[row]['original'] for row in rows])
+        sections[section] = {
+            'indexed_examples': len(rows),
+            'postings': index.postings(rows)
+        }
+
+    return {
+        'version': '1.0.0',
+        'ngram': ngram,
+        'n_features': n_features,
+        'hash': 'fnv1a32',
+        'sections': sections
+    }
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Procura exemplos de melhoria semelhantes a um texto")
+    parser.add_argument("--query", action="append", required=True, help="Texto a procurar (pode repetir)")
+    parser.add_argument("--section", default="experience", help="Secção (default: experience)")
+    parser.add_argument("--k", type=int, default=5, help="Número de exemplos (default: 5)")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Pasta dos datasets")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    dataset = find_dataset(args.datasets_dir, "text_improvement.json")
+    if dataset is None:
+        print(f"❌ text_improvement não encontrado em {args.datasets_dir}")
+        exit(1)
+
+    examples = load_dataset(dataset).get('by_section', {}).get(args.section, [])
+    rows = select_examples(examples, None)
+    if not rows:
+        print(f"❌ Secção '{args.section}' sem exemplos")
+        exit(1)
+
+    index = ExampleIndex().fit([examples[row]['original'] for row in rows])
+    indices, similarities = index.query(args.query, args.k)
+
+    for query, row_indices, row_scores in zip(args.query, indices, similarities):
+        print(f"\n🔎 {query}")
+        for position, similarity in zip(row_indices, row_scores):
+            if position < 0:
+                continue
+            example = examples[rows[position]]
+            print(f"   {similarity:.3f}  {example['original']}  →  {example.get('improved', '')[:80]}")
+
+if __name__ == "__main__":
+    main()
@@ -4,28 +4,243 @@ Exporta datasets do Python para módulos JavaScript/Node.js
 
 Este script converte os datasets JSON em módulos ES6 prontos para usar no backend.
 
+A exportação é incremental: um manifest com o hash de cada dataset fica em
+backend/src/data/.export_manifest.json e só os datasets alterados são
+reescritos (use --force para reexportar tudo).
+
+Datasets em shards JSONL (<nome>/index.json, ver dataset_io.py) são
+juntados e exportados como o módulo <nome>.js.
+
+Modos de exportação dos dados (--mode):
+- pretty:     objeto literal indentado (legível, default)
+- minified:   objeto literal sem espaços
+- json-parse: JSON.parse('...') com o JSON minificado (só ASCII); o V8 faz o
+              parse de uma string JSON mais depressa do que de um literal
+              grande, o que reduz o arranque a frio do backend
+Com --compress gzip/brotli, cada módulo ganha irmãos .js.gz/.js.br
+pré-comprimidos. Os tamanhos (pretty vs. modo escolhido vs. comprimidos)
+ficam no manifest e no resumo.
+
+Com --chunked, skills_by_area e ats_keywords (por área) e os templates de
+summary_templates (por role) são escritos como um ficheiro JSON por chave em
+<nome>/<chave>.json. O módulo <nome>.js guarda só o resto do dataset e um
+getter por chave que lê o chunk no 1º acesso e o deixa em cache no processo,
+por isso cada worker só carrega as áreas/roles que realmente usa.
+
+Uso:
+    python scripts/export_to_backend.py
+    python scripts/export_to_backend.py --force
+    python scripts/export_to_backend.py --mode json-parse --compress gzip brotli
+    python scripts/export_to_backend.py --chunked
+    python scripts/export_to_backend.py --metrics-out metrics/export.prom --profile-out export.prof
 """
 
+import re
 import json
+import gzip
+import hashlib
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+from dataset_io import BACKEND_DATA_DIR, DATASETS_DIR, INDEX_FILENAME, find_dataset, iter_sharded_datasets, load_dataset
+from example_index import build_export as build_example_export
+from skill_graph import SkillGraph
+from job_title_index import JobTitleIndex
+from metrics import Metrics, add_metrics_arguments, run_with_metrics
+from skills_table import skills_table
+
+try:
+    import brotli
+except ImportError:  # Opcional: só necessário com --compress brotli
+    brotli = None
+
+# Incrementar quando os templates gerados mudam (invalida o manifest)
+EXPORT_FORMAT_VERSION = 8
+
+MANIFEST_FILENAME = ".export_manifest.json"
+
+EXPORT_MODES = ("pretty", "minified", "json-parse")
+COMPRESSIONS = {"gzip": ".gz", "brotli": ".br"}
+
+# Peso da prioridade na ordenação das skills (igual ao priorityWeight do index.js)
+PRIORITY_WEIGHT = {'high': 3, 'medium': 2, 'low': 1}
+
+# Helpers exportados pelo template do index.js (contados no resumo)
+INDEX_HELPER_PATTERN = re.compile(r"^export const (\w+) = \(", re.MULTILINE)
+
 class BackendExporter:
-    def __init__(self):
-        self.datasets_dir = Path("datasets/processed")
-        self.backend_dir = Path("../backend/src/data")
+    def __init__(self, force: bool = False, datasets_dir: Path = None, backend_dir: Path = None,
+                 mode: str = "pretty", compress: tuple = (), chunked: bool = False, metrics: Metrics = None,
+                 datasets: dict = None):
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode '{mode}' (expected one of {', '.join(EXPORT_MODES)})")
+        self.datasets_dir = Path(datasets_dir or DATASETS_DIR)
+        self.backend_dir = Path(backend_dir or BACKEND_DATA_DIR)
+        self.force = force
+        self.mode = mode
+        self.compress = tuple(sorted(set(compress)))
+        self.chunked = chunked
+        self.metrics = metrics or Metrics("export")
+        # Documentos já carregados pela etapa anterior ({nome do arquivo: dict}), em vez de reler o disco
+        self.datasets = datasets or {}
+        self.manifest_path = self.backend_dir / MANIFEST_FILENAME
+        
+        # Tamanhos de cada ficheiro escrito: {caminho relativo: {pretty, bytes, gzip, brotli}}
+        self.module_sizes = {}
+        
+        # Chunks escritos por módulo (--chunked): {nome do módulo: [Path, ...]}
+        self.module_chunks = {}
+        
+        # Módulos derivados exportados junto com cada dataset: (nome, builder)
+        self.derived_modules = {
+            "skills_by_area.json": [
+                ("skills_index", self.build_skill_indexes),
+                ("skill_recommendations", self.build_skill_recommendations),
+                ("job_title_index", self.build_job_title_index)
+            ],
+            "text_improvement.json": [("example_index", self.build_example_index)]
+        }
+        
+        # Outros datasets lidos pelos builders: entram no hash da exportação incremental
+        self.derived_dependencies = {
+            "skills_by_area.json": ["summary_templates.json"]
+        }
+        
+        # Datasets divididos em chunks com --chunked: caminho do objeto cujas chaves viram ficheiros
+        self.chunked_datasets = {
+            "skills_by_area.json": (),
+            "ats_keywords.json": (),
+            "summary_templates.json": ("templates_by_role",)
+        }
         
         # Criar pasta de destino se não existir
         self.backend_dir.mkdir(parents=True, exist_ok=True)
     
     def export_as_js_module(self, data: dict, filename: str) -> Path:
-        """Converte JSON Python para módulo ES6 JavaScript"""
+        """Converte JSON Python para módulo ES6 JavaScript (no modo de exportação escolhido)"""
         
         # Nome da variável (remover extensão e substituir caracteres especiais)
         var_name = filename.replace('.json', '').replace('.', '_').replace('-', '_')
         
+        chunked = self.chunked and filename in self.chunked_datasets
+        
+        # "Antes": o mesmo módulo no formato pretty original, com os dados todos
+        pretty = None
+        if self.mode != "pretty" or chunked:
+            pretty = len(self.render_js_module(data, filename, var_name, "pretty").encode("utf-8"))
+        
+        chunks = None
+        if chunked:
+            data, chunks = self.write_chunks(data, filename)
+        
+        js_content = self.render_js_module(data, filename, var_name, self.mode, chunks)
+        
+        output_file = self.backend_dir / f"{filename.replace('.json', '')}.js"
+        self.write_output(output_file, js_content.encode("utf-8"), pretty)
+        
+        return output_file
+    
+    def write_chunks(self, data: dict, filename: str) -> tuple:
+        """Escreve um ficheiro JSON por chave do objeto em chunks (--chunked)
+        
+        Devolve (dados do módulo, chunks): no módulo, cada chave em chunk fica
+        com o caminho relativo do seu ficheiro, trocado no JS por um getter lazy.
+        """
+        name = filename.replace('.json', '')
+        path = self.chunked_datasets[filename]
+        container = data
+        for key in path:
+            container = container.get(key) if isinstance(container, dict) else None
+        
+        self.module_chunks[f"{name}.js"] = []
+        if not isinstance(container, dict):
+            return data, None
+        
+        chunk_dir = self.backend_dir / name
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        stub = dict(container)
+        used = set()
+        keys = []
+        for key, value in container.items():
+            if key == 'metadata' or not isinstance(value, dict):
+                continue
+            
+            # Nome de ficheiro seguro e único para a chave
+            stem = re.sub(r'[^A-Za-z0-9_-]', '_', key) or '_'
+            chunk_name = stem
+            while chunk_name.lower() in used:
+                chunk_name = f"{stem}_{len(used)}"
+            used.add(chunk_name.lower())
+            
+            chunk_file = chunk_dir / f"{chunk_name}.json"
+            # O tamanho "antes" do chunk já conta no módulo do dataset
+            self.write_output(chunk_file, self.dump_json(value, self.mode).encode("utf-8"), pretty=0)
+            self.module_chunks[f"{name}.js"].append(chunk_file)
+            stub[key] = f"./{name}/{chunk_file.name}"
+            keys.append(key)
+        
+        def replace(obj: dict, keys_left: tuple) -> dict:
+            if not keys_left:
+                return stub
+            return {**obj, keys_left[0]: replace(obj[keys_left[0]], keys_left[1:])}
+        
+        return replace(data, path), (path, keys)
+    
+    @staticmethod
+    def dump_json(data, mode: str) -> str:
+        """JSON no formato do modo de exportação"""
+        if mode == "pretty":
+            return json.dumps(data, ensure_ascii=False, indent=2)
+        if mode == "minified":
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        # JSON só com ASCII (\uXXXX): o V8 guarda a string com 1 byte por
+        # carácter; o JSON.parse de strings de 2 bytes é quase 2x mais lento
+        return json.dumps(data, ensure_ascii=True, separators=(',', ':'))
+    
+    @classmethod
+    def render_js_module(cls, data: dict, filename: str, var_name: str, mode: str,
+                         chunks: tuple = None) -> str:
+        """Texto do módulo ES6 para um modo de exportação
+        
+        Com chunks=(caminho, chaves), as chaves do objeto em `caminho` são
+        caminhos de ficheiros JSON carregados no 1º acesso.
+        """
+        literal = cls.dump_json(data, mode)
+        if mode == "json-parse":
+            # String JS entre plicas: escapar \ e '
+            escaped = literal.replace('\\', '\\\\').replace("'", "\\'")
+            literal = f"JSON.parse('{escaped}')"
+        
+        loader = ""
+        lazy = ""
+        if chunks:
+            path, keys = chunks
+            target = var_name + ''.join(f"[{json.dumps(key, ensure_ascii=False)}]" for key in path)
+            loader = f"""
+import {{ readFileSync }} from 'fs';
+
+// Substitui cada caminho por um getter que lê o chunk no 1º acesso e
+// fica com o valor (cache do processo: cada chunk é lido uma só vez)
+const lazyChunks = (target, keys) => {{
+  for (const key of keys) {{
+    const file = target[key];
+    Object.defineProperty(target, key, {{
+      enumerable: true,
+      configurable: true,
+      get() {{
+        const value = JSON.parse(readFileSync(new URL(file, import.meta.url), 'utf8'));
+        Object.defineProperty(target, key, {{ value, enumerable: true, writable: true, configurable: true }});
+        return value;
+      }}
+    }});
+  }}
+}};
+"""
+            lazy = f"lazyChunks({target}, {json.dumps(keys, ensure_ascii=False)});\n"
+        
         # Template do módulo ES6
-        js_content = f"""/**
+        return f"""/**
  * 🤖 Auto-generated by ML Engine
  * Dataset: {filename}
  * Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -33,17 +248,114 @@ class BackendExporter:
  * ⚠️ DO NOT EDIT MANUALLY - Changes will be overwritten
  * To update, modify the Python datasets and run: python scripts/export_to_backend.py
  */
-
-export const {var_name} = {json.dumps(data, ensure_ascii=False, indent=2)};
-
+{loader}
+export const {var_name} = {literal};
+{lazy}
 export default {var_name};
 """
+    
+    def write_output(self, output_file: Path, content: bytes, pretty: int = None):
+        """Escreve um ficheiro gerado (+ irmãos comprimidos) e regista os tamanhos"""
+        with open(output_file, "wb") as f:
+            f.write(content)
         
-        output_file = self.backend_dir / f"{filename.replace('.json', '')}.js"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(js_content)
+        sizes = {"pretty": len(content) if pretty is None else pretty, "bytes": len(content)}
+        sizes.update(self.write_compressed(output_file, content))
+        self.module_sizes[self.relative(output_file)] = sizes
+    
+    def relative(self, path: Path) -> str:
+        """Caminho de um ficheiro gerado relativo à pasta do backend (chave do manifest)"""
+        return path.relative_to(self.backend_dir).as_posix()
+    
+    def write_compressed(self, output_file: Path, content: bytes) -> dict:
+        """Escreve os irmãos pré-comprimidos (.gz/.br) de um módulo; devolve os tamanhos"""
+        sizes = {}
+        for compression in self.compress:
+            if compression == "gzip":
+                # mtime=0: o mesmo conteúdo gera sempre o mesmo .gz
+                compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            else:
+                compressed = brotli.compress(content, quality=11)
+            with open(output_file.with_name(output_file.name + COMPRESSIONS[compression]), "wb") as f:
+                f.write(compressed)
+            sizes[compression] = len(compressed)
+        return sizes
+    
+    def module_files(self, module: Path) -> list:
+        """Módulo .js e respetivos irmãos comprimidos"""
+        return [module] + [module.with_name(module.name + COMPRESSIONS[c]) for c in self.compress]
+    
+    def build_skill_indexes(self, skills_data: dict) -> dict:
+        """Pré-calcula índices de lookup sobre skills_by_area
         
-        return output_file
+        Usa a tabela achatada (skills_table.py), por isso cobre categorias a
+        qualquer nível de aninhamento e listas diretamente numa área. As
+        entradas são referências [lista, idx]: `lists` guarda o caminho de
+        chaves de cada lista de skills, resolvido no JS só no 1º uso, sem
+        duplicar os dados.
+        """
+        table = skills_table(skills_data)
+        skills = table.frame[table.frame['is_skill']]
+        
+        def refs(rows) -> list:
+            return rows[['list_id', 'position']].values.tolist()
+        
+        # Primeira ocorrência ganha (mesma ordem de pesquisa do findSkill)
+        named = skills[skills['name'].fillna('') != '']
+        named = named.assign(key=named['name'].str.lower())
+        by_name = {
+            key: [list_id, position]
+            for key, list_id, position in named.drop_duplicates('key')[['key', 'list_id', 'position']].values.tolist()
+        }
+        by_area_name = {area: {} for area in table.areas}
+        for area, key, list_id, position in named.drop_duplicates(['area', 'key'])[['area', 'key', 'list_id', 'position']].values.tolist():
+            by_area_name[area][key] = [list_id, position]
+        
+        # Ordenado por prioridade e demand_score (ordem do getSkillsForJob); sort estável.
+        # Categorias aninhadas entram também em cada categoria-mãe (technology.frontend
+        # inclui technology.frontend.frameworks), que é o que os títulos de cargo referem
+        demand = skills['demand_score'].fillna(0)
+        ranked = skills.assign(weight=skills['priority'].map(PRIORITY_WEIGHT).fillna(0), demand=demand)
+        ranked = ranked.sort_values(['weight', 'demand'], ascending=False, kind='stable')
+        ranked = ranked.assign(prefix=ranked['category'].map(
+            lambda category: ['.'.join(category.split('.')[:depth]) for depth in range(1, category.count('.') + 2)]
+        )).explode('prefix')
+        by_category = {
+            f"{area}.{prefix}": refs(rows)
+            for (area, prefix), rows in ranked.groupby(['area', 'prefix'], sort=False)
+        }
+        
+        # Listas por área e prioridade já ordenadas por demand_score (descendente)
+        top_by_area_priority = {area: {} for area in table.areas}
+        by_demand = skills.assign(demand=demand).sort_values('demand', ascending=False, kind='stable')
+        for (area, priority), rows in by_demand.groupby(['area', 'priority'], sort=False):
+            top_by_area_priority[area][priority] = refs(rows)
+        
+        return {
+            "lists": [list(path) for path in table.lists],
+            "by_name": by_name,
+            "by_area_name": by_area_name,
+            "top_by_area_priority": top_by_area_priority,
+            "by_category": by_category
+        }
+    
+    def build_skill_recommendations(self, skills_data: dict) -> dict:
+        """Top-k de recomendações por skill a partir do grafo de related_skills (ver skill_graph.py)"""
+        return SkillGraph.from_datasets(skills_data).to_export()
+    
+    def build_job_title_index(self, skills_data: dict) -> dict:
+        """Índice de títulos de cargo → área/categoria (ver job_title_index.py)"""
+        summary_path = find_dataset(self.datasets_dir, "summary_templates.json")
+        summary_data = load_dataset(summary_path) if summary_path else None
+        return JobTitleIndex.build(skills_data, summary_data).to_export()
+    
+    def build_example_index(self, text_data: dict) -> dict:
+        """Índice invertido TF-IDF dos textos 'original' por secção (ver example_index.py)
+        
+        As linhas são posições em text_improvement.by_section[section], por isso
+        o findSimilarExamples devolve os próprios exemplos sem duplicar dados.
+        """
+        return build_example_export(text_data)
     
     def create_index_file(self, exported_files: list) -> Path:
         """Cria arquivo index.js para importar todos os datasets"""
@@ -74,6 +386,84 @@ export {{
 
 // ========== HELPER FUNCTIONS ==========
 
+// Lookup seguro em objetos dos índices (ignora propriedades do prototype)
+const own = (obj, key) =>
+  obj && Object.prototype.hasOwnProperty.call(obj, key) ? obj[key] : undefined;
+
+/**
+ * Autómato Aho-Corasick (mesmo algoritmo do ml_engine/scripts/keyword_matcher.py)
+ * Encontra todas as keywords numa única passagem pelo texto (case-insensitive)
+ * @param {{Array<string>}} keywords - Lista de keywords
+ * @returns {{Function}} - (text) => Set com os índices das keywords encontradas
+ */
+const buildKeywordMatcher = (keywords) => {{
+  const transitions = [new Map()];
+  const fail = [0];
+  const out = [[]];
+  
+  keywords.forEach((keyword, id) => {{
+    const pattern = keyword.toLowerCase();
+    if (!pattern) return;
+    let state = 0;
+    for (const char of pattern) {{
+      let next = transitions[state].get(char);
+      if (next === undefined) {{
+        next = transitions.length;
+        transitions.push(new Map());
+        fail.push(0);
+        out.push([]);
+        transitions[state].set(char, next);
+      }}
+      state = next;
+    }}
+    out[state].push(id);
+  }});
+  
+  // Links de falha (BFS)
+  const queue = [...transitions[0].values()];
+  for (let head = 0; head < queue.length; head++) {{
+    const state = queue[head];
+    for (const [char, next] of transitions[state]) {{
+      let fallback = fail[state];
+      while (fallback && !transitions[fallback].has(char)) fallback = fail[fallback];
+      fail[next] = transitions[fallback].get(char) ?? 0;
+      out[next] = out[next].concat(out[fail[next]]);
+      queue.push(next);
+    }}
+  }}
+  
+  return (text) => {{
+    const found = new Set();
+    let state = 0;
+    for (const char of text.toLowerCase()) {{
+      while (state && !transitions[state].has(char)) state = fail[state];
+      state = transitions[state].get(char) ?? 0;
+      for (const id of out[state]) found.add(id);
+    }}
+    return found;
+  }};
+}};
+
+// Autómatos por área para o calculateATSScore (os datasets são estáticos)
+const atsMatchers = new Map();
+
+// Listas de skills resolvidas no 1º uso a partir do caminho em skills_index.lists
+// (com --chunked só a área pedida é lida)
+const skillLists = [];
+
+const skillAt = ([list, idx]) => {{
+  if (skillLists[list] === undefined) {{
+    skillLists[list] = skills_index.lists[list].reduce((node, key) => node[key], skills_by_area);
+  }}
+  return skillLists[list][idx];
+}};
+
+// Área e categoria de uma lista (categoria aninhada = caminho com pontos)
+const skillPlace = (list) => {{
+  const [area, ...path] = skills_index.lists[list];
+  return {{ area, category: path.join('.') || area }};
+}};
+
 /**
  * Buscar skill por nome em qualquer área
  * @param {{string}} skillName - Nome da skill
@@ -87,39 +477,24 @@ export {{
 export const findSkill = (skillName, area = null) => {{
   const db = skills_by_area;
   
-  if (!db || typeof db !== 'object') {{
+  if (!db || typeof db !== 'object' || !skills_index) {{
     console.warn('skills_by_area dataset not loaded');
     return null;
   }}
   
-  const searchInArea = (areaData) => {{
-    for (const category in areaData) {{
-      if (Array.isArray(areaData[category])) {{
-        const found = areaData[category].find(s => 
-          s.name && s.name.toLowerCase() === skillName.toLowerCase()
-        );
-        if (found) return {{ ...found, category }};
-      }}
-    }}
-    return null;
-  }};
+  const key = skillName.toLowerCase();
   
   // Buscar em área específica
   if (area && db[area]) {{
-    const result = searchInArea(db[area]);
-    if (result) return {{ ...result, area }};
+    const ref = own(own(skills_index.by_area_name, area), key);
+    if (ref) return {{ ...skillAt(ref), ...skillPlace(ref[0]) }};
   }}
   
-  // Buscar em todas as áreas
-  for (const areaKey in db) {{
-    if (areaKey === 'metadata') continue;
-    if (typeof db[areaKey] !== 'object') continue;
-    
-    const result = searchInArea(db[areaKey]);
-    if (result) return {{ ...result, area: areaKey }};
-  }}
+  // Buscar em todas as áreas (índice nome → skill)
+  const ref = own(skills_index.by_name, key);
+  if (!ref) return null;
   
-  return null;
+  return {{ ...skillAt(ref), ...skillPlace(ref[0]) }};
 }};
 
 /**
@@ -156,6 +531,80 @@ export const findImprovementExamples = (section) => {{
   return text_improvement.by_section[section] || [];
 }};
 
+// FNV-1a 32-bit sobre code points (igual ao ml_engine/scripts/example_index.py)
+const fnv1a = (str) => {{
+  let h = 0x811c9dc5;
+  for (const char of str) {{
+    h ^= char.codePointAt(0);
+    h = Math.imul(h, 0x01000193) >>> 0;
+  }}
+  return h;
+}};
+
+const normalizeExampleText = (text) =>
+  String(text)
+    .toLowerCase()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .split(/\s+/)
+    .filter(Boolean)
+    .join(' ');
+
+/**
+ * Encontrar os exemplos de melhoria mais parecidos com um texto (few-shot prompting)
+ * Cosseno TF-IDF sobre trigramas de caracteres, via índice invertido pré-calculado
+ * @param {{string}} text - Texto original do utilizador
+ * @param {{string}} section - Secção do CV (experience, summary, education, skills)
+ * @param {{number}} [k=3] - Número máximo de exemplos
+ * @returns {{Array}} - Exemplos ordenados por similaridade (campo extra `similarity`)
+ * 
+ * @example
+ * const shots = findSimilarExamples('Trabalhei com React no frontend', 'experience', 3);
+ * shots.forEach(ex => console.log(ex.similarity.toFixed(2), ex.improved));
+ */
+export const findSimilarExamples = (text, section, k = 3) => {{
+  const examples = findImprovementExamples(section);
+  const index = example_index && own(example_index.sections, section);
+  if (!index || !examples.length || typeof text !== 'string') {{
+    return [];
+  }}
+  
+  // Vetor da query: contagens de trigramas × idf (só features indexadas)
+  const {{ ngram, n_features: nFeatures }} = example_index;
+  const chars = Array.from(` ${{normalizeExampleText(text)}} `);
+  const counts = new Map();
+  for (let i = 0; i + ngram <= chars.length; i++) {{
+    const feature = String(fnv1a(chars.slice(i, i + ngram).join('')) % nFeatures);
+    counts.set(feature, (counts.get(feature) || 0) + 1);
+  }}
+  
+  const query = [];
+  let norm = 0;
+  for (const [feature, count] of counts) {{
+    const postings = own(index.postings, feature);
+    if (!postings) continue;
+    const weight = count * postings[0];
+    query.push([postings, weight]);
+    norm += weight * weight;
+  }}
+  if (!norm) return [];
+  norm = Math.sqrt(norm);
+  
+  // Produto interno só com os exemplos que partilham trigramas com a query
+  const scores = new Map();
+  for (const [postings, weight] of query) {{
+    const w = weight / norm;
+    for (let j = 1; j < postings.length; j += 2) {{
+      scores.set(postings[j], (scores.get(postings[j]) || 0) + w * postings[j + 1]);
+    }}
+  }}
+  
+  return [...scores]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, k)
+    .map(([row, similarity]) => ({{ ...examples[row], similarity }}));
+}};
+
 /**
  * Obter top skills por área e prioridade
  * @param {{string}} area - Área profissional
@@ -169,27 +618,89 @@ export const findImprovementExamples = (section) => {{
  */
 export const getTopSkills = (area, priority = 'high', limit = 10) => {{
   const db = skills_by_area;
-  if (!db || !db[area]) {{
+  if (!db || !db[area] || !skills_index) {{
     console.warn(`Area '${{area}}' not found in skills database`);
     return [];
   }}
   
-  const skills = [];
+  // Listas pré-ordenadas por demand_score (descendente) no export
+  const refs = own(own(skills_index.top_by_area_priority, area), priority) || [];
+  return refs
+    .slice(0, limit)
+    .map(ref => ({{ ...skillAt(ref), category: skillPlace(ref[0]).category }}));
+}};
+
+// Estruturas do job_title_index construídas no 1º uso
+let jobTitleLookup = null;
+
+const titleTrigrams = (key) => {{
+  const padded = ` ${{key}} `;
+  const grams = new Set();
+  for (let i = 0; i + 3 <= padded.length; i++) grams.add(padded.slice(i, i + 3));
+  return [...grams];
+}};
+
+/**
+ * Resolver um título de cargo em texto livre para áreas/categorias de skills
+ * Lookup exato e, se falhar, semelhança de trigramas (sem acentos nem senioridade)
+ * @param {{string}} jobTitle - Título do cargo (PT ou EN)
+ * @returns {{Object|null}} - {{ title, similarity, targets: [{{ area, category, weight }}] }}
+ * 
+ * @example
+ * const job = resolveJobTitle('Programador Front-End Sénior');
+ * console.log(job.title, job.targets); // 'Frontend Developer', [{{ area: 'technology', ... }}]
+ */
+export const resolveJobTitle = (jobTitle) => {{
+  const index = job_title_index;
+  if (!index || !index.keys) {{
+    console.warn('job_title_index dataset not loaded');
+    return null;
+  }}
+  if (!jobTitleLookup) {{
+    jobTitleLookup = {{
+      exact: new Map(index.keys.map((key, id) => [key, id])),
+      sizes: index.keys.map(key => titleTrigrams(key).length),
+      seniority: new Set(index.seniority_words)
+    }};
+  }}
+  
+  const key = normalizeExampleText(jobTitle ?? '')
+    .replace(/[^a-z0-9+#.]+/g, ' ')
+    .split(' ')
+    .filter(word => word && !jobTitleLookup.seniority.has(word))
+    .join(' ');
+  if (!key) return null;
   
-  // Coletar skills de todas as subcategorias
-  for (const category in db[area]) {{
-    if (Array.isArray(db[area][category])) {{
-      const filtered = db[area][category].filter(s => 
-        s.priority === priority
-      );
-      skills.push(...filtered.map(s => ({{ ...s, category }})));
+  let best = jobTitleLookup.exact.get(key);
+  let bestScore = best === undefined ? 0 : 1;
+  if (best === undefined) {{
+    // Trigramas partilhados com cada chave (índice invertido)
+    const query = titleTrigrams(key);
+    const shared = new Map();
+    for (const gram of query) {{
+      for (const id of own(index.trigrams, gram) || []) {{
+        shared.set(id, (shared.get(id) || 0) + 1);
+      }}
+    }}
+    for (const [id, count] of shared) {{
+      const score = count / Math.sqrt(query.length * jobTitleLookup.sizes[id]);
+      if (score > bestScore || (score === bestScore && id < best)) {{
+        best = id;
+        bestScore = score;
+      }}
     }}
+    if (best === undefined || bestScore < index.min_similarity) return null;
   }}
   
-  // Ordenar por demand_score (descendente)
-  return skills
-    .sort((a, b) => (b.demand_score || 0) - (a.demand_score || 0))
-    .slice(0, limit);
+  const titleId = index.key_titles[best];
+  return {{
+    title: index.titles[titleId],
+    similarity: bestScore,
+    targets: index.targets[titleId].map(([path, weight]) => {{
+      const dot = path.indexOf('.');
+      return {{ area: path.slice(0, dot), category: path.slice(dot + 1), weight }};
+    }})
+  }};
 }};
 
 /**
@@ -203,38 +714,35 @@ export const getTopSkills = (area, priority = 'high', limit = 10) => {{
  */
 export const getSkillsForJob = (jobTitle, currentSkills = []) => {{
   const db = skills_by_area;
-  const normalizedCurrent = currentSkills.map(s => s.toLowerCase());
-  
-  // Mapeamento de cargo para área
-  const jobToArea = {{
-    'frontend developer': ['technology.frontend'],
-    'backend developer': ['technology.backend'],
-    'full stack developer': ['technology.frontend', 'technology.backend'],
-    'devops engineer': ['technology.devops'],
-    'data analyst': ['technology.data_science'],
-    'digital marketer': ['marketing.digital_marketing'],
-  }};
+  if (!db || !skills_index) {{
+    console.warn('skills_by_area dataset not loaded');
+    return [];
+  }}
+  const normalizedCurrent = new Set(currentSkills.map(s => s.toLowerCase()));
   
-  const jobKey = jobTitle.toLowerCase();
-  const areas = jobToArea[jobKey] || [];
+  // Cargo em texto livre → área.categoria (índice de títulos gerado no export)
+  const resolved = resolveJobTitle(jobTitle);
+  const targets = resolved ? resolved.targets : [];
   
+  const limit = 6;
   const recommendations = [];
   
-  areas.forEach(areaPath => {{
-    const [area, category] = areaPath.split('.');
-    if (db[area] && db[area][category]) {{
-      const skills = db[area][category];
-      skills.forEach(skill => {{
-        // Sugerir apenas skills que o user ainda não tem
-        if (!normalizedCurrent.includes(skill.name.toLowerCase())) {{
-          recommendations.push({{
-            ...skill,
-            area,
-            category,
-            reason: `Essencial para ${{jobTitle}}`
-          }});
-        }}
-      }});
+  targets.forEach(({{ area, category }}) => {{
+    // Categoria pré-ordenada por prioridade e demand_score: basta o top de cada uma
+    const refs = own(skills_index.by_category, `${{area}}.${{category}}`) || [];
+    let taken = 0;
+    for (const ref of refs) {{
+      if (taken >= limit) break;
+      const skill = skillAt(ref);
+      // Sugerir apenas skills que o user ainda não tem
+      if (!normalizedCurrent.has(skill.name.toLowerCase())) {{
+        recommendations.push({{
+          ...skill,
+          ...skillPlace(ref[0]),
+          reason: `Essencial para ${{jobTitle}}`
+        }});
+        taken++;
+      }}
     }}
   }});
   
@@ -246,9 +754,68 @@ export const getSkillsForJob = (jobTitle, currentSkills = []) => {{
       if (priorityDiff !== 0) return priorityDiff;
       return (b.demand_score || 0) - (a.demand_score || 0);
     }})
-    .slice(0, 6);
+    .slice(0, limit);
+}};
+
+// Nome (minúsculas) → id no grafo de skill_recommendations (construído no 1º uso)
+let skillGraphIds = null;
+
+/**
+ * Recomendar skills a partir das que o user já tem (grafo de related_skills)
+ * Os scores multi-hop (ponderados por demand_score) são pré-calculados no export:
+ * cada skill atual contribui com o seu top-k, sem travessias por pedido
+ * @param {{Array}} currentSkills - Skills que o user já possui
+ * @param {{number}} [limit=10] - Número máximo de recomendações
+ * @returns {{Array}} - Skills recomendadas (campo extra `score`)
+ * 
+ * @example
+ * const next = getRecommendedSkills(['React', 'Docker'], 5);
+ * next.forEach(skill => console.log(skill.name, skill.score));
+ */
+export const getRecommendedSkills = (currentSkills = [], limit = 10) => {{
+  if (!skill_recommendations || !skill_recommendations.top) {{
+    console.warn('skill_recommendations dataset not loaded');
+    return [];
+  }}
+  if (!skillGraphIds) {{
+    skillGraphIds = new Map();
+    skill_recommendations.skills.forEach((name, id) => {{
+      if (!skillGraphIds.has(name.toLowerCase())) skillGraphIds.set(name.toLowerCase(), id);
+    }});
+  }}
+  
+  const owned = new Set();
+  currentSkills.forEach(name => {{
+    const id = skillGraphIds.get(String(name).toLowerCase());
+    if (id !== undefined) owned.add(id);
+  }});
+  
+  const scores = new Map();
+  owned.forEach(id => {{
+    const top = skill_recommendations.top[id];
+    for (let j = 0; j < top.length; j += 2) {{
+      if (!owned.has(top[j])) scores.set(top[j], (scores.get(top[j]) || 0) + top[j + 1]);
+    }}
+  }});
+  
+  return [...scores]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, limit)
+    .map(([id, score]) => {{
+      const name = skill_recommendations.skills[id];
+      // Skills só referidas em related_skills não estão em skills_by_area
+      return {{ ...(findSkill(name) || {{ name }}), score }};
+    }});
 }};
 
+// Verbos de ação fortes usados pelo validateImprovement
+const actionVerbs = [
+  'desenvolvi', 'implementei', 'geri', 'liderei', 'otimizei', 
+  'aumentei', 'reduzi', 'arquitetei', 'coordenei', 'executei',
+  'criei', 'construí', 'lancei', 'melhorei', 'automatizei'
+];
+const matchActionVerbs = buildKeywordMatcher(actionVerbs);
+
 /**
  * Validar se texto melhorou baseado em keywords e padrões
  * @param {{string}} original - Texto original
@@ -274,14 +841,7 @@ export const validateImprovement = (original, improved) => {{
   }};
   
   // 1. Verificar verbos de ação fortes
-  const actionVerbs = [
-    'desenvolvi', 'implementei', 'geri', 'liderei', 'otimizei', 
-    'aumentei', 'reduzi', 'arquitetei', 'coordenei', 'executei',
-    'criei', 'construí', 'lancei', 'melhorei', 'automatizei'
-  ];
-  analysis.hasActionVerb = actionVerbs.some(verb => 
-    improved.toLowerCase().includes(verb)
-  );
+  analysis.hasActionVerb = matchActionVerbs(improved).size > 0;
   if (!analysis.hasActionVerb) {{
     analysis.suggestions.push('Adicione um verbo de ação forte no início');
   }}
@@ -372,33 +932,36 @@ export const getSummaryTemplate = (role, seniority = 'mid-level', tone = 'profes
  */
 export const calculateATSScore = (text, area = 'technology') => {{
   const keywords = getATSKeywords(area);
-  const lowerText = text.toLowerCase();
+  const mustHave = keywords.must_have || [];
+  const strong = keywords.strong || [];
+  
+  // Uma passagem do autómato pelo texto encontra todas as keywords da área
+  if (!atsMatchers.has(area)) {{
+    atsMatchers.set(area, buildKeywordMatcher([...mustHave, ...strong]));
+  }}
+  const found = atsMatchers.get(area)(text);
   
   let score = 0;
   const foundKeywords = [];
   const missingKeywords = [];
   
   // Verificar must_have keywords (peso 3)
-  if (keywords.must_have) {{
-    keywords.must_have.forEach(keyword => {{
-      if (lowerText.includes(keyword.toLowerCase())) {{
-        score += 3;
-        foundKeywords.push(keyword);
-      }} else {{
-        missingKeywords.push(keyword);
-      }}
-    }});
-  }}
+  mustHave.forEach((keyword, idx) => {{
+    if (found.has(idx)) {{
+      score += 3;
+      foundKeywords.push(keyword);
+    }} else {{
+      missingKeywords.push(keyword);
+    }}
+  }});
   
   // Verificar strong keywords (peso 2)
-  if (keywords.strong) {{
-    keywords.strong.forEach(keyword => {{
-      if (lowerText.includes(keyword.toLowerCase())) {{
-        score += 2;
-        foundKeywords.push(keyword);
-      }}
-    }});
-  }}
+  strong.forEach((keyword, idx) => {{
+    if (found.has(mustHave.length + idx)) {{
+      score += 2;
+      foundKeywords.push(keyword);
+    }}
+  }});
   
   // Normalizar para 0-100
   const maxScore = (keywords.must_have?.length || 0) * 3 + (keywords.strong?.length || 0) * 2;
@@ -414,11 +977,69 @@ export const calculateATSScore = (text, area = 'technology') => {{
 """
         
         index_file = self.backend_dir / "index.js"
-        with open(index_file, "w", encoding="utf-8") as f:
-            f.write(index_content)
+        self.write_output(index_file, index_content.encode("utf-8"))
         
         return index_file
     
+    def load_manifest(self) -> dict:
+        """Carrega o manifest da última exportação
+        
+        Com --force ou outra versão/modo/compressão/chunking, os hashes são
+        descartados (tudo é reexportado) mas os outputs ficam, para remover
+        os ficheiros que o novo formato já não gera.
+        """
+        empty = {"version": EXPORT_FORMAT_VERSION, "files": {}, "index": [], "sizes": {}}
+        
+        if not self.manifest_path.exists():
+            return empty
+        
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return empty
+        
+        # Mudanças no formato gerado (versão, modo, compressão ou chunks) invalidam tudo
+        if (
+            self.force
+            or manifest.get("version") != EXPORT_FORMAT_VERSION
+            or manifest.get("mode", "pretty") != self.mode
+            or manifest.get("compress", []) != list(self.compress)
+            or manifest.get("chunked", False) != self.chunked
+        ):
+            empty["files"] = {
+                name: {"outputs": entry.get("outputs", [])}
+                for name, entry in manifest.get("files", {}).items() if isinstance(entry, dict)
+            }
+            return empty
+        manifest.setdefault("sizes", {})
+        
+        return manifest
+    
+    def save_manifest(self, manifest: dict):
+        """Guarda o manifest com os hashes dos datasets exportados"""
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """SHA-256 do conteúdo de um arquivo (lido em blocos)"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def hash_with_dependencies(self, source_hash: str, dependencies: list) -> str:
+        """Combina o hash de um dataset com o dos datasets de que os módulos derivados dependem"""
+        digest = hashlib.sha256(source_hash.encode())
+        for dependency in dependencies:
+            path = find_dataset(self.datasets_dir, dependency)
+            if path is not None:
+                path = path / INDEX_FILENAME if path.is_dir() else path
+            digest.update(f"{dependency}:{self.hash_file(path) if path else '-'}".encode())
+        return digest.hexdigest()
+    
     def export_all(self):
         """Exporta todos os datasets para o backend"""
         print("\n" + "="*70)
@@ -433,52 +1054,174 @@ export const calculateATSScore = (text, area = 'technology') => {{
             return False
         
         exported_files = []
+        rebuilt_files = []
+        skipped_files = []
         total_size = 0
         
-        # Listar todos os JSONs processados
-        json_files = sorted(self.datasets_dir.glob("*.json"))
+        # Listar todos os JSONs processados (datasets em shards JSONL exportam como <nome>.json)
+        sources = {path.name: path for path in self.datasets_dir.glob("*.json")}
+        for dataset_dir in iter_sharded_datasets(self.datasets_dir):
+            sources[f"{dataset_dir.name}.json"] = dataset_dir
+        json_files = [sources[name] for name in sorted(sources)]
         
         if not json_files:
             print(f"❌ Nenhum arquivo JSON encontrado em {self.datasets_dir}")
             print(f"💡 Execute primeiro: python scripts/generate_datasets.py")
             return False
         
+        if "brotli" in self.compress and brotli is None:
+            print(f"❌ Erro: --compress brotli requer o pacote 'brotli'")
+            print(f"💡 Instale com: pip install brotli")
+            return False
+        
         print(f"📂 Encontrados {len(json_files)} arquivos JSON")
         print(f"📁 Destino: {self.backend_dir.absolute()}")
+        print(f"🗜️  Modo: {self.mode}" + (f" (+ {', '.join(self.compress)})" if self.compress else "")
+              + (" em chunks por área/role" if self.chunked else ""))
+        if self.force:
+            print(f"♻️  --force: todos os datasets serão reexportados")
         print()
         
+        previous = self.load_manifest()
+        manifest = {
+            "version": EXPORT_FORMAT_VERSION,
+            "mode": self.mode,
+            "compress": list(self.compress),
+            "chunked": self.chunked,
+            "files": {},
+            "index": [],
+            "sizes": {}
+        }
+        
         # Processar cada arquivo JSON
-        for json_file in json_files:
-            try:
-                print(f"   Processando {json_file.name}...", end=" ", flush=True)
-                
-                # Carregar JSON
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                # Exportar como módulo JS
-                output = self.export_as_js_module(data, json_file.name)
-                exported_files.append(output)
-                
-                # Calcular tamanho
-                size_kb = output.stat().st_size / 1024
-                total_size += size_kb
-                
-                print(f"✅ ({size_kb:.1f} KB)")
-                
-            except json.JSONDecodeError as e:
-                print(f"❌ Erro ao parsear JSON: {e}")
-            except Exception as e:
-                print(f"❌ Erro: {e}")
-        
-        # Criar index.js
+        for source in json_files:
+            source_name = source.name if source.is_file() else f"{source.name}.json"
+            with self.metrics.stage(source_name) as stage:
+                try:
+                    print(f"   Processando {source.name if source.is_file() else source.name + '/'}...", end=" ", flush=True)
+                    
+                    # Shards: o index.json tem o sha256 de cada shard
+                    source_hash = self.hash_file(source if source.is_file() else source / INDEX_FILENAME)
+                    dependencies = self.derived_dependencies.get(source_name, [])
+                    if dependencies:
+                        source_hash = self.hash_with_dependencies(source_hash, dependencies)
+                    entry = previous["files"].get(source_name)
+                    derived = self.derived_modules.get(source_name, [])
+                    expected = [self.backend_dir / f"{Path(source_name).stem}.js"]
+                    expected += [self.backend_dir / f"{name}.js" for name, _ in derived]
+                    
+                    # Dataset sem alterações desde a última exportação (módulos e chunks no disco)
+                    if entry and entry.get("sha256") == source_hash and all(
+                        path.exists() for module in expected for path in self.module_files(module)
+                    ) and all((self.backend_dir / name).exists() for name in entry.get("outputs", [])):
+                        outputs = expected
+                        files = [self.backend_dir / name for name in entry["outputs"]]
+                        skipped_files.extend(outputs)
+                        self.module_sizes.update({
+                            name: previous["sizes"][name]
+                            for name in entry["outputs"] if name in previous["sizes"]
+                        })
+                        status = "⏭️  sem alterações"
+                    else:
+                        # Carregar JSON (ou juntar os shards), se ainda não estiver em memória
+                        data = self.datasets.get(source_name)
+                        if data is None:
+                            with self.metrics.stage("load"):
+                                data = load_dataset(source)
+                        
+                        # Exportar como módulo JS (+ módulos derivados, ex: índices)
+                        with self.metrics.stage(f"{Path(source_name).stem}.js"):
+                            outputs = [self.export_as_js_module(data, source_name)]
+                        for name, builder in derived:
+                            with self.metrics.stage(f"{name}.js"):
+                                outputs.append(self.export_as_js_module(builder(data), f"{name}.json"))
+                        files = [
+                            path
+                            for output in outputs
+                            for written in [output] + self.module_chunks.get(output.name, [])
+                            for path in self.module_files(written)
+                        ]
+                        rebuilt_files.extend(outputs)
+                        status = "✅"
+                    
+                    exported_files.extend(outputs)
+                    manifest["files"][source_name] = {
+                        "sha256": source_hash,
+                        "outputs": [self.relative(path) for path in files]
+                    }
+                    
+                    # Calcular tamanho (módulos .js e chunks; os comprimidos vão para o resumo)
+                    uncompressed = [path for path in files if path.suffix not in COMPRESSIONS.values()]
+                    stage.bytes = sum(path.stat().st_size for path in uncompressed)
+                    size_kb = stage.bytes / 1024
+                    total_size += size_kb
+                    
+                    extra = f" + {', '.join(output.name for output in outputs[1:])}" if len(outputs) > 1 else ""
+                    chunk_count = sum(1 for path in uncompressed if path.suffix == ".json")
+                    if chunk_count:
+                        extra += f" + {chunk_count} chunks"
+                    print(f"{status} ({size_kb:.1f} KB{extra})")
+                    
+                except json.JSONDecodeError as e:
+                    print(f"❌ Erro ao parsear JSON: {e}")
+                except Exception as e:
+                    print(f"❌ Erro: {e}")
+        
+        # Remover módulos de datasets que deixaram de existir e ficheiros que já não são gerados
+        # (ex: chunks de uma área removida, ou todos os chunks ao desligar --chunked)
+        removed_files = []
+        for name, entry in previous["files"].items():
+            if name in manifest["files"]:
+                current = set(manifest["files"][name]["outputs"])
+            elif find_dataset(self.datasets_dir, name) is None:
+                current = set()
+            else:
+                continue
+            for output_name in entry.get("outputs", []):
+                stale = self.backend_dir / output_name
+                if output_name not in current and stale.is_file():
+                    stale.unlink()
+                    removed_files.append(stale)
+                    # Pasta de chunks vazia
+                    if stale.parent != self.backend_dir and not any(stale.parent.iterdir()):
+                        stale.parent.rmdir()
+        
+        # Irmãos comprimidos de uma compressão que deixou de ser pedida
+        for compression, suffix in COMPRESSIONS.items():
+            if compression not in self.compress:
+                for stale in sorted(self.backend_dir.glob(f"*.js{suffix}")):
+                    stale.unlink()
+                    removed_files.append(stale)
+        
+        # Criar index.js (apenas se a lista de módulos ou algum módulo mudou)
         print()
-        print(f"📝 Criando index.js com helper functions...", end=" ", flush=True)
-        index_file = self.create_index_file(exported_files)
+        manifest["index"] = [file.stem for file in exported_files]
+        index_file = self.backend_dir / "index.js"
+        index_changed = (
+            bool(rebuilt_files) or bool(removed_files)
+            or manifest["index"] != previous["index"]
+            or not all(path.exists() for path in self.module_files(index_file))
+        )
+        if index_changed:
+            print(f"📝 Criando index.js com helper functions...", end=" ", flush=True)
+            with self.metrics.stage("index.js"):
+                index_file = self.create_index_file(exported_files)
+        else:
+            print(f"📝 index.js sem alterações...", end=" ", flush=True)
+            if self.relative(index_file) in previous["sizes"]:
+                self.module_sizes[self.relative(index_file)] = previous["sizes"][self.relative(index_file)]
         index_size_kb = index_file.stat().st_size / 1024
+        index_helpers = len(INDEX_HELPER_PATTERN.findall(index_file.read_text(encoding="utf-8")))
         total_size += index_size_kb
         print(f"✅ ({index_size_kb:.1f} KB)")
         
+        written = [name for entry in manifest["files"].values() for name in entry["outputs"]]
+        manifest["sizes"] = {
+            name: self.module_sizes[name]
+            for name in written + [self.relative(index_file)] if name in self.module_sizes
+        }
+        self.save_manifest(manifest)
+        
         # Resumo final
         print()
         print("="*70)
@@ -486,14 +1229,34 @@ export const calculateATSScore = (text, area = 'technology') => {{
         print("="*70)
         print()
         print(f"📊 Estatísticas:")
-        print(f"   • Arquivos criados: {len(exported_files) + 1}")
+        print(f"   • Arquivos reconstruídos: {len(rebuilt_files) + (1 if index_changed else 0)}")
+        print(f"   • Arquivos sem alterações: {len(skipped_files) + (0 if index_changed else 1)}")
+        if removed_files:
+            print(f"   • Arquivos removidos: {len(removed_files)}")
         print(f"   • Tamanho total: {total_size:.1f} KB")
+        sizes = list(manifest["sizes"].values())
+        if sizes and self.mode != "pretty":
+            before = sum(size["pretty"] for size in sizes) / 1024
+            after = sum(size["bytes"] for size in sizes) / 1024
+            print(f"   • pretty → {self.mode}: {before:.1f} KB → {after:.1f} KB ({(after / before - 1) * 100:+.0f}%)")
+        if self.chunked:
+            # Só os módulos .js são carregados no arranque; os chunks no 1º acesso
+            chunks = [size for name, size in manifest["sizes"].items() if name.endswith(".json")]
+            eager = sum(size["bytes"] for name, size in manifest["sizes"].items() if name.endswith(".js")) / 1024
+            print(f"   • Chunks: {len(chunks)} ({sum(size['bytes'] for size in chunks) / 1024:.1f} KB, lidos no 1º acesso); "
+                  f"arranque: {eager:.1f} KB")
+        for compression in self.compress:
+            compressed = sum(size.get(compression, 0) for size in sizes) / 1024
+            print(f"   • {compression}: {compressed:.1f} KB (*{COMPRESSIONS[compression]})")
         print(f"   • Localização: {self.backend_dir.absolute()}")
         print()
         print(f"📄 Arquivos gerados:")
         for file in exported_files:
-            print(f"   ✅ {file.name}")
-        print(f"   ✅ index.js (com 9 helper functions)")
+            marker = "♻️ " if file in rebuilt_files else "⏭️ "
+            print(f"   {marker} {file.name}")
+        print(f"   {'♻️ ' if index_changed else '⏭️ '} index.js (com {index_helpers} helper functions)")
+        for file in removed_files:
+            print(f"   🗑️  {self.relative(file)}")
         print()
         print(f"💡 Uso no backend Node.js:")
         print(f"   import {{ skills_by_area, text_improvement }} from './src/data/index.js';")
@@ -504,10 +1267,41 @@ export const calculateATSScore = (text, area = 'technology') => {{
         
         return True
 
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Exporta os datasets para módulos do backend")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reexporta todos os datasets, ignorando o manifest de hashes"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=EXPORT_MODES,
+        default="pretty",
+        help="Formato dos dados nos módulos: pretty (default), minified ou json-parse (arranque mais rápido)"
+    )
+    parser.add_argument(
+        "--compress",
+        nargs="+",
+        choices=sorted(COMPRESSIONS),
+        default=[],
+        help="Gera também módulos pré-comprimidos (.js.gz e/ou .js.br)"
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Divide skills/keywords ATS por área e templates por role em chunks carregados no 1º acesso"
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
 def main():
     """Função principal"""
-    exporter = BackendExporter()
-    success = exporter.export_all()
+    args = parse_args()
+    exporter = BackendExporter(force=args.force, mode=args.mode, compress=tuple(args.compress),
+                               chunked=args.chunked, metrics=Metrics("export", trace_memory=args.tracemalloc))
+    success = run_with_metrics(exporter.metrics, exporter.export_all, args)
     
     if not success:
         print("\n⚠️  Exportação falhou. Verifique os erros acima.")
@@ -4,18 +4,59 @@ Gera datasets completos para melhoria de CVs com IA
 
 Uso:
     python scripts/generate_datasets.py
+    python scripts/generate_datasets.py --parametric 100000 --workers 4
+    python scripts/generate_datasets.py --parametric 1000000 --format jsonl --compress
+    python scripts/generate_datasets.py --metrics-out metrics/generate.json   # tempos por etapa (ver metrics.py)
 """
 
+import os
 import json
+import time
+import argparse
+import shutil
+import tempfile
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List
+
+from skills_columnar import write_columnar
+from parametric_generator import build_vocabulary, iter_parametric_examples
+from dataset_io import ATS_KEYWORDS_DIR, DATASETS_DIR, ShardedJSONLWriter, remove_dataset
+from metrics import Metrics, add_metrics_arguments, run_with_metrics
+
+SECTIONS = ['experience', 'summary', 'education', 'skills']
 
 class CVDatasetGenerator:
-    def __init__(self):
-        self.output_dir = Path("datasets/processed")
+    def __init__(self, output_dir: Path = None, parametric: int = 0, workers: int = 1, seed: int = 42,
+                 output_format: str = "json", shard_size: int = 50000, compress: bool = False,
+                 metrics: Metrics = None, ats_dir: Path = None):
+        """
+        Args:
+            output_dir: pasta dos datasets processados
+            parametric: nº de exemplos de texto a gerar (0 = só os exemplos base)
+            workers: processos usados na geração paramétrica
+            seed: seed da geração paramétrica
+            output_format: 'json' (text_improvement.json) ou 'jsonl' (shards em text_improvement/)
+            shard_size: exemplos por shard no formato jsonl
+            compress: gzip nos shards jsonl
+            metrics: registo de tempos/memória por etapa (ver metrics.py)
+            ats_dir: keywords ATS por indústria (vocabulário da geração paramétrica)
+        """
+        self.output_dir = Path(output_dir or DATASETS_DIR)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.parametric = parametric
+        self.workers = workers
+        self.seed = seed
+        self.output_format = output_format
+        self.shard_size = shard_size
+        self.compress = compress
+        self.metrics = metrics or Metrics("generate")
+        self.ats_dir = Path(ats_dir or ATS_KEYWORDS_DIR)
+        
+        # Datasets gerados em memória ({nome do arquivo: documento}), iguais ao que foi escrito;
+        # o run_pipeline passa-os à validação e ao export sem os reler do disco
+        self.datasets = {}
         
     def generate_text_improvement_dataset(self) -> List[Dict]:
         """Gera dataset para melhoria de texto"""
@@ -218,74 +259,199 @@ class CVDatasetGenerator:
         
         return keywords
     
+    def iter_text_examples(self, generation: dict, skills_data: Dict) -> Iterable[Dict]:
+        """Exemplos de texto do modo configurado; preenche `generation` com a origem"""
+        if not self.parametric:
+            generation["mode"] = "base"
+            return self.generate_text_improvement_dataset()
+        
+        print(f"🧬 Gerando {self.parametric:,} exemplos paramétricos ({self.workers} workers)...")
+        vocabulary = build_vocabulary(skills_data, self.ats_dir)
+        if not vocabulary:
+            raise ValueError("No vocabulary for parametric generation (missing ats_keywords/skills datasets)")
+        
+        # Estatísticas (generated/duplicates/accepted) preenchidas durante a iteração
+        generation.update({"mode": "parametric", "seed": self.seed, "industries": sorted(vocabulary)})
+        return iter_parametric_examples(vocabulary, self.parametric, self.workers, self.seed, stats=generation)
+    
+    def save_text_improvement(self, skills_data: Dict) -> int:
+        """Gera e escreve text_improvement numa só passagem (JSON único ou shards JSONL); devolve o nº de exemplos"""
+        generation = {}
+        examples = self.iter_text_examples(generation, skills_data)
+        counts = {section: 0 for section in SECTIONS}
+        breakdown = {}
+        start = time.perf_counter()
+        
+        def track(example: Dict) -> str:
+            section = example["section"]
+            counts[section] = counts.get(section, 0) + 1
+            if "industry" in example:
+                key = f"{example['industry']}/{example.get('seniority', 'n/a')}"
+                breakdown[key] = breakdown.get(key, 0) + 1
+            return section
+        
+        written_metadata = {}
+        
+        def metadata() -> Dict:
+            if not written_metadata:
+                written_metadata.update({
+                    "version": "1.0.0",
+                    "created_at": datetime.now().isoformat(),
+                    "total_examples": sum(counts.values()),
+                    "description": "Dataset processado para melhoria de texto em CVs",
+                    "generation": {**generation, "by_industry_seniority": breakdown}
+                })
+            return written_metadata
+        
+        if self.output_format == "jsonl":
+            writer = ShardedJSONLWriter(self.output_dir / "text_improvement", self.shard_size, self.compress, SECTIONS)
+            for example in examples:
+                writer.write(track(example), example)
+            writer.close(metadata())
+            remove_dataset(self.output_dir, "text_improvement.json", keep="jsonl")
+            output_name = f"text_improvement/ ({sum(len(shards) for shards in writer.shards.values())} shards)"
+        else:
+            self.write_text_improvement_json(examples, track, metadata)
+            remove_dataset(self.output_dir, "text_improvement.json", keep="json")
+            output_name = "text_improvement.json"
+            
+            # Exemplos base (lista pequena): o documento fica também em memória
+            if isinstance(examples, list):
+                by_section = {section: [] for section in SECTIONS}
+                for example in examples:
+                    by_section.setdefault(example["section"], []).append(example)
+                self.datasets["text_improvement.json"] = {"metadata": metadata(), "by_section": by_section}
+        
+        total = sum(counts.values())
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed > 0 else 0
+        print(f"✅ {output_name}: {total:,} exemplos ({rate:,.0f} exemplos/s)")
+        if self.parametric:
+            print(f"   {generation['duplicates']:,} duplicados descartados")
+            if total < self.parametric:
+                print(f"⚠️  Combinações esgotadas: {total:,} de {self.parametric:,} exemplos únicos")
+        return total
+    
+    def write_text_improvement_json(self, examples: Iterable[Dict], track: Callable, metadata: Callable):
+        """Escreve text_improvement.json agrupando por secção numa passagem, sem lista em memória"""
+        # Um arquivo temporário por secção; o JSON final é montado no fim
+        with tempfile.TemporaryDirectory(dir=self.output_dir) as temp_dir:
+            parts = {}
+            try:
+                for example in examples:
+                    section = track(example)
+                    part = parts.get(section)
+                    if part is None:
+                        part = parts[section] = open(Path(temp_dir) / f"{section}.part", "w", encoding="utf-8")
+                    else:
+                        part.write(",\n")
+                    part.write("      " + json.dumps(example, ensure_ascii=False))
+            finally:
+                for part in parts.values():
+                    part.close()
+            
+            sections = SECTIONS + [section for section in parts if section not in SECTIONS]
+            with open(self.output_dir / "text_improvement.json", "w", encoding="utf-8") as f:
+                f.write('{\n  "metadata": ')
+                f.write(json.dumps(metadata(), ensure_ascii=False, indent=2).replace("\n", "\n  "))
+                f.write(',\n  "by_section": {\n')
+                for position, section in enumerate(sections):
+                    f.write(f'    "{section}": [\n')
+                    if section in parts:
+                        with open(Path(temp_dir) / f"{section}.part", "r", encoding="utf-8") as part:
+                            shutil.copyfileobj(part, f, 1 << 20)
+                    f.write("\n    ]" + ("," if position < len(sections) - 1 else "") + "\n")
+                f.write("  }\n}\n")
+    
     def save_all_datasets(self):
         """Salva todos os datasets"""
         print("\n🚀 Iniciando geração de datasets...")
         print("="*60)
         
-        # 1. Text Improvement
-        text_data = self.generate_text_improvement_dataset()
-        
-        # Organizar por secção
-        organized_data = {
-            "metadata": {
-                "version": "1.0.0",
-                "created_at": datetime.now().isoformat(),
-                "total_examples": len(text_data),
-                "description": "Dataset processado para melhoria de texto em CVs"
-            },
-            "by_section": {
-                "experience": [item for item in text_data if item["section"] == "experience"],
-                "summary": [item for item in text_data if item["section"] == "summary"],
-                "education": [item for item in text_data if item["section"] == "education"],
-                "skills": [item for item in text_data if item["section"] == "skills"]
-            }
-        }
-        
-        with open(self.output_dir / "text_improvement.json", "w", encoding="utf-8") as f:
-            json.dump(organized_data, f, ensure_ascii=False, indent=2)
-        print(f"✅ text_improvement.json: {len(text_data)} exemplos")
-        
-        # 2. Skills Database
+        # Skills geradas primeiro: são também o vocabulário da geração paramétrica
         skills_data = self.generate_skills_database()
-        skills_with_metadata = {
-            "metadata": {
-                "version": "1.0.0",
-                "created_at": datetime.now().isoformat(),
-                "description": "Base de dados de skills por área profissional"
-            },
-            **skills_data
-        }
         
-        with open(self.output_dir / "skills_by_area.json", "w", encoding="utf-8") as f:
-            json.dump(skills_with_metadata, f, ensure_ascii=False, indent=2)
+        # 1. Text Improvement
+        with self.metrics.stage("text_improvement") as stage:
+            stage.items = self.save_text_improvement(skills_data)
         
-        total_skills = sum(
-            len(v) if isinstance(v, list) else sum(len(vv) for vv in v.values() if isinstance(vv, list))
-            for k, v in skills_data.items()
-        )
-        print(f"✅ skills_by_area.json: {total_skills} skills")
+        # 2. Skills Database
+        with self.metrics.stage("skills_by_area") as stage:
+            skills_with_metadata = {
+                "metadata": {
+                    "version": "1.0.0",
+                    "created_at": datetime.now().isoformat(),
+                    "description": "Base de dados de skills por área profissional"
+                },
+                **skills_data
+            }
+            
+            with open(self.output_dir / "skills_by_area.json", "w", encoding="utf-8") as f:
+                json.dump(skills_with_metadata, f, ensure_ascii=False, indent=2)
+            self.datasets["skills_by_area.json"] = skills_with_metadata
+            
+            total_skills = sum(
+                len(v) if isinstance(v, list) else sum(len(vv) for vv in v.values() if isinstance(vv, list))
+                for k, v in skills_data.items()
+            )
+            stage.items = total_skills
+            stage.bytes = (self.output_dir / "skills_by_area.json").stat().st_size
+            print(f"✅ skills_by_area.json: {total_skills} skills")
+            
+            # Versão colunar (NumPy, memory-mappable) partilhável entre processos
+            with self.metrics.stage("columnar", items=total_skills):
+                columnar_dir = write_columnar(skills_with_metadata, self.output_dir / "columnar" / "skills", source="skills_by_area.json")
+            print(f"✅ {columnar_dir.relative_to(self.output_dir)}/: formato colunar")
         
         # 3. ATS Keywords
-        ats_data = self.generate_ats_keywords()
-        ats_with_metadata = {
-            "metadata": {
-                "version": "1.0.0",
-                "created_at": datetime.now().isoformat(),
-                "description": "Keywords ATS otimizadas por área"
-            },
-            **ats_data
-        }
-        
-        with open(self.output_dir / "ats_keywords.json", "w", encoding="utf-8") as f:
-            json.dump(ats_with_metadata, f, ensure_ascii=False, indent=2)
-        print(f"✅ ats_keywords.json: {len(ats_data)} categorias")
+        with self.metrics.stage("ats_keywords") as stage:
+            ats_data = self.generate_ats_keywords()
+            ats_with_metadata = {
+                "metadata": {
+                    "version": "1.0.0",
+                    "created_at": datetime.now().isoformat(),
+                    "description": "Keywords ATS otimizadas por área"
+                },
+                **ats_data
+            }
+            
+            with open(self.output_dir / "ats_keywords.json", "w", encoding="utf-8") as f:
+                json.dump(ats_with_metadata, f, ensure_ascii=False, indent=2)
+            self.datasets["ats_keywords.json"] = ats_with_metadata
+            stage.items = len(ats_data)
+            stage.bytes = (self.output_dir / "ats_keywords.json").stat().st_size
+            print(f"✅ ats_keywords.json: {len(ats_data)} categorias")
         
         print("\n" + "="*60)
         print("✨ Datasets gerados com sucesso!")
         print(f"📁 Localização: {self.output_dir.absolute()}")
         print("\n💡 Próximo passo: python scripts/export_to_backend.py")
 
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Gera os datasets processados")
+    parser.add_argument("--parametric", type=int, default=0,
+                        help="Gera N exemplos de texto combinando roles, verbos, ferramentas e métricas")
+    parser.add_argument("--workers", type=int, default=1, help="Processos na geração paramétrica (0 = todos os cores)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed da geração paramétrica")
+    parser.add_argument("--output-dir", type=Path, default=DATASETS_DIR, help="Pasta de saída")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                        help="text_improvement como JSON único ou shards JSONL por secção (default: json)")
+    parser.add_argument("--shard-size", type=int, default=50000, help="Exemplos por shard JSONL (default: 50000)")
+    parser.add_argument("--compress", action="store_true", help="Comprimir os shards JSONL com gzip")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    generator = CVDatasetGenerator()
-    generator.save_all_datasets()
\ No newline at end of file
+    args = parse_args()
+    generator = CVDatasetGenerator(
+        args.output_dir,
+        parametric=args.parametric,
+        workers=args.workers or os.cpu_count() or 1,
+        seed=args.seed,
+        output_format=args.format,
+        shard_size=args.shard_size,
+        compress=args.compress,
+        metrics=Metrics("generate", trace_memory=args.tracemalloc)
+    )
+    run_with_metrics(generator.metrics, generator.save_all_datasets, args)
\ No newline at end of file
@@ -0,0 +1,471 @@
+"""
+🛰️ CV Builder - Local Inference Server
+Serviço HTTP local (CPU, offline) para ATS score, quality score e sugestões
+
+Carrega uma vez as keywords ATS e o modelo treinado (train_model.py) e
+agrupa pedidos concorrentes em micro-batches: cada batch faz uma passagem
+do autómato de keywords / uma chamada ao modelo para todos os textos.
+Um batch é processado quando atinge --max-batch-size ou quando o pedido
+mais antigo já esperou --max-wait-ms.
+
+Endpoints (JSON):
+    POST /ats-score     {"text": "...", "area": "technology"}          ou {"items": [...]}
+    POST /quality-score {"original": "...", "improved": "...", "keywords": [...]} ou {"items": [...]}
+    POST /suggestions   {"original": "...", "improved": "..."}         ou {"items": [...]}
+    GET  /health
+    GET  /metrics       histogramas de latência por endpoint e tamanho dos batches
+
+As respostas de /ats-score e /suggestions têm o mesmo formato que
+calculateATSScore e validateImprovement do backend.
+
+Uso:
+    python scripts/inference_server.py
+    python scripts/inference_server.py --port 8008 --max-batch-size 64 --max-wait-ms 5
+"""
+
+import re
+import json
+import time
+import queue
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from ats_scorer import ATSScorer
+from dataset_io import ATS_KEYWORDS_DIR, DATASETS_DIR, MODELS_DIR
+from keyword_matcher import KeywordMatcher
+from train_model import ScoreModel
+
+# Mesmos verbos e padrões do validateImprovement exportado para o backend
+IMPROVEMENT_ACTION_VERBS = [
+    'desenvolvi', 'implementei', 'geri', 'liderei', 'otimizei',
+    'aumentei', 'reduzi', 'arquitetei', 'coordenei', 'executei',
+    'criei', 'construí', 'lancei', 'melhorei', 'automatizei'
+]
+IMPROVEMENT_VERB_MATCHER = KeywordMatcher(IMPROVEMENT_ACTION_VERBS)
+QUANTIFICATION_PATTERN = re.compile(
+    r'\d+[%€$KM]|\d+\+|\d+/\d+|\d+ (anos|meses|pessoas|projetos|utilizadores)', re.IGNORECASE | re.ASCII
+)
+ACRONYM_PATTERN = re.compile(r'[A-Z]{2,}')
+TECHNICAL_TERMS_PATTERN = re.compile(r'(React|Node|Python|JavaScript|AWS|Docker|SQL|API|Git)', re.IGNORECASE)
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+def validate_improvement(original: str, improved: str) -> dict:
+    """Port do validateImprovement do backend: critérios, score (0-100) e sugestões"""
+    analysis = {
+        'hasActionVerb': False,
+        'hasQuantification': False,
+        'hasSpecificity': False,
+        'lengthAppropriate': False,
+        'hasKeywords': False,
+        'score': 0,
+        'suggestions': []
+    }
+
+    analysis['hasActionVerb'] = IMPROVEMENT_VERB_MATCHER.contains_any(improved)
+    if not analysis['hasActionVerb']:
+        analysis['suggestions'].append('Adicione um verbo de ação forte no início')
+
+    analysis['hasQuantification'] = QUANTIFICATION_PATTERN.search(improved) is not None
+    if not analysis['hasQuantification']:
+        analysis['suggestions'].append('Adicione métricas quantificáveis (%, números, valores)')
+
+    analysis['hasSpecificity'] = len(improved) > len(original) * 1.5
+    if not analysis['hasSpecificity']:
+        analysis['suggestions'].append('Adicione mais detalhes específicos sobre tecnologias ou resultados')
+
+    word_count = len(re.split(r'\s+', improved))
+    analysis['lengthAppropriate'] = 10 <= word_count <= 50
+    if not analysis['lengthAppropriate']:
+        if word_count < 10:
+            analysis['suggestions'].append('Texto muito curto - adicione mais detalhes')
+        else:
+            analysis['suggestions'].append('Texto muito longo - seja mais conciso')
+
+    analysis['hasKeywords'] = bool(ACRONYM_PATTERN.search(improved) or TECHNICAL_TERMS_PATTERN.search(improved))
+    if not analysis['hasKeywords']:
+        analysis['suggestions'].append('Mencione tecnologias ou ferramentas específicas')
+
+    criteria = ['hasActionVerb', 'hasQuantification', 'hasSpecificity', 'lengthAppropriate', 'hasKeywords']
+    analysis['score'] = sum(analysis[criterion] for criterion in criteria) * 20
+
+    if analysis['score'] >= 80:
+        analysis['quality'] = 'excellent'
+    elif analysis['score'] >= 60:
+        analysis['quality'] = 'good'
+    elif analysis['score'] >= 40:
+        analysis['quality'] = 'fair'
+    else:
+        analysis['quality'] = 'poor'
+
+    return analysis
+
+# ========== MÉTRICAS ==========
+
+class Histogram:
+    """Histograma cumulativo thread-safe (estilo Prometheus) com percentis aproximados"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        position = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                position = i
+                break
+        with self._lock:
+            self.counts[position] += 1
+            self.count += 1
+            self.total += value
+
+    def _percentile(self, counts: List[int], count: int, q: float) -> Optional[float]:
+        if not count:
+            return None
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= q * count:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.total
+
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets + ['+Inf'], counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else None,
+            'p50': self._percentile(counts, count, 0.5),
+            'p95': self._percentile(counts, count, 0.95),
+            'p99': self._percentile(counts, count, 0.99),
+            'buckets': buckets
+        }
+
+# ========== MICRO-BATCHING ==========
+
+class MicroBatcher:
+    """Junta itens submetidos por várias threads e processa-os em lotes numa thread dedicada"""
+
+    def __init__(self, process_batch: Callable[[List], List], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        """Agenda um item; o resultado chega pelo Future"""
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self) -> Optional[list]:
+        """Espera pelo primeiro item e junta os seguintes até encher o lote ou passar max_wait"""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Processar o lote atual antes de parar
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            started = time.perf_counter()
+            for _, _, submitted in batch:
+                self.queue_wait_ms.observe((started - submitted) * 1000)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                results = self.process_batch([item for item, _, _ in batch])
+            except Exception as e:  # O erro chega a todos os pedidos do lote
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+# ========== SERVIÇO ==========
+
+class InferenceService:
+    """Lógica dos endpoints, independente do transporte HTTP"""
+
+    def __init__(self, scorer: ATSScorer, model: Optional[ScoreModel] = None, default_area: str = 'technology',
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0, timeout: float = 30.0):
+        self.scorer = scorer
+        self.model = model
+        self.default_area = default_area
+        self.timeout = timeout
+        self.batchers = {
+            'ats': MicroBatcher(self._score_ats_batch, max_batch_size, max_wait_ms),
+            'quality': MicroBatcher(self._score_quality_batch, max_batch_size, max_wait_ms)
+        }
+        self.latency_ms: Dict[str, Histogram] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.routes = {
+            '/ats-score': self.ats_score,
+            '/quality-score': self.quality_score,
+            '/suggestions': self.suggestions
+        }
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+
+    # ----- batches -----
+
+    def _score_ats_batch(self, items: List[tuple]) -> List[dict]:
+        return self.scorer.score_texts([text for text, _ in items], [area for _, area in items])
+
+    def _score_quality_batch(self, examples: List[dict]) -> List[dict]:
+        predictions = self.model.predict(examples)
+        return [
+            {target: round(float(values[row]), 2) for target, values in predictions.items()}
+            for row in range(len(examples))
+        ]
+
+    # ----- endpoints -----
+
+    @staticmethod
+    def _items(payload: dict) -> tuple:
+        """Pedido simples ({...}) ou em lote ({"items": [...]}): (itens, é_lote)"""
+        if isinstance(payload.get('items'), list):
+            return payload['items'], True
+        return [payload], False
+
+    @staticmethod
+    def _text(item: dict, field: str, required: bool = True) -> str:
+        value = item.get(field) if isinstance(item, dict) else None
+        if value is None and not required:
+            return ''
+        if not isinstance(value, str):
+            raise ValueError(f"'{field}' must be a string")
+        return value
+
+    def _wait(self, futures: List[Future]) -> list:
+        return [future.result(timeout=self.timeout) for future in futures]
+
+    def ats_score(self, payload: dict):
+        items, is_batch = self._items(payload)
+        default_area = payload.get('area', self.default_area)
+        requests = [(self._text(item, 'text'), item.get('area', default_area)) for item in items]
+        results = self._wait([self.batchers['ats'].submit(request) for request in requests])
+        return {'results': results} if is_batch else results[0]
+
+    def quality_score(self, payload: dict):
+        items, is_batch = self._items(payload)
+        examples = []
+        for item in items:
+            keywords = item.get('keywords', [])
+            examples.append({
+                'original': self._text(item, 'original', required=False),
+                'improved': self._text(item, 'improved'),
+                'keywords': keywords if isinstance(keywords, list) else []
+            })
+
+        predictions = [None] * len(examples)
+        if self.model is not None:
+            predictions = self._wait([self.batchers['quality'].submit(example) for example in examples])
+
+        results = []
+        for example, prediction in zip(examples, predictions):
+            heuristic = validate_improvement(example['original'], example['improved'])
+            results.append({
+                'quality_score': prediction['quality_score'] if prediction else None,
+                'predicted_ats_score': prediction['ats_score'] if prediction else None,
+                'heuristic_score': heuristic['score'],
+                'quality': heuristic['quality'],
+                'model': prediction is not None
+            })
+        return {'results': results} if is_batch else results[0]
+
+    def suggestions(self, payload: dict):
+        items, is_batch = self._items(payload)
+        results = [
+            validate_improvement(self._text(item, 'original', required=False), self._text(item, 'improved'))
+            for item in items
+        ]
+        return {'results': results} if is_batch else results[0]
+
+    def observe(self, path: str, elapsed_ms: float, failed: bool = False):
+        with self._lock:
+            histogram = self.latency_ms.setdefault(path, Histogram(LATENCY_BUCKETS_MS))
+            if failed:
+                self.errors[path] = self.errors.get(path, 0) + 1
+        histogram.observe(elapsed_ms)
+
+    def health(self) -> dict:
+        return {
+            'status': 'ok',
+            'model_loaded': self.model is not None,
+            'industries': self.scorer.industries,
+            'uptime_s': round(time.time() - self.started_at, 1)
+        }
+
+    def metrics(self) -> dict:
+        return {
+            'latency_ms': {path: histogram.snapshot() for path, histogram in self.latency_ms.items()},
+            'errors': dict(self.errors),
+            'batches': {
+                name: {
+                    'batch_size': batcher.batch_sizes.snapshot(),
+                    'queue_wait_ms': batcher.queue_wait_ms.snapshot()
+                }
+                for name, batcher in self.batchers.items()
+            }
+        }
+
+def make_handler(service: InferenceService, verbose: bool = False):
+    """Classe de handler HTTP ligada a um InferenceService"""
+
+    class InferenceHandler(BaseHTTPRequestHandler):
+        server_version = "CVBuilderInference/1.0"
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, service.health())
+            elif self.path == '/metrics':
+                self._send(200, service.metrics())
+            else:
+                self._send(404, {'error': f'Unknown endpoint: {self.path}'})
+
+        def do_POST(self):
+            start = time.perf_counter()
+            handler = service.routes.get(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+
+            if handler is None:
+                self._send(404, {'error': f'Unknown endpoint: {self.path}'})
+                return
+
+            status = 200
+            try:
+                payload = json.loads(body or b'{}')
+                if not isinstance(payload, dict):
+                    raise ValueError('request body must be a JSON object')
+                response = handler(payload)
+            except (ValueError, TypeError, AttributeError) as e:
+                status, response = 400, {'error': str(e)}
+            except Exception as e:
+                status, response = 500, {'error': f'{type(e).__name__}: {e}'}
+
+            self._send(status, response)
+            service.observe(self.path, (time.perf_counter() - start) * 1000, failed=status != 200)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return InferenceHandler
+
+def load_scorer(datasets_dir: Path, ats_dir: Path) -> ATSScorer:
+    """Keywords no formato do backend (ats_keywords.json) ou, na falta, as listas por indústria"""
+    processed = Path(datasets_dir) / "ats_keywords.json"
+    if processed.exists():
+        return ATSScorer.from_processed(processed)
+    return ATSScorer.from_industry_files(ats_dir)
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor local de inferência (ATS, quality, sugestões)")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8008, help="Porta (default: 8008)")
+    parser.add_argument("--model", type=Path, default=MODELS_DIR / "score_model.joblib", help="Modelo do train_model.py")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Pasta dos datasets processados")
+    parser.add_argument("--ats-dir", type=Path, default=ATS_KEYWORDS_DIR, help="Keywords ATS por indústria")
+    parser.add_argument("--default-area", default="technology", help="Área quando o pedido não indica uma")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Máximo de itens por batch (default: 64)")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Espera máxima para encher um batch (default: 5)")
+    parser.add_argument("--verbose", action="store_true", help="Log de cada pedido")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    print("\n" + "="*70)
+    print("🛰️  CV Builder - Inference Server")
+    print("="*70)
+    print()
+
+    scorer = load_scorer(args.datasets_dir, args.ats_dir)
+    print(f"🔑 {len(scorer.terms)} keywords ATS em {len(scorer.industries)} áreas: {', '.join(scorer.industries)}")
+
+    model = None
+    if args.model.exists():
+        model = ScoreModel.load(args.model)
+        print(f"🧠 Modelo: {args.model} (treinado em {model.metadata.get('trained_at', '?')})")
+    else:
+        print(f"⚠️  Modelo {args.model} não encontrado: /quality-score usa só a heurística")
+        print("💡 Treine com: python scripts/train_model.py")
+
+    service = InferenceService(scorer, model, args.default_area, args.max_batch_size, args.max_wait_ms)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, args.verbose))
+    server.daemon_threads = True
+
+    print(f"⚙️  Batches: até {args.max_batch_size} itens, espera máx. {args.max_wait_ms} ms")
+    print(f"🚀 A servir em http://{args.host}:{args.port} (Ctrl+C para parar)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 A parar...")
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
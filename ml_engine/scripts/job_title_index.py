@@ -0,0 +1,313 @@
+"""
+🧑‍💼 CV Builder - Job Title Index
+Resolve títulos de cargo em texto livre para áreas/categorias de skills
+
+Fontes dos títulos:
+- job_titles das skills de skills_by_area (cada título aponta para as
+  categorias onde aparece, pesadas pelo nº de skills)
+- roles de summary_templates.json (software_engineer -> "software engineer")
+- SYNONYMS: variantes PT/EN e abreviaturas apontando para um título canónico
+- CURATED_TITLES: títulos com destino fixo (o antigo jobToArea do index.js)
+- FALLBACK_TITLES: destino dos títulos canónicos dos SYNONYMS quando as
+  skills não têm job_titles (ex: dados do generate_datasets.py/raw_etl.py);
+  o build falha se algum sinónimo ficar sem destino
+
+Os títulos são normalizados (minúsculas, sem acentos, sem palavras de
+senioridade) e representados por conjuntos de trigramas de caracteres. O
+export inclui um lookup exato e um índice invertido trigrama -> chaves, por
+isso o resolveJobTitle do backend responde em microssegundos sem regras fixas.
+
+Uso:
+    python scripts/job_title_index.py --title "Programador Front-End Sénior" --title "Cientista de Dados"
+"""
+
+import re
+import json
+import math
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dataset_io import DATASETS_DIR
+from example_index import normalize as fold_text
+from skills_table import iter_skill_records
+
+MIN_SIMILARITY = 0.6
+MAX_TARGETS = 3
+MIN_TARGET_SHARE = 0.25   # categorias com menos de 25% do peso da principal são ignoradas
+
+# Palavras de senioridade não mudam a área do cargo
+SENIORITY_WORDS = {
+    'junior', 'jr', 'senior', 'sr', 'pleno', 'mid', 'level', 'trainee',
+    'estagiario', 'intern', 'principal', 'staff'
+}
+
+# Destinos fixos (área.categoria) para títulos já suportados pelo backend
+CURATED_TITLES = {
+    'Frontend Developer': ['technology.frontend'],
+    'Backend Developer': ['technology.backend'],
+    'Full Stack Developer': ['technology.frontend', 'technology.backend'],
+    'DevOps Engineer': ['technology.devops'],
+    'Data Analyst': ['technology.data_science'],
+    'Digital Marketer': ['marketing.digital_marketing'],
+}
+
+# Destinos dos títulos canónicos dos SYNONYMS, usados só se as skills não os derem
+FALLBACK_TITLES = {
+    'SRE': ['technology.devops'],
+    'Cloud Engineer': ['technology.devops'],
+    'Infrastructure Engineer': ['technology.devops'],
+    'Data Scientist': ['technology.data_science'],
+    'Data Engineer': ['technology.data_science', 'technology.database'],
+    'ML Engineer': ['technology.data_science'],
+    'Database Administrator': ['technology.database'],
+    'Mobile Developer': ['technology.mobile'],
+    'Digital Marketing Manager': ['marketing.digital_marketing'],
+    'Digital Marketing Specialist': ['marketing.digital_marketing'],
+    'Social Media Manager': ['marketing.digital_marketing'],
+    'SEO Specialist': ['marketing.digital_marketing'],
+}
+
+# Variante -> título canónico (de CURATED_TITLES ou FALLBACK_TITLES, ver check_synonyms)
+SYNONYMS = {
+    'Front-End Developer': 'Frontend Developer',
+    'Desenvolvedor Frontend': 'Frontend Developer',
+    'Programador Frontend': 'Frontend Developer',
+    'Web Developer': 'Full Stack Developer',
+    'Desenvolvedor Web': 'Full Stack Developer',
+    'Programador Web': 'Full Stack Developer',
+    'Software Engineer': 'Full Stack Developer',
+    'Software Developer': 'Full Stack Developer',
+    'Engenheiro de Software': 'Full Stack Developer',
+    'Desenvolvedor de Software': 'Full Stack Developer',
+    'Programador': 'Full Stack Developer',
+    'Desenvolvedor Full Stack': 'Full Stack Developer',
+    'Back-End Developer': 'Backend Developer',
+    'Desenvolvedor Backend': 'Backend Developer',
+    'Programador Backend': 'Backend Developer',
+    'Engenheiro DevOps': 'DevOps Engineer',
+    'Site Reliability Engineer': 'SRE',
+    'Engenheiro Cloud': 'Cloud Engineer',
+    'Administrador de Sistemas': 'Infrastructure Engineer',
+    'Analista de Dados': 'Data Analyst',
+    'Cientista de Dados': 'Data Scientist',
+    'Engenheiro de Dados': 'Data Engineer',
+    'Machine Learning Engineer': 'ML Engineer',
+    'Engenheiro de Machine Learning': 'ML Engineer',
+    'Administrador de Base de Dados': 'Database Administrator',
+    'DBA': 'Database Administrator',
+    'Desenvolvedor Mobile': 'Mobile Developer',
+    'Programador Mobile': 'Mobile Developer',
+    'iOS Developer': 'Mobile Developer',
+    'UX UI Designer': 'Frontend Developer',
+    'Designer UX/UI': 'Frontend Developer',
+    'Product Designer': 'Frontend Developer',
+    'Marketeer': 'Digital Marketer',
+    'Gestor de Marketing Digital': 'Digital Marketing Manager',
+    'Especialista em Marketing Digital': 'Digital Marketing Specialist',
+    'Gestor de Redes Sociais': 'Social Media Manager',
+    'Especialista SEO': 'SEO Specialist',
+}
+
+def fixed_targets(paths: List[str]) -> List[Tuple[str, float]]:
+    """Destinos fixos com o mesmo peso"""
+    return [(path, round(1 / len(paths), 4)) for path in paths]
+
+def check_synonyms():
+    """Cada sinónimo tem de apontar para um título com destino fixo (senão seria descartado)"""
+    known = {normalize_title(title) for title in {**CURATED_TITLES, **FALLBACK_TITLES}}
+    missing = sorted({canonical for canonical in SYNONYMS.values() if normalize_title(canonical) not in known})
+    if missing:
+        raise ValueError(f"❌ Sinónimos sem destino: {', '.join(missing)} (acrescentar a FALLBACK_TITLES)")
+
+def normalize_title(title: str) -> str:
+    """Minúsculas, sem acentos/pontuação nem palavras de senioridade (igual ao JS)"""
+    words = re.sub(r'[^a-z0-9+#.]+', ' ', fold_text(title)).split()
+    return ' '.join(word for word in words if word not in SENIORITY_WORDS)
+
+def trigrams(key: str) -> List[str]:
+    """Trigramas de caracteres distintos (com espaço nas pontas), por ordem de aparição"""
+    padded = f" {key} "
+    seen = {}
+    for start in range(len(padded) - 2):
+        seen.setdefault(padded[start:start + 3], None)
+    return list(seen)
+
+def title_targets(skills_data: dict) -> Dict[str, Dict[str, int]]:
+    """Título (como escrito nas skills) -> {área.categoria: nº de skills}"""
+    targets: Dict[str, Dict[str, int]] = {}
+    for area, category, skill in iter_skill_records(skills_data):
+        titles = skill.get('job_titles')
+        for title in titles if isinstance(titles, list) else []:
+            if isinstance(title, str) and title.strip():
+                counts = targets.setdefault(title.strip(), {})
+                path = f"{area}.{category}"
+                counts[path] = counts.get(path, 0) + 1
+    return targets
+
+def select_targets(counts: Dict[str, int]) -> List[Tuple[str, float]]:
+    """Categorias principais de um título com pesos normalizados (soma 1)"""
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    if not ranked:
+        return []
+    top = ranked[0][1]
+    kept = [(path, count) for path, count in ranked if count >= top * MIN_TARGET_SHARE][:MAX_TARGETS]
+    total = sum(count for _, count in kept)
+    return [(path, round(count / total, 4)) for path, count in kept]
+
+class JobTitleIndex:
+    """Chaves normalizadas -> título canónico -> categorias, com pesquisa por trigramas"""
+
+    def __init__(self, titles: List[str], targets: List[List[Tuple[str, float]]],
+                 keys: List[str], key_titles: List[int]):
+        self.titles = titles
+        self.targets = targets
+        self.keys = keys
+        self.key_titles = key_titles
+        self.exact = {key: idx for idx, key in enumerate(keys)}
+        self.key_trigrams = [trigrams(key) for key in keys]
+        self.postings: Dict[str, List[int]] = {}
+        for idx, grams in enumerate(self.key_trigrams):
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(idx)
+
+    @classmethod
+    def build(cls, skills_data: dict, summary_data: Optional[dict] = None) -> "JobTitleIndex":
+        """Constrói o índice a partir de skills_by_area (+ roles de summary_templates)"""
+        check_synonyms()
+        counts = title_targets(skills_data)
+        titles: List[str] = []
+        targets: List[List[Tuple[str, float]]] = []
+        title_ids: Dict[str, int] = {}
+
+        def add_title(title: str, paths: List[Tuple[str, float]]):
+            key = normalize_title(title)
+            if key and paths and key not in title_ids:
+                title_ids[key] = len(titles)
+                titles.append(title)
+                targets.append(paths)
+
+        # Destinos fixos primeiro: ganham aos derivados para o mesmo título
+        for title, paths in CURATED_TITLES.items():
+            add_title(title, fixed_targets(paths))
+        for title in sorted(counts):
+            add_title(title, select_targets(counts[title]))
+        # Títulos dos sinónimos que as skills não cobrem
+        for title, paths in FALLBACK_TITLES.items():
+            add_title(title, fixed_targets(paths))
+
+        keys: List[str] = []
+        key_titles: List[int] = []
+        key_ids: Dict[str, int] = {}
+
+        def add_key(alias: str, canonical: str):
+            key = normalize_title(alias)
+            title_id = title_ids.get(normalize_title(canonical))
+            if key and title_id is not None and key not in key_ids:
+                key_ids[key] = len(keys)
+                keys.append(key)
+                key_titles.append(title_id)
+
+        for title_id in title_ids.values():
+            add_key(titles[title_id], titles[title_id])
+        for alias, canonical in SYNONYMS.items():
+            add_key(alias, canonical)
+
+        # Roles dos templates de sumário ("software_engineer") que tenham destino conhecido
+        synonyms = {normalize_title(alias): canonical for alias, canonical in SYNONYMS.items()}
+        roles = (summary_data or {}).get('templates_by_role', {})
+        for role in roles if isinstance(roles, dict) else []:
+            title = role.replace('_', ' ')
+            canonical = synonyms.get(normalize_title(title), title)
+            for candidate in (title, canonical):
+                if normalize_title(candidate) in title_ids:
+                    add_key(title, titles[title_ids[normalize_title(candidate)]])
+                    break
+
+        return cls(titles, targets, keys, key_titles)
+
+    def resolve(self, job_title: str) -> Optional[dict]:
+        """Melhor título para um texto livre: {title, similarity, targets} ou None"""
+        key = normalize_title(job_title or '')
+        if not key:
+            return None
+        if key in self.exact:
+            return self._result(self.exact[key], 1.0)
+
+        query = trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for idx in self.postings.get(gram, []):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        best, best_score = None, 0.0
+        for idx, count in shared.items():
+            # Cosseno entre conjuntos de trigramas; empates ficam com a primeira chave
+            score = count / math.sqrt(len(query) * len(self.key_trigrams[idx]))
+            if score > best_score or (score == best_score and best is not None and idx < best):
+                best, best_score = idx, score
+        if best is None or best_score < MIN_SIMILARITY:
+            return None
+        return self._result(best, best_score)
+
+    def _result(self, key_id: int, similarity: float) -> dict:
+        title_id = self.key_titles[key_id]
+        return {
+            'title': self.titles[title_id],
+            'similarity': similarity,
+            'targets': [
+                {'area': path.split('.', 1)[0], 'category': path.split('.', 1)[1], 'weight': weight}
+                for path, weight in self.targets[title_id]
+            ]
+        }
+
+    def to_export(self) -> dict:
+        """Módulo job_title_index.js: títulos, chaves e índice invertido de trigramas"""
+        return {
+            'version': '1.0.0',
+            'min_similarity': MIN_SIMILARITY,
+            'seniority_words': sorted(SENIORITY_WORDS),
+            'titles': self.titles,
+            'targets': [[[path, weight] for path, weight in targets] for targets in self.targets],
+            'keys': self.keys,
+            'key_titles': self.key_titles,
+            'trigrams': {gram: self.postings[gram] for gram in sorted(self.postings)}
+        }
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Resolve títulos de cargo para áreas/categorias de skills")
+    parser.add_argument("--title", action="append", required=True, help="Título do cargo (pode repetir)")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Pasta dos datasets")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    skills_path = args.datasets_dir / "skills_by_area.json"
+    if not skills_path.exists():
+        print(f"❌ {skills_path} não encontrado")
+        exit(1)
+    with open(skills_path, "r", encoding="utf-8") as f:
+        skills_data = json.load(f)
+
+    summary_data = None
+    summary_path = args.datasets_dir / "summary_templates.json"
+    if summary_path.exists():
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary_data = json.load(f)
+
+    index = JobTitleIndex.build(skills_data, summary_data)
+    print(f"🧑‍💼 {len(index.titles)} títulos, {len(index.keys)} chaves, {len(index.postings)} trigramas")
+
+    for title in args.title:
+        result = index.resolve(title)
+        if result is None:
+            print(f"\n❓ {title}: sem correspondência")
+            continue
+        paths = ', '.join(f"{t['area']}.{t['category']} ({t['weight']:.2f})" for t in result['targets'])
+        print(f"\n✅ {title} → {result['title']} ({result['similarity']:.2f}): {paths}")
+
+if __name__ == "__main__":
+    main()
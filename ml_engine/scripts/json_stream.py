@@ -0,0 +1,231 @@
+"""
+🌊 CV Builder - Streaming JSON Reader
+Leitura incremental de documentos JSON grandes com memória constante
+
+O documento é lido em blocos e só o valor atualmente pedido é descodificado.
+Objetos e arrays podem ser percorridos chave a chave / elemento a elemento,
+por isso um ficheiro de vários GB pode ser validado sem nunca estar
+inteiro em memória.
+
+Uso:
+    with open("datasets/processed/text_improvement.json", encoding="utf-8") as f:
+        reader = JSONStreamReader(f)
+        for key in reader.iter_object():
+            if key == "by_section":
+                for section in reader.iter_object():
+                    for example in reader.iter_items():
+                        ...
+            else:
+                reader.skip_value()
+
+    python scripts/json_stream.py   # autoverificação: blocos de 1..N caracteres vs json.load
+"""
+
+import io
+import sys
+import json
+from typing import Any, Iterator, TextIO
+
+WHITESPACE = ' \t\n\r'
+# Um valor cortado no fim do bloco falha no máximo a 8 caracteres do fim ("-Infinit", "\ud83d\u")
+TRUNCATION_MARGIN = 8
+# Caracteres que podem continuar um número no bloco seguinte ("-0." e "1e" descodificam só o prefixo)
+NUMBER_CHARS = '0123456789+-.eE'
+
+class JSONStreamReader:
+    """Cursor sobre um documento JSON lido em blocos.
+
+    Cada chave devolvida por `iter_object` e cada índice devolvido por
+    `iter_array` tem de ter o respetivo valor consumido (`read_value`,
+    `skip_value` ou uma nova iteração) antes de avançar.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    # ========== BUFFER ==========
+
+    def _fill(self) -> bool:
+        """Lê mais um bloco, descartando o que já foi consumido"""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """O erro pode ser só o fim do bloco (string por fechar ou falha junto ao fim do buffer)"""
+        return error.msg.startswith('Unterminated string') or len(self._buf) - error.pos <= TRUNCATION_MARGIN
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def _peek(self) -> str:
+        """Próximo carácter significativo ('' no fim do documento)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    # ========== API ==========
+
+    def peek_type(self) -> str:
+        """Tipo do próximo valor: object, array, string, number, bool, null"""
+        char = self._peek()
+        if char == '{':
+            return 'object'
+        if char == '[':
+            return 'array'
+        if char == '"':
+            return 'string'
+        if char in 'tf':
+            return 'bool'
+        if char == 'n':
+            return 'null'
+        if char == '':
+            raise self._error("Unexpected end of document")
+        return 'number'
+
+    def read_value(self) -> Any:
+        """Descodifica o próximo valor completo"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Só um valor cortado no fim do bloco justifica ler mais; um erro a meio do
+                # buffer é do documento (não ler o resto do arquivo para o repetir)
+                if self._truncated(e) and self._fill():
+                    continue
+                raise
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if not self._eof and self._buf[self._pos] not in '{["' and not self._buf[end:].lstrip(NUMBER_CHARS):
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Salta o próximo valor sem o materializar (memória constante)"""
+        kind = self.peek_type()
+        if kind == 'object':
+            for _ in self.iter_object():
+                self.skip_value()
+        elif kind == 'array':
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """Percorre as chaves do próximo objeto"""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self) -> Iterator[int]:
+        """Percorre os índices do próximo array"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        idx = 0
+        while True:
+            yield idx
+            idx += 1
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_items(self) -> Iterator[Any]:
+        """Descodifica um a um os elementos do próximo array"""
+        for _ in self.iter_array():
+            yield self.read_value()
+
+# ========== AUTOVERIFICAÇÃO ==========
+
+# Cortes de bloco dentro de strings, escapes (\u e pares surrogate), números e -Infinity/NaN
+SELF_CHECK_DOCUMENT = """{
+  "metadata": {"version": "1.0", "total": 3, "ratio": -0.125e-3},
+  "by_section": {
+    "experience": [
+      {"original": "Trabalhei com \\"React\\" \\\\ Node.js", "improved": "Desenvolvi \\u00e1pis \\ud83d\\ude80 em React",
+       "ats_score": 87, "keywords": ["React", "Node.js"]},
+      {"original": "", "improved": "Reduzi custos", "ats_score": 1234567890123, "keywords": []}
+    ],
+    "summary": [],
+    "scores": [0, -1, 3.5, 1E+21, 2e-7, -Infinity, Infinity, NaN, true, false, null, {}, [[]]]
+  },
+  "tail": -Infinity
+}"""
+
+def _read_streamed(reader: JSONStreamReader) -> Any:
+    """Reconstrói o próximo valor só com a API de streaming (chave a chave, elemento a elemento)"""
+    kind = reader.peek_type()
+    if kind == 'object':
+        return {key: _read_streamed(reader) for key in reader.iter_object()}
+    if kind == 'array':
+        return [_read_streamed(reader) for _ in reader.iter_array()]
+    return reader.read_value()
+
+def self_check(document: str = SELF_CHECK_DOCUMENT) -> int:
+    """Lê o documento com todos os tamanhos de bloco (1..len) e compara com json.load
+
+    Com todos os tamanhos, cada posição do documento é fronteira de bloco pelo
+    menos uma vez. Devolve o número de leituras diferentes do json.load.
+    """
+    # dumps compara NaN como texto (NaN != NaN)
+    expected = json.dumps(json.load(io.StringIO(document)))
+    failures = 0
+    for chunk_size in range(1, len(document) + 1):
+        for label, read in (('read_value', JSONStreamReader.read_value), ('iter_*', _read_streamed)):
+            reader = JSONStreamReader(io.StringIO(document), chunk_size=chunk_size)
+            try:
+                actual = json.dumps(read(reader))
+            except json.JSONDecodeError as e:
+                actual = f"{type(e).__name__}: {e}"
+            if actual != expected:
+                failures += 1
+                print(f"❌ chunk_size={chunk_size} ({label}): {actual[:120]}")
+    return failures
+
+if __name__ == "__main__":
+    failures = self_check()
+    if failures:
+        sys.exit(1)
+    print(f"✅ JSONStreamReader == json.load com blocos de 1 a {len(SELF_CHECK_DOCUMENT)} caracteres")
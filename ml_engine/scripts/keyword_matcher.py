@@ -0,0 +1,158 @@
+"""
+🔎 CV Builder - Keyword Matcher
+Pesquisa de muitas keywords num texto com um autómato Aho-Corasick
+
+O autómato é construído uma vez a partir de todas as keywords e encontra
+todas as ocorrências numa única passagem pelo texto, por isso o custo do
+matching não depende do tamanho das listas de keywords.
+
+Opções:
+- case_insensitive: ignora maiúsculas/minúsculas (default)
+- fold_accents: "gestão" == "gestao"
+- word_boundary: só conta keywords que não estão dentro de outra palavra
+
+As normalizações são feitas carácter a carácter, por isso as posições
+devolvidas correspondem às do texto original.
+
+Uso:
+    matcher = KeywordMatcher(['desenvolvi', 'React', 'Node.js'])
+    matcher.find("Desenvolvi APIs em Node.js")   # ['desenvolvi', 'Node.js']
+"""
+
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+class _CharTable(dict):
+    """Tabela para str.translate que normaliza cada carácter sem mudar o comprimento"""
+
+    def __init__(self, lower: bool, fold_accents: bool):
+        super().__init__()
+        self.lower = lower
+        self.fold_accents = fold_accents
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        mapped = char.lower() if self.lower else char
+        if self.fold_accents:
+            decomposed = unicodedata.normalize('NFD', mapped)
+            mapped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        # Só aceitar mapeamentos 1:1 para manter as posições do texto original
+        if len(mapped) != 1:
+            mapped = char
+        self[codepoint] = mapped
+        return mapped
+
+_TABLES: Dict[Tuple[bool, bool], _CharTable] = {}
+
+def normalize_text(text: str, case_insensitive: bool = True, fold_accents: bool = False) -> str:
+    """Normaliza um texto mantendo o comprimento (posições continuam válidas)"""
+    if not case_insensitive and not fold_accents:
+        return text
+    table = _TABLES.setdefault((case_insensitive, fold_accents), _CharTable(case_insensitive, fold_accents))
+    return text.translate(table)
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class KeywordMatcher:
+    """Autómato Aho-Corasick sobre uma lista de keywords"""
+
+    def __init__(self, keywords: Iterable[str], case_insensitive: bool = True,
+                 fold_accents: bool = False, word_boundary: bool = False):
+        self.keywords = list(keywords)
+        self.case_insensitive = case_insensitive
+        self.fold_accents = fold_accents
+        self.word_boundary = word_boundary
+
+        # Trie: transições, links de falha e keywords terminadas em cada estado
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._lengths: List[int] = []
+        self._edges: List[Tuple[bool, bool]] = []
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            pattern = self.normalize(keyword)
+            self._lengths.append(len(pattern))
+            # Limites de palavra só fazem sentido nas pontas alfanuméricas
+            self._edges.append((
+                bool(pattern) and _is_word_char(pattern[0]),
+                bool(pattern) and _is_word_char(pattern[-1])
+            ))
+            if not pattern:
+                continue
+
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._out[state] += (keyword_id,)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """BFS pela trie a calcular links de falha e juntar outputs"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+                queue.append(next_state)
+
+    def normalize(self, text: str) -> str:
+        """Aplica as normalizações configuradas (mesmo comprimento do original)"""
+        return normalize_text(text, self.case_insensitive, self.fold_accents)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Todas as ocorrências: (início, fim, keyword_id), por ordem de fim"""
+        normalized = self.normalize(text)
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+
+        for position, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+
+            end = position + 1
+            for keyword_id in out[state]:
+                start = end - self._lengths[keyword_id]
+                if self.word_boundary:
+                    check_start, check_end = self._edges[keyword_id]
+                    if check_start and start > 0 and _is_word_char(normalized[start - 1]):
+                        continue
+                    if check_end and end < len(normalized) and _is_word_char(normalized[end]):
+                        continue
+                yield start, end, keyword_id
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids das keywords presentes no texto"""
+        return {keyword_id for _, _, keyword_id in self.iter_matches(text)}
+
+    def find(self, text: str) -> List[str]:
+        """Keywords presentes no texto (sem repetições, pela ordem da lista original)"""
+        return [self.keywords[keyword_id] for keyword_id in sorted(self.find_ids(text))]
+
+    def contains_any(self, text: str) -> bool:
+        """True se pelo menos uma keyword ocorre no texto (pára no primeiro match)"""
+        return next(self.iter_matches(text), None) is not None
+
+# Verbos de ação fortes esperados nos exemplos de experiência (validação, geração paramétrica, ETL e treino)
+ACTION_VERBS = ['desenvolvi', 'implementei', 'geri', 'liderei', 'otimizei', 'aumentei', 'reduzi']
+ACTION_VERB_MATCHER = KeywordMatcher(ACTION_VERBS)
@@ -0,0 +1,242 @@
+"""
+📏 CV Builder - Pipeline Metrics
+Instrumentação por etapa do generate → validate → export
+
+Cada etapa (e sub-etapa: por arquivo, por secção, por módulo) regista:
+- tempo de parede e de CPU
+- pico de alocações Python (tracemalloc, só com --tracemalloc: é mais lento)
+- itens processados e throughput (itens/s), bytes escritos quando aplicável
+
+As etapas aninham-se e ficam numa lista plana com o caminho completo
+("text_improvement.json/experience"). O resultado vai para JSON ou para o
+formato textfile do Prometheus (--metrics-out com extensão .prom, para o
+textfile collector do node_exporter), e --profile-out guarda um dump do
+cProfile da execução inteira (abrir com `python -m pstats` ou snakeviz).
+
+Uso:
+    metrics = Metrics("validate")
+    with metrics.stage("text_improvement.json") as stage:
+        with metrics.stage("experience", items=len(examples)):
+            ...
+        stage.items = total
+    metrics.write(Path("metrics.json"))
+
+    python scripts/validate_datasets.py --metrics-out metrics/validate.prom --profile-out validate.prof
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROMETHEUS_PREFIX = "cv_builder"
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de RSS deste processo em MB (ru_maxrss é KB no Linux, bytes no macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class Stage:
+    """Medição de uma etapa (context manager); `items` e `bytes` podem ser preenchidos dentro do bloco"""
+
+    def __init__(self, metrics: "Metrics", name: str, items: Optional[int] = None):
+        self.metrics = metrics
+        self.name = name
+        self.path = name
+        self.items = items
+        self.bytes = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.traced_peak = None
+        # Pico absoluto (bytes) visto até agora nesta etapa, incluindo sub-etapas já fechadas
+        self._running_peak = 0
+        self._traced_start = 0
+        self._position = None
+
+    def __enter__(self) -> "Stage":
+        self.metrics._enter(self)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.process_time() - self._cpu_start
+        self.metrics._exit(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            'stage': self.path,
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'tracemalloc_peak_mb': round(self.traced_peak / (1024 * 1024), 3) if self.traced_peak is not None else None,
+            'items': self.items,
+            'items_per_s': round(self.items / self.wall, 1) if self.items is not None and self.wall > 0 else None,
+            'bytes': self.bytes
+        }
+
+class Metrics:
+    """Registo das etapas de um pipeline (generate, validate, export)"""
+
+    def __init__(self, pipeline: str, trace_memory: bool = False):
+        self.pipeline = pipeline
+        self.trace_memory = trace_memory
+        self.stages: List[dict] = []
+        self.total: Optional[Stage] = None
+        self.success: Optional[bool] = None
+        self._stack: List[Stage] = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str, items: Optional[int] = None) -> Stage:
+        """Nova etapa, filha da etapa aberta (se houver)"""
+        return Stage(self, name, items)
+
+    def _enter(self, stage: Stage):
+        stage.path = '/'.join([parent.name for parent in self._stack if parent.name] + [stage.name])
+        if self.trace_memory:
+            # tracemalloc só tem um pico global: guardar o da etapa mãe antes de o reiniciar
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]._running_peak = max(self._stack[-1]._running_peak, peak)
+            tracemalloc.reset_peak()
+            stage._traced_start = current
+            stage._running_peak = current
+        # Lugar reservado à entrada: a lista fica pela ordem de início (mãe antes das filhas)
+        if stage.name:
+            stage._position = len(self.stages)
+            self.stages.append({'stage': stage.path})
+        self._stack.append(stage)
+
+    def _exit(self, stage: Stage):
+        self._stack.pop()
+        if self.trace_memory:
+            peak = max(stage._running_peak, tracemalloc.get_traced_memory()[1])
+            stage.traced_peak = peak - stage._traced_start
+            if self._stack:
+                self._stack[-1]._running_peak = max(self._stack[-1]._running_peak, peak)
+            tracemalloc.reset_peak()
+        # A etapa raiz (sem nome) é o total da execução
+        if stage.name:
+            self.stages[stage._position] = stage.to_dict()
+
+    def extend(self, stages: List[dict]):
+        """Junta etapas medidas noutro processo (ex: workers da validação paralela)"""
+        prefix = '/'.join(parent.name for parent in self._stack if parent.name)
+        for stage in stages:
+            self.stages.append({**stage, 'stage': f"{prefix}/{stage['stage']}" if prefix else stage['stage']})
+
+    def run(self, func: Callable, profile_out: Optional[Path] = None):
+        """Corre o pipeline inteiro como etapa total (opcionalmente com cProfile)"""
+        profiler = cProfile.Profile() if profile_out else None
+        with Stage(self, "") as total:
+            if profiler:
+                profiler.enable()
+            try:
+                result = func()
+            finally:
+                if profiler:
+                    profiler.disable()
+                    Path(profile_out).parent.mkdir(parents=True, exist_ok=True)
+                    profiler.dump_stats(str(profile_out))
+        self.total = total
+        self.success = result is not False
+        return result
+
+    def to_dict(self) -> dict:
+        total = self.total.to_dict() if self.total else None
+        if total:
+            total['stage'] = 'total'
+        return {
+            'pipeline': self.pipeline,
+            'created_at': datetime.now().isoformat(),
+            'success': self.success,
+            'tracemalloc': self.trace_memory,
+            'peak_rss_mb': peak_rss_mb(),
+            'total': total,
+            'stages': self.stages
+        }
+
+    def to_prometheus(self) -> str:
+        """Formato textfile do Prometheus (gauges por pipeline e etapa)"""
+        data = self.to_dict()
+        pipeline = _label(self.pipeline)
+        lines = []
+
+        def family(name: str, help_text: str, samples: List[tuple]):
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                return
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{labels}}} {value}")
+
+        run_labels = f'pipeline="{pipeline}"'
+        total = data['total'] or {}
+        family("run_success", "1 if the last run succeeded", [(run_labels, int(bool(data['success'])))])
+        family("run_timestamp_seconds", "Unix time of the last run", [(run_labels, int(time.time()))])
+        family("run_wall_seconds", "Wall time of the whole run", [(run_labels, total.get('wall_s'))])
+        family("run_cpu_seconds", "CPU time of the whole run", [(run_labels, total.get('cpu_s'))])
+        family("run_peak_rss_bytes", "Peak resident set size of the process",
+               [(run_labels, round(data['peak_rss_mb'] * 1024 * 1024) if data['peak_rss_mb'] is not None else None)])
+
+        stages = [(f'{run_labels},stage="{_label(stage["stage"])}"', stage) for stage in data['stages']]
+        family("stage_wall_seconds", "Wall time per stage", [(labels, s['wall_s']) for labels, s in stages])
+        family("stage_cpu_seconds", "CPU time per stage", [(labels, s['cpu_s']) for labels, s in stages])
+        family("stage_tracemalloc_peak_bytes", "Peak traced Python allocations per stage",
+               [(labels, round(s['tracemalloc_peak_mb'] * 1024 * 1024) if s['tracemalloc_peak_mb'] is not None else None)
+                for labels, s in stages])
+        family("stage_items", "Items processed per stage", [(labels, s['items']) for labels, s in stages])
+        family("stage_items_per_second", "Throughput per stage", [(labels, s['items_per_s']) for labels, s in stages])
+        family("stage_bytes", "Bytes written per stage", [(labels, s['bytes']) for labels, s in stages])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path):
+        """Grava as métricas: .prom → Prometheus textfile, outra extensão → JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.prom':
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + '\n'
+        # Escrita atómica: o textfile collector nunca lê um arquivo a meio
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp, path)
+
+def _label(value: str) -> str:
+    """Escapa um valor de label do Prometheus"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def add_metrics_arguments(parser):
+    """Opções --metrics-out, --profile-out e --tracemalloc comuns aos scripts do pipeline"""
+    parser.add_argument("--metrics-out", type=Path,
+                        help="Grava métricas por etapa (JSON, ou Prometheus textfile se a extensão for .prom)")
+    parser.add_argument("--profile-out", type=Path, help="Grava um dump do cProfile da execução (.prof)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Mede o pico de alocações Python por etapa (mais lento)")
+
+def run_with_metrics(metrics: Metrics, func: Callable, args):
+    """Corre `func` com as opções de add_metrics_arguments e grava as métricas pedidas"""
+    result = metrics.run(func, args.profile_out)
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+        print(f"📏 Métricas: {args.metrics_out}")
+    if args.profile_out:
+        print(f"🔬 Profile: {args.profile_out}")
+    return result
@@ -0,0 +1,177 @@
+"""
+🧬 CV Builder - Near-Duplicate Detection
+Deteção de exemplos quase duplicados com MinHash + LSH (tempo ~linear)
+
+Cada exemplo vira um conjunto de shingles (bigramas de palavras, sem
+acentos/maiúsculas) dos textos 'original' e 'improved'. A assinatura
+MinHash estima a semelhança de Jaccard entre conjuntos; o LSH divide a
+assinatura em bandas e só compara exemplos que partilham uma banda inteira,
+por isso não há comparação de todos os pares (O(n²)).
+
+Os candidatos são confirmados pela Jaccard estimada (fração de minhashes
+iguais) contra o threshold e agrupados em clusters (union-find).
+
+As assinaturas são calculadas durante a passagem que já lê os exemplos
+(add_example); detetores de shards diferentes juntam-se com merge(). As
+assinaturas ocupam 64×4 bytes por exemplo, por isso a validação em
+streaming só as calcula se pedido (--near-duplicates).
+
+Uso:
+    detector = NearDuplicateDetector(threshold=0.8)
+    for idx, example in enumerate(examples):
+        detector.add_example('experience', idx, example)
+    clusters = detector.clusters()   # [[id, id, ...], ...]
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from keyword_matcher import normalize_text
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+MERSENNE_PRIME = (1 << 31) - 1   # a·h + b cabe em uint64 sem overflow
+MAX_BUCKET_REPRESENTATIVES = 8   # comparações por exemplo em cada bucket (mantém o custo linear)
+CHUNK_SIZE = 1024
+
+_WORD = re.compile(r'\w+')
+
+def shingles(texts: Iterable[str]) -> List[int]:
+    """Hashes (crc32) dos bigramas de palavras de cada texto, marcados pelo campo"""
+    hashes = []
+    for field, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        words = _WORD.findall(normalize_text(text, True, True))
+        grams = zip(words, words[1:]) if len(words) > 1 else ((word,) for word in words)
+        for gram in grams:
+            hashes.append(zlib.crc32(f"{field}:{' '.join(gram)}".encode('utf-8')))
+    return hashes
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bandas, linhas por banda) cujo limiar (1/b)^(1/r) fica mais perto de 0.9·threshold
+
+    O limiar do LSH fica um pouco abaixo do threshold para favorecer o recall;
+    os falsos positivos são eliminados na confirmação pela Jaccard estimada.
+    """
+    target = 0.9 * threshold
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if abs((1 / bands) ** (1 / rows) - target) < abs((1 / best[0]) ** (1 / best[1]) - target):
+            best = (bands, rows)
+    return best
+
+class NearDuplicateDetector:
+    """Acumula assinaturas MinHash e agrupa exemplos com Jaccard estimada >= threshold"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+
+        self.keys: List[str] = []
+        self._signatures: List[np.ndarray] = []
+        self._pending: List[List[int]] = []
+
+    def add(self, key: str, texts: Iterable[str]):
+        """Regista um exemplo (as assinaturas são calculadas em lotes)"""
+        self.keys.append(key)
+        self._pending.append(shingles(texts))
+        if len(self._pending) >= CHUNK_SIZE:
+            self.flush()
+
+    def add_example(self, section_name: str, idx: int, example: dict):
+        """Regista um exemplo de text_improvement (id por omissão do validador: <secção>_<posição>)"""
+        if not isinstance(example, dict):
+            return
+        key = example.get('id', f'{section_name}_{idx}')
+        self.add(str(key), [example.get('original'), example.get('improved')])
+
+    def merge(self, other: "NearDuplicateDetector"):
+        """Junta as assinaturas de outro detetor (ex: de um worker), a seguir às existentes"""
+        self.flush()
+        other.flush()
+        self.keys.extend(other.keys)
+        self._signatures.extend(other._signatures)
+
+    def flush(self):
+        """MinHash vetorizado de um lote: permutações × shingles e mínimo por exemplo"""
+        if not self._pending:
+            return
+        lengths = np.array([len(hashes) for hashes in self._pending])
+        signatures = np.full((len(self._pending), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        filled = lengths > 0
+        if filled.any():
+            values = np.fromiter(
+                (h for hashes in self._pending for h in hashes), dtype=np.uint64, count=int(lengths.sum())
+            ) % np.uint64(MERSENNE_PRIME)
+            permuted = (self.a * values + self.b) % np.uint64(MERSENNE_PRIME)
+            starts = np.concatenate(([0], np.cumsum(lengths[filled])[:-1]))
+            signatures[filled] = np.minimum.reduceat(permuted, starts, axis=1).T.astype(np.uint32)
+        self._signatures.append(signatures)
+        self._pending = []
+
+    def clusters(self) -> List[List[str]]:
+        """Clusters de quase duplicados (>= 2 exemplos), pela ordem do 1º exemplo"""
+        self.flush()
+        if not self._signatures:
+            return []
+        signatures = np.vstack(self._signatures)
+        empty = signatures[:, 0] == np.iinfo(np.uint32).max
+
+        parent = list(range(len(signatures)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            block = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            # Exemplos com a banda igual ficam consecutivos depois de ordenar
+            keys = block.view(np.dtype((np.void, block.dtype.itemsize * self.rows))).ravel()
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+            for bucket in np.split(order, boundaries):
+                if len(bucket) < 2:
+                    continue
+                representatives: List[int] = []
+                for idx in bucket.tolist():
+                    if empty[idx]:
+                        continue
+                    for rep in representatives:
+                        if np.mean(signatures[idx] == signatures[rep]) >= self.threshold:
+                            ra, rb = find(idx), find(rep)
+                            if ra != rb:
+                                parent[max(ra, rb)] = min(ra, rb)
+                            break
+                    else:
+                        if len(representatives) < MAX_BUCKET_REPRESENTATIVES:
+                            representatives.append(idx)
+
+        groups: Dict[int, List[str]] = {}
+        for idx in range(len(signatures)):
+            groups.setdefault(find(idx), []).append(self.keys[idx])
+        return [members for _, members in sorted(groups.items()) if len(members) > 1]
+
+def find_near_duplicates(examples: Iterable[Tuple[str, dict]], threshold: float = DEFAULT_THRESHOLD,
+                         num_perm: int = DEFAULT_NUM_PERM) -> List[List[str]]:
+    """Clusters de ids de exemplos quase duplicados a partir de (secção, exemplo)"""
+    detector = NearDuplicateDetector(threshold, num_perm)
+    positions: Dict[str, int] = {}
+    for section_name, example in examples:
+        idx = positions.get(section_name, 0)
+        positions[section_name] = idx + 1
+        detector.add_example(section_name, idx, example)
+    return detector.clusters()
@@ -0,0 +1,311 @@
+"""
+🧬 CV Builder - Parametric Example Generator
+Gera exemplos de melhoria de texto em larga escala a partir dos datasets existentes
+
+Cada exemplo combina, por indústria, um role e os seus tópicos
+(job_specific_keywords), ferramentas (skills_by_area e listas de
+tools/platforms das keywords ATS), verbos de ação fortes (os do validador) e
+métricas (metrics_keywords), para uma secção e senioridade.
+
+- Determinístico: o exemplo i depende só de (seed, i), com qualquer nº de workers
+- Equilibrado: cada combinação secção × indústria × senioridade tem a mesma quota
+- Sem duplicados: fingerprint de (secção, original, improved)
+- Streaming: os exemplos saem por blocos dos workers, sem lista completa em memória
+
+Uso:
+    python scripts/generate_datasets.py --parametric 100000 --workers 4
+"""
+
+import json
+import random
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dataset_io import ATS_KEYWORDS_DIR
+from skills_table import iter_skill_records
+from keyword_matcher import ACTION_VERBS
+
+SECTIONS = ['experience', 'summary', 'education', 'skills']
+SENIORITIES = ['junior', 'mid-level', 'senior']
+
+SENIORITY_PROFILE = {
+    'junior': {'label': 'Júnior', 'years': (1, 2), 'team': (2, 5), 'scale': 1},
+    'mid-level': {'label': '', 'years': (3, 6), 'team': (4, 12), 'scale': 5},
+    'senior': {'label': 'Sénior', 'years': (7, 15), 'team': (8, 40), 'scale': 20}
+}
+
+# Listas das keywords ATS que contêm ferramentas (o resto são skills/conceitos)
+TOOL_LISTS = {'tools', 'platforms', 'frameworks', 'languages', 'providers', 'channels'}
+
+# Áreas do skills_by_area.json usadas por indústria
+SKILL_AREAS = {
+    'technology': ['technology'],
+    'marketing': ['marketing']
+}
+
+EDUCATION_FIELDS = {
+    'technology': ['Engenharia Informática', 'Ciência de Dados', 'Engenharia de Software', 'Sistemas de Informação'],
+    'marketing': ['Marketing', 'Gestão', 'Comunicação Empresarial', 'Marketing Digital'],
+    'healthcare': ['Enfermagem', 'Ciências da Saúde', 'Gestão em Saúde', 'Ciências Farmacêuticas']
+}
+DEFAULT_EDUCATION_FIELDS = ['Gestão', 'Economia', 'Engenharia']
+
+DEGREES = ['Licenciatura', 'Mestrado', 'Pós-Graduação']
+UNIVERSITIES = [
+    'Universidade do Minho', 'Universidade do Porto', 'Universidade de Lisboa',
+    'Universidade de Coimbra', 'Universidade Nova de Lisboa', 'ISCTE', 'Universidade de Aveiro'
+]
+
+WEAK_OPENINGS = {
+    'experience': ['Trabalhei com {topic}', 'Fiz tarefas de {topic}', 'Ajudei em {topic}',
+                   'Participei em projetos de {topic}', 'Tratei de {topic} na empresa'],
+    'summary': ['Tenho experiência em {topic}', 'Sou dedicado e gosto de {topic}',
+                'Trabalho na área de {topic}', 'Procuro oportunidades em {topic}'],
+    'education': ['Licenciatura em {field}', 'Curso de {field}', 'Estudei {field}'],
+    'skills': ['{tool_a}, {tool_b}', 'Sei usar {tool_a} e {tool_b}', '{tool_a}, {tool_b}, {topic}']
+}
+
+RESULT_TEMPLATES = [
+    'aumentando {metric} em {pct}%',
+    'reduzindo {metric} em {pct}%',
+    'gerando €{money}K em poupanças',
+    'alcançando {volume}+ utilizadores',
+    'mantendo {pct2}% de {metric}'
+]
+
+CONTEXT_TEMPLATES = [
+    'numa equipa de {team} pessoas',
+    'para {clients}+ clientes',
+    'em {projects} projetos simultâneos',
+    ''
+]
+
+def _unique(values) -> List[str]:
+    """Remove duplicados (case-insensitive) mantendo a ordem"""
+    seen = set()
+    result = []
+    for value in values:
+        if isinstance(value, str) and value.strip() and value.lower() not in seen:
+            seen.add(value.lower())
+            result.append(value.strip())
+    return result
+
+def _iter_lists(data: dict, prefix: str = '') -> Iterator[Tuple[str, list]]:
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, list):
+            yield path, value
+        elif isinstance(value, dict):
+            yield from _iter_lists(value, path)
+
+def build_vocabulary(skills: dict, ats_dir: Path = ATS_KEYWORDS_DIR) -> Dict[str, dict]:
+    """Vocabulário por indústria: roles/tópicos, ferramentas, métricas e verbos
+
+    `skills` é a base de skills da mesma geração (a que vai para skills_by_area.json),
+    não o arquivo em disco, que pode não existir ainda ou ser de uma geração anterior.
+    """
+    vocabulary = {}
+    for path in sorted(Path(ats_dir).glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            keywords = json.load(f)
+        industry = path.stem
+
+        tools = [skill.get('name') for area, _, skill in iter_skill_records(skills)
+                 if area in SKILL_AREAS.get(industry, [])]
+        tools += [keyword for list_path, values in _iter_lists(keywords)
+                  if list_path.rsplit('.', 1)[-1] in TOOL_LISTS for keyword in values]
+
+        roles = [
+            (role.replace('_', ' ').title(), _unique(topics))
+            for role, topics in keywords.get('job_specific_keywords', {}).items()
+            if _unique(topics)
+        ]
+
+        vocabulary[industry] = {
+            'roles': roles,
+            'tools': _unique(tools),
+            'metrics': _unique(keywords.get('metrics_keywords', [])) or ['eficiência'],
+            'verbs': list(ACTION_VERBS),
+            'fields': EDUCATION_FIELDS.get(industry, DEFAULT_EDUCATION_FIELDS)
+        }
+
+    # Indústrias sem roles ou ferramentas não geram exemplos úteis
+    return {industry: vocab for industry, vocab in vocabulary.items() if vocab['roles'] and len(vocab['tools']) >= 4}
+
+def fingerprint(example: dict) -> int:
+    """Hash de 64 bits de (secção, original, improved) para deduplicação"""
+    key = f"{example['section']}\x1f{example['original'].lower()}\x1f{example['improved'].lower()}"
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class ParametricGenerator:
+    """Gera o exemplo i de forma determinística a partir de (seed, i)"""
+
+    def __init__(self, vocabulary: Dict[str, dict], seed: int = 42):
+        self.vocabulary = vocabulary
+        self.seed = seed
+        self.cells = [
+            (section, industry, seniority)
+            for section in SECTIONS
+            for industry in sorted(vocabulary)
+            for seniority in SENIORITIES
+        ]
+
+    def cell(self, index: int) -> Tuple[str, str, str]:
+        """Combinação secção × indústria × senioridade do exemplo i (round-robin)"""
+        return self.cells[index % len(self.cells)]
+
+    def generate(self, index: int) -> dict:
+        """Exemplo i"""
+        section, industry, seniority = self.cell(index)
+        rng = random.Random(self.seed * 1_000_003 + index)
+        vocab = self.vocabulary[industry]
+        profile = SENIORITY_PROFILE[seniority]
+
+        role, topics = rng.choice(vocab['roles'])
+        topic = rng.choice(topics)
+        tool_a, tool_b, tool_c, tool_d = rng.sample(vocab['tools'], 4)
+        metric = rng.choice(vocab['metrics'])
+        values = {
+            'topic': topic,
+            'tool_a': tool_a,
+            'tool_b': tool_b,
+            'metric': metric,
+            'pct': rng.randint(10, 60),
+            'pct2': rng.randint(90, 99),
+            'money': rng.randint(10, 200) * profile['scale'],
+            'volume': rng.randint(1, 50) * 1000 * profile['scale'],
+            'team': rng.randint(*profile['team']),
+            'clients': rng.randint(2, 30) * 10,
+            'projects': rng.randint(2, 4 + profile['scale'] // 2),
+            'field': rng.choice(vocab['fields'])
+        }
+
+        result = rng.choice(RESULT_TEMPLATES).format(**values)
+        keywords = [tool_a, tool_b]
+        improvements = []
+
+        if section == 'experience':
+            verb = rng.choice(vocab['verbs'])
+            context = rng.choice(CONTEXT_TEMPLATES).format(**values)
+            second_values = {**values, 'metric': rng.choice(vocab['metrics']), 'pct': rng.randint(10, 60)}
+            second = rng.choice([t for t in RESULT_TEMPLATES if t.format(**second_values) != result]).format(**second_values)
+            improved = f"{verb.capitalize()} {topic}{' ' + context if context else ''} com {tool_a} e {tool_b}, {result} e {second}"
+            keywords = [verb, topic, tool_a, tool_b, metric]
+            improvements = ["verbo de ação forte", "tecnologias específicas", "quantificação de resultados", "impacto mensurável"]
+        elif section == 'summary':
+            years = rng.randint(*profile['years'])
+            title = f"{role} {profile['label']}".strip()
+            improved = (f"{title} com {years}+ anos de experiência em {topic}, com domínio de {tool_a}, {tool_b} e {tool_c}. "
+                        f"Histórico comprovado em {rng.choice(topics)}, {result}")
+            keywords = [role, f"{years}+ anos", topic, tool_a, tool_b, tool_c]
+            improvements = ["título profissional claro", "anos de experiência", "stack tecnológico", "resultados de negócio"]
+        elif section == 'education':
+            start_year = rng.randint(2005, 2021)
+            degree = rng.choice(DEGREES)
+            grade = rng.randint(13, 19)
+            improved = (f"{degree} em {values['field']} - {rng.choice(UNIVERSITIES)} ({start_year}-{start_year + 3}) | "
+                        f"Média: {grade}/20 | Projeto Final: {topic} com {tool_a} (classificação: {min(20, grade + 1)}/20)")
+            keywords = [values['field'], degree, f"{grade}/20", topic, tool_a]
+            improvements = ["nome completo do curso", "instituição", "período", "média", "projeto relevante"]
+        else:
+            improved = f"{tool_a} ({tool_c}, {tool_d}) | {tool_b} Avançado | {topic.capitalize()} | {metric.capitalize()}"
+            keywords = [tool_a, tool_b, tool_c, tool_d, topic]
+            improvements = ["ferramentas específicas", "nível avançado", "ferramentas relacionadas"]
+
+        original = rng.choice(WEAK_OPENINGS[section]).format(**values)
+
+        # Scores heurísticos: mais keywords e métricas concretas -> score mais alto
+        has_metric = any(char.isdigit() for char in improved)
+        ats_score = min(98, 62 + 4 * len(keywords) + (6 if has_metric else 0) + rng.randint(0, 6))
+        quality_score = min(98, 60 + 3 * len(improvements) + (8 if has_metric else 0) + rng.randint(0, 10))
+
+        return {
+            "id": f"{section[:3]}_p{index:08d}",
+            "original": original,
+            "section": section,
+            "improved": improved,
+            "improvements": improvements,
+            "keywords": keywords,
+            "ats_score": ats_score,
+            "quality_score": quality_score,
+            "industry": industry,
+            "seniority": seniority,
+            "language": "pt-PT"
+        }
+
+# ========== GERAÇÃO PARALELA ==========
+
+_WORKER_GENERATOR: Optional[ParametricGenerator] = None
+
+def _init_worker(vocabulary: Dict[str, dict], seed: int):
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = ParametricGenerator(vocabulary, seed)
+
+def _generate_chunk(start: int, end: int) -> List[dict]:
+    """Worker: exemplos [start, end)"""
+    return [_WORKER_GENERATOR.generate(index) for index in range(start, end)]
+
+def iter_parametric_examples(vocabulary: Dict[str, dict], target: int, workers: int = 1, seed: int = 42,
+                             chunk_size: int = 5000, stats: Optional[dict] = None) -> Iterator[dict]:
+    """Exemplos únicos e equilibrados até `target`, gerados em blocos por `workers` processos
+
+    Cada combinação secção × indústria × senioridade tem uma quota de
+    target / nº combinações; exemplos duplicados ou de combinações já cheias
+    são descartados e a geração continua até preencher as quotas (ou até
+    3× o alvo, se o espaço de combinações se esgotar).
+    """
+    generator = ParametricGenerator(vocabulary, seed)
+    cells = len(generator.cells)
+    quotas = [target // cells + (1 if cell < target % cells else 0) for cell in range(cells)]
+    remaining = sum(quotas)
+    max_index = max(target * 3, chunk_size)
+
+    stats = stats if stats is not None else {}
+    stats.update({'generated': 0, 'duplicates': 0, 'accepted': 0})
+    seen = set()
+    created_at = datetime.now().isoformat()
+
+    def accept(examples: List[dict], start: int) -> Iterator[dict]:
+        nonlocal remaining
+        for offset, example in enumerate(examples):
+            stats['generated'] += 1
+            cell = (start + offset) % cells
+            if not quotas[cell]:
+                continue
+            key = fingerprint(example)
+            if key in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(key)
+            quotas[cell] -= 1
+            remaining -= 1
+            stats['accepted'] += 1
+            example['created_at'] = created_at
+            yield example
+
+    if workers <= 1:
+        _init_worker(vocabulary, seed)
+        for start in range(0, max_index, chunk_size):
+            if not remaining:
+                break
+            yield from accept(_generate_chunk(start, min(start + chunk_size, max_index)), start)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(vocabulary, seed)) as pool:
+        # Poucos blocos em voo: memória limitada e resultados pela ordem dos índices
+        pending = deque()
+        next_start = 0
+        while remaining and (pending or next_start < max_index):
+            while len(pending) < workers * 2 and next_start < max_index:
+                end = min(next_start + chunk_size, max_index)
+                pending.append((next_start, pool.submit(_generate_chunk, next_start, end)))
+                next_start = end
+            start, future = pending.popleft()
+            yield from accept(future.result(), start)
+
+        for _, future in pending:
+            future.cancel()
@@ -0,0 +1,484 @@
+"""
+🔄 CV Builder - Raw → Processed ETL
+Transforma os datasets de datasets/raw/ nos schemas de datasets/processed/
+
+Cada arquivo raw é uma lista de registos (exemplos de texto, skills por
+área/categoria, sumários por perfil); cada registo vira um ou mais itens
+colocados numa lista do dataset processado:
+
+- text_improvement_raw.json → text_improvement.json  by_section.<secção>[] (chave: id)
+- skills_database_raw.json  → skills_by_area.json    <área>.<categoria>[]  (chave: name)
+- summaries_raw.json        → summary_templates.json templates_by_role.<role>.<nível>.examples[]
+
+O estado (datasets/.etl_state.json) guarda o SHA-256 do conteúdo de cada
+registo e os itens em que foi transformado. Numa nova execução só os
+registos novos ou alterados passam pela transformação; os outros reutilizam
+os itens guardados. Os itens são depois fundidos no dataset processado por
+chave (no lugar, ou acrescentados), os de registos removidos do raw são
+retirados e os restantes itens do processado (exemplos base do generate,
+templates escritos à mão) ficam como estão. A fusão é campo a campo: os
+campos vindos do raw são atualizados, os que só existem no processado
+(job_titles, difficulty, ...) mantêm-se e os derivados por heurística
+(quality_score, learning_time) só preenchem o que falta. Cada lista do
+processado é indexada uma vez por execução (chave -> posição), e os registos
+sem alterações não voltam a ser fundidos enquanto o arquivo processado for o
+que o ETL escreveu (o estado guarda o seu hash). Se nada mudou, o arquivo
+não é reescrito. Mudar o código das transformações (este módulo e
+os de TRANSFORM_MODULES) reprocessa todos os registos.
+
+Uso:
+    python scripts/raw_etl.py
+    python scripts/raw_etl.py --raw-dir /tmp/raw --datasets-dir /tmp/processed
+    python scripts/raw_etl.py --force   # ignora o estado e reprocessa tudo
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+
+from dataset_io import DATASETS_DIR, RAW_DATASETS_DIR, find_dataset, load_dataset
+from skills_columnar import write_columnar
+from skills_table import iter_skill_rows
+from job_title_index import normalize_title
+from keyword_matcher import ACTION_VERB_MATCHER
+from metrics import Metrics, add_metrics_arguments, run_with_metrics
+
+ETL_STATE_VERSION = 1
+STATE_FILENAME = ".etl_state.json"
+
+# Item transformado: (caminho da lista no dataset processado, valor)
+Placement = Tuple[Tuple[str, ...], Any]
+
+# Mesmos pesos do quality_scoring de text_improvement.json
+QUALITY_CRITERIA = {
+    'has_action_verb': 20,
+    'has_quantification': 25,
+    'has_specificity': 20,
+    'appropriate_length': 15,
+    'ats_friendly': 20
+}
+NUMBER_PATTERN = re.compile(r'\d')
+
+TEXT_FIELDS = ('id', 'original', 'section', 'improved', 'improvements', 'keywords',
+               'ats_score', 'quality_score', 'industry', 'seniority', 'language')
+# Campo processado -> campo raw (o primeiro que existir)
+SKILL_FIELDS = {
+    'name': ('name',),
+    'priority': ('priority',),
+    'demand_score': ('demand_score',),
+    'salary_impact': ('salary_impact', 'avg_salary_impact'),
+    'category': ('category',),
+    'related_skills': ('related_skills',),
+    'learning_time': ('learning_time', 'years_to_master'),
+    'certifications': ('certifications',),
+    'trend': ('trend',)
+}
+
+# ========== TRANSFORMAÇÕES ==========
+
+def quality_score(original: str, improved: str, keywords: list) -> int:
+    """Score heurístico (0-100) pelos critérios do quality_scoring"""
+    improved_lower = improved.lower()
+    found = sum(1 for keyword in keywords if isinstance(keyword, str) and keyword.lower() in improved_lower)
+    checks = {
+        'has_action_verb': ACTION_VERB_MATCHER.contains_any(improved),
+        'has_quantification': NUMBER_PATTERN.search(improved) is not None,
+        'has_specificity': len(improved) > len(original) * 1.5,
+        'appropriate_length': 10 <= len(improved.split()) <= 50,
+        'ats_friendly': len(keywords) >= 3 and found * 2 >= len(keywords)
+    }
+    return sum(weight for name, weight in QUALITY_CRITERIA.items() if checks[name])
+
+def transform_text_example(location: tuple, example: dict) -> List[Placement]:
+    """Exemplo raw -> exemplo processado na lista da sua secção"""
+    if not isinstance(example, dict) or not isinstance(example.get('section'), str):
+        return []
+
+    processed = {}
+    for field in TEXT_FIELDS:
+        if field in example:
+            value = example[field]
+            processed[field] = value.strip() if isinstance(value, str) else value
+    if isinstance(processed.get('keywords'), list):
+        processed['keywords'] = list(dict.fromkeys(processed['keywords']))
+
+    score = processed.get('quality_score')
+    if not isinstance(score, (int, float)) or isinstance(score, bool):
+        original, improved = processed.get('original'), processed.get('improved')
+        if isinstance(original, str) and isinstance(improved, str):
+            keywords = processed['keywords'] if isinstance(processed.get('keywords'), list) else []
+            processed['quality_score'] = quality_score(original, improved, keywords)
+    return [(('by_section', processed['section']), processed)]
+
+def learning_time(years) -> Any:
+    """years_to_master -> texto do processado ("18 meses", "2 anos")"""
+    if not isinstance(years, (int, float)) or isinstance(years, bool):
+        return years
+    months = round(years * 12)
+    return f"{months} meses" if months < 24 else f"{years:g} anos"
+
+def transform_skill(location: tuple, skill: dict) -> List[Placement]:
+    """Skill raw -> skill processada na mesma área/categoria"""
+    if not isinstance(skill, dict):
+        return []
+
+    processed = {}
+    for field, sources in SKILL_FIELDS.items():
+        source = next((name for name in sources if name in skill), None)
+        if source is not None:
+            processed[field] = learning_time(skill[source]) if source == 'years_to_master' else skill[source]
+    return [(tuple(location), processed)]
+
+def summary_level(years) -> str:
+    if not isinstance(years, (int, float)) or years <= 2:
+        return 'junior'
+    return 'mid_level' if years <= 6 else 'senior'
+
+def transform_summary(location: tuple, example: dict) -> List[Placement]:
+    """Sumário raw -> exemplos (principal + variações) do role/nível do perfil"""
+    profile = example.get('profile') if isinstance(example, dict) else None
+    summaries = example.get('generated_summaries') if isinstance(example, dict) else None
+    if not isinstance(profile, dict) or not isinstance(summaries, dict) or not isinstance(profile.get('job_title'), str):
+        return []
+
+    role = re.sub(r'[^a-z0-9]+', '_', normalize_title(profile['job_title'])).strip('_')
+    if not role:
+        return []
+    path = ('templates_by_role', role, summary_level(profile.get('years_experience')), 'examples')
+    texts = [summaries.get('main')] + list(summaries.get('variations') or [])
+    return [(path, text.strip()) for text in texts if isinstance(text, str) and text.strip()]
+
+# ========== REGISTOS RAW ==========
+
+def iter_examples(data: dict) -> Iterator[Tuple[str, tuple, Any]]:
+    """(id, localização, registo) de documentos {metadata, examples: [...]}"""
+    examples = data.get('examples') if isinstance(data, dict) else None
+    for position, example in enumerate(examples if isinstance(examples, list) else []):
+        record_id = example.get('id') if isinstance(example, dict) else None
+        yield (record_id if isinstance(record_id, str) else f'#{position}'), (), example
+
+def iter_raw_skills(data: dict) -> Iterator[Tuple[str, tuple, Any]]:
+    """(área.categoria/nome, caminho da lista, skill) a qualquer profundidade"""
+    for _, _, path, position, value in iter_skill_rows(data):
+        if position is None:
+            continue
+        name = value.get('name') if isinstance(value, dict) else None
+        yield f"{'.'.join(path)}/{name if isinstance(name, str) else f'#{position}'}", path, value
+
+# Arquivo raw: (dataset processado, campo-chave dos itens (None = o próprio valor), registos, transformação)
+RAW_DATASETS = {
+    "text_improvement_raw.json": ("text_improvement.json", "id", iter_examples, transform_text_example),
+    "skills_database_raw.json": ("skills_by_area.json", "name", iter_raw_skills, transform_skill),
+    "summaries_raw.json": ("summary_templates.json", None, iter_examples, transform_summary)
+}
+
+# Campos calculados por heurística (não vêm do raw): só preenchem o que falta no processado
+DERIVED_FIELDS = {
+    "text_improvement_raw.json": ("quality_score",),
+    "skills_database_raw.json": ("learning_time",)
+}
+
+# Módulos de que as transformações dependem (além deste): fazem parte do fingerprint
+TRANSFORM_MODULES = ("skills_table.py", "job_title_index.py", "keyword_matcher.py")
+
+# ========== MERGE ==========
+
+def record_hash(location: tuple, record: Any) -> str:
+    """SHA-256 do conteúdo de um registo (JSON canónico, incluindo onde está no raw)"""
+    payload = json.dumps([list(location), record], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def item_key(value: Any, key_field: Optional[str]):
+    if key_field is None:
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return value.get(key_field) if isinstance(value, dict) else None
+
+def target_list(document: dict, path: tuple, create: bool) -> Optional[list]:
+    """Lista do documento num caminho de chaves (criada se create=True)"""
+    node = document
+    for position, part in enumerate(path):
+        if not isinstance(node, dict):
+            raise ValueError(f"'{'.'.join(path[:position])}' is not an object")
+        if part not in node:
+            if not create:
+                return None
+            node[part] = [] if position == len(path) - 1 else {}
+        node = node[part]
+    if not isinstance(node, list):
+        raise ValueError(f"'{'.'.join(path)}' is not a list")
+    return node
+
+def merge_item(item: Any, value: Any, emitted: Any, derived: tuple) -> Any:
+    """Funde campo a campo: os campos do raw são atualizados, os que só existem no processado ficam
+
+    emitted é o item da execução anterior: os campos que o raw deixou de ter são retirados.
+    Os campos derivados só são preenchidos se o processado ainda não os tiver.
+    """
+    if not isinstance(item, dict) or not isinstance(value, dict):
+        return value
+    merged = dict(item)
+    for field in emitted if isinstance(emitted, dict) else {}:
+        if field not in value and field not in derived:
+            merged.pop(field, None)
+    for field, field_value in value.items():
+        if field not in derived or field not in item:
+            merged[field] = field_value
+    return merged
+
+class TargetList:
+    """Lista do documento processado com o índice chave -> posição (construído uma vez por merge)"""
+
+    def __init__(self, items: list, key_field: Optional[str]):
+        self.items = items
+        self.key_field = key_field
+        self.reindex()
+
+    def reindex(self):
+        # Chaves repetidas: vale o primeiro item, como numa procura sequencial
+        self.positions = {}
+        for position, item in enumerate(self.items):
+            self.positions.setdefault(item_key(item, self.key_field), position)
+
+    def retract(self, keys: set) -> bool:
+        """Retira os itens com estas chaves numa só passagem; devolve True se havia algum"""
+        if not keys.intersection(self.positions):
+            return False
+        self.items[:] = [item for item in self.items if item_key(item, self.key_field) not in keys]
+        self.reindex()
+        return True
+
+    def upsert(self, value: Any, emitted: Any = None, derived: tuple = ()) -> bool:
+        """Funde no lugar com o item da mesma chave, ou acrescenta; devolve True se mudou"""
+        key = item_key(value, self.key_field)
+        position = self.positions.get(key)
+        if position is None:
+            self.positions[key] = len(self.items)
+            self.items.append(value)
+            return True
+        merged = merge_item(self.items[position], value, emitted, derived)
+        if self.items[position] == merged:
+            return False
+        self.items[position] = merged
+        return True
+
+def file_hash(path: Path) -> str:
+    """SHA-256 do conteúdo de um arquivo"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class RawETL:
+    def __init__(self, raw_dir: Path = None, datasets_dir: Path = None, state_file: Path = None,
+                 force: bool = False, metrics: Metrics = None, datasets: dict = None):
+        """
+        Args:
+            raw_dir: pasta dos datasets raw
+            datasets_dir: pasta dos datasets processados
+            state_file: hashes e itens por registo (default: <datasets_dir>/../.etl_state.json)
+            force: ignora o estado e transforma todos os registos
+            metrics: registo de tempos/memória por etapa (ver metrics.py)
+            datasets: documentos já em memória ({nome do arquivo: dict}), atualizados com o resultado
+        """
+        self.raw_dir = Path(raw_dir or RAW_DATASETS_DIR)
+        self.datasets_dir = Path(datasets_dir or DATASETS_DIR)
+        self.state_file = Path(state_file or self.datasets_dir.parent / STATE_FILENAME)
+        self.force = force
+        self.metrics = metrics or Metrics("etl")
+        self.datasets = datasets if datasets is not None else {}
+        # O código das transformações faz parte do estado: se mudar, tudo é reprocessado
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        for module in TRANSFORM_MODULES:
+            digest.update((Path(__file__).parent / module).read_bytes())
+        self.fingerprint = digest.hexdigest()
+
+    def load_state(self) -> dict:
+        """Estado da última execução ({arquivo raw: {fingerprint, records}})"""
+        if self.force or not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return state.get("datasets", {}) if state.get("version") == ETL_STATE_VERSION else {}
+
+    def save_state(self, datasets: dict):
+        """Grava o estado (escrita atómica)"""
+        self.write_json(self.state_file, {"version": ETL_STATE_VERSION, "datasets": datasets}, indent=None)
+
+    @staticmethod
+    def write_json(path: Path, document: dict, indent: Optional[int] = 2):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=indent)
+        os.replace(temp, path)
+
+    def transform(self, raw_name: str, previous: dict) -> Tuple[dict, dict, set]:
+        """Registos do raw com os itens transformados (reutilizados se o hash não mudou)
+
+        Devolve também os ids dos registos sem alterações desde a última execução.
+        """
+        _, _, iter_records, transform = RAW_DATASETS[raw_name]
+        with open(self.raw_dir / raw_name, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        reuse = previous.get("records", {}) if previous.get("fingerprint") == self.fingerprint else {}
+        records = {}
+        unchanged = set()
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0, "skipped": 0}
+        for record_id, location, record in iter_records(data):
+            digest = record_hash(location, record)
+            cached = reuse.get(record_id)
+            if cached and cached["hash"] == digest:
+                placements = cached["placements"]
+                unchanged.add(record_id)
+                counts["unchanged"] += 1
+            else:
+                placements = [[list(path), value] for path, value in transform(location, record)]
+                counts["changed" if record_id in reuse else "new"] += 1
+            if not placements:
+                counts["skipped"] += 1
+            records[record_id] = {"hash": digest, "placements": placements}
+        counts["removed"] = sum(1 for record_id in previous.get("records", {}) if record_id not in records)
+        return records, counts, unchanged
+
+    def merge(self, raw_name: str, document: dict, previous: dict, records: dict, skip: set = frozenset()) -> bool:
+        """Funde os itens no documento processado; devolve True se o documento mudou
+
+        Os registos em `skip` (sem alterações, com o documento igual ao da última escrita)
+        já estão fundidos e não voltam a ser procurados.
+        """
+        _, key_field, _, _ = RAW_DATASETS[raw_name]
+        derived = DERIVED_FIELDS.get(raw_name, ())
+        lists = {}
+        changed = False
+
+        def target(path: tuple, create: bool) -> Optional[TargetList]:
+            if path not in lists:
+                items = target_list(document, path, create)
+                if items is None:
+                    return None
+                lists[path] = TargetList(items, key_field)
+            return lists[path]
+
+        # Itens de registos removidos (ou que mudaram de lugar/chave) saem do documento
+        current = {
+            (tuple(path), item_key(value, key_field))
+            for record in records.values() for path, value in record["placements"]
+        }
+        emitted = {}
+        stale = {}
+        for record in previous.get("records", {}).values():
+            for path, value in record["placements"]:
+                placement = (tuple(path), item_key(value, key_field))
+                emitted[placement] = value
+                if placement not in current:
+                    stale.setdefault(placement[0], set()).add(placement[1])
+        for path, keys in stale.items():
+            items = target(path, create=False)
+            changed = (items is not None and items.retract(keys)) or changed
+
+        for record_id, record in records.items():
+            if record_id in skip:
+                continue
+            for path, value in record["placements"]:
+                placement = (tuple(path), item_key(value, key_field))
+                items = target(placement[0], create=True)
+                changed = items.upsert(value, emitted.get(placement), derived) or changed
+        return changed
+
+    def process(self, raw_name: str, previous: dict) -> Optional[dict]:
+        """ETL de um arquivo raw; devolve o novo estado desse arquivo (None se não foi processado)"""
+        processed_name = RAW_DATASETS[raw_name][0]
+        target = find_dataset(self.datasets_dir, processed_name)
+        if target is not None and target.is_dir():
+            print(f"⚠️  {processed_name}: em shards JSONL, o merge do raw só suporta o documento JSON (ignorado)")
+            return None
+
+        with self.metrics.stage(raw_name) as stage:
+            records, counts, unchanged = self.transform(raw_name, previous)
+            stage.items = len(records)
+
+            # Registos sem alterações só se saltam se o processado for o que o ETL escreveu
+            # (o generate pode tê-lo reescrito entretanto)
+            output = file_hash(target) if target is not None else None
+            skip = unchanged if output is not None and output == previous.get("output") else frozenset()
+
+            document = load_dataset(target) if target is not None else {"metadata": {}}
+            changed = self.merge(raw_name, document, previous, records, skip) or target is None
+
+            if changed:
+                metadata = document.setdefault("metadata", {})
+                if isinstance(metadata, dict):
+                    metadata["processed_at"] = datetime.now().isoformat()
+                    metadata["source"] = raw_name
+                path = self.datasets_dir / processed_name
+                self.write_json(path, document)
+                stage.bytes = path.stat().st_size
+                output = file_hash(path)
+                self.datasets[processed_name] = document
+                if processed_name == "skills_by_area.json":
+                    # A base colunar do generate deriva das skills
+                    write_columnar(document, self.datasets_dir / "columnar" / "skills", source=processed_name)
+
+        status = "atualizado" if changed else "sem alterações"
+        print(f"✅ {raw_name} → {processed_name} ({status}): {len(records)} registos "
+              f"({counts['new']} novos, {counts['changed']} alterados, {counts['removed']} removidos, "
+              f"{counts['unchanged']} reutilizados)")
+        if counts["skipped"]:
+            print(f"   ⚠️  {counts['skipped']} registos sem itens (estrutura inválida)")
+        return {"fingerprint": self.fingerprint, "output": output, "records": records}
+
+    def run(self) -> bool:
+        """Corre o ETL de todos os arquivos raw; devolve False se algum falhar"""
+        print("\n🔄 Raw → processed...")
+        print("="*60)
+        previous = self.load_state()
+        state = dict(previous)
+        success = True
+
+        for raw_name in RAW_DATASETS:
+            if not (self.raw_dir / raw_name).exists():
+                print(f"⏭️  {raw_name}: não encontrado em {self.raw_dir}")
+                continue
+            try:
+                result = self.process(raw_name, previous.get(raw_name, {}))
+            except (json.JSONDecodeError, OSError, ValueError) as e:
+                print(f"❌ {raw_name}: {e}")
+                success = False
+                continue
+            if result is not None:
+                state[raw_name] = result
+
+        self.save_state(state)
+        print("="*60)
+        return success
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Transforma os datasets raw nos processados (incremental)")
+    parser.add_argument("--raw-dir", type=Path, default=RAW_DATASETS_DIR, help="Pasta dos datasets raw")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Pasta dos datasets processados")
+    parser.add_argument("--state-file", type=Path, help=f"Estado do ETL (default: <datasets-dir>/../{STATE_FILENAME})")
+    parser.add_argument("--force", action="store_true", help="Ignora o estado e reprocessa todos os registos")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+    etl = RawETL(args.raw_dir, args.datasets_dir, args.state_file, force=args.force,
+                 metrics=Metrics("etl", trace_memory=args.tracemalloc))
+    success = run_with_metrics(etl.metrics, etl.run, args)
+    exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+🔗 CV Builder - Pipeline Runner
+Corre generate → etl → validate → export num só processo, como um DAG de etapas
+
+Cada etapa declara as etapas de que depende e a ordem vem de uma ordenação
+topológica; se uma etapa falha, as que dependem dela não correm. Os
+datasets gerados (ou lidos inteiros pela validação) passam às etapas
+seguintes em memória, sem voltar a ler e fazer parse do disco. A etapa etl
+(raw_etl.py) funde os registos de datasets/raw/ nos datasets escritos pelo
+generate, reprocessando só os registos novos ou alterados.
+
+Cache por etapa (datasets/.pipeline_cache.json): a chave é o SHA-256 da
+configuração da etapa, do código-fonte dos módulos que ela importa (e dos
+schemas de que os validadores são compilados) e dos arquivos de entrada
+(datasets, datasets raw, keywords ATS). Se a chave não mudou e os outputs registados
+continuam no disco, a etapa é saltada. Só as execuções
+com sucesso ficam em cache; --force reexecuta tudo.
+
+As pastas são configuráveis e, por omissão, relativas a ml_engine/ (não ao
+CWD), por isso o runner funciona a partir de qualquer pasta.
+
+Uso:
+    python scripts/run_pipeline.py
+    python scripts/run_pipeline.py --stages validate export --mode json-parse --compress gzip
+    python scripts/run_pipeline.py --datasets-dir /tmp/datasets --backend-dir /tmp/data --force
+    python scripts/run_pipeline.py --stages etl validate --raw-dir /tmp/raw
+    python scripts/run_pipeline.py --parametric 100000 --workers 4 --metrics-out metrics/pipeline.prom
+"""
+
+import os
+import ast
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from graphlib import TopologicalSorter
+from typing import Dict, List, Optional
+
+from dataset_io import (
+    ATS_KEYWORDS_DIR, BACKEND_DATA_DIR, DATASETS_DIR, INDEX_FILENAME, RAW_DATASETS_DIR, find_dataset,
+    iter_sharded_datasets
+)
+from generate_datasets import CVDatasetGenerator
+from raw_etl import RAW_DATASETS, STATE_FILENAME as ETL_STATE_FILENAME, RawETL
+from validate_datasets import DatasetValidator
+from export_to_backend import EXPORT_MODES, MANIFEST_FILENAME, BackendExporter
+from near_duplicates import DEFAULT_THRESHOLD
+from metrics import Metrics, add_metrics_arguments, run_with_metrics
+from schema_compiler import SCHEMAS_DIR
+
+CACHE_VERSION = 1
+CACHE_FILENAME = ".pipeline_cache.json"
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Etapa: (dependências, módulo com o código da etapa)
+PIPELINE_STAGES = {
+    "generate": ((), "generate_datasets"),
+    "etl": (("generate",), "raw_etl"),
+    "validate": (("generate", "etl"), "validate_datasets"),
+    "export": (("generate", "etl", "validate"), "export_to_backend")
+}
+
+# O etl reescreve datasets do generate: depois de correr, a entrada do generate na
+# cache passa a registar esses outputs já com o merge (senão o generate voltaria a correr)
+STAGE_REWRITES = {"etl": ("generate",)}
+
+# Datasets escritos pelo CVDatasetGenerator (outputs verificados antes de usar a cache)
+GENERATED_DATASETS = ["text_improvement.json", "skills_by_area.json", "ats_keywords.json"]
+
+def source_files(module: str) -> List[Path]:
+    """Módulo e todos os módulos de scripts/ que ele importa (transitivamente)"""
+    seen = []
+    pending = [module]
+    while pending:
+        path = SCRIPTS_DIR / f"{pending.pop()}.py"
+        if path in seen or not path.exists():
+            continue
+        seen.append(path)
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                pending.append(node.module)
+            elif isinstance(node, ast.Import):
+                pending.extend(alias.name for alias in node.names)
+    if SCRIPTS_DIR / "schema_compiler.py" in seen:
+        # Os validadores são gerados a partir dos schemas: mudar um schema muda o código
+        seen.extend(SCHEMAS_DIR.glob("*.schema.json"))
+    return sorted(seen)
+
+class PipelineRunner:
+    def __init__(self, datasets_dir: Path = None, backend_dir: Path = None, ats_dir: Path = None,
+                 raw_dir: Path = None, cache_file: Path = None, stages: List[str] = None, force: bool = False,
+                 generate_options: dict = None, validate_options: dict = None, export_options: dict = None,
+                 metrics: Metrics = None):
+        """
+        Args:
+            datasets_dir: pasta dos datasets processados
+            backend_dir: pasta dos módulos JS do backend
+            ats_dir: keywords ATS por indústria (geração paramétrica)
+            raw_dir: datasets raw (etapa etl)
+            cache_file: cache das etapas (default: <datasets_dir>/../.pipeline_cache.json)
+            stages: etapas a correr (default: todas)
+            force: ignora a cache (e o manifest do export) e reexecuta as etapas
+            generate_options / validate_options / export_options: argumentos de cada etapa
+            metrics: registo de tempos/memória; as etapas ficam como pipeline/<etapa>/...
+        """
+        self.datasets_dir = Path(datasets_dir or DATASETS_DIR)
+        self.backend_dir = Path(backend_dir or BACKEND_DATA_DIR)
+        self.ats_dir = Path(ats_dir or ATS_KEYWORDS_DIR)
+        self.raw_dir = Path(raw_dir or RAW_DATASETS_DIR)
+        self.cache_file = Path(cache_file or self.datasets_dir.parent / CACHE_FILENAME)
+        self.stages = list(stages or PIPELINE_STAGES)
+        self.force = force
+        self.options = {
+            "generate": generate_options or {},
+            "etl": {},
+            "validate": validate_options or {},
+            "export": export_options or {}
+        }
+        self.metrics = metrics or Metrics("pipeline")
+
+        for stage in self.stages:
+            if stage not in PIPELINE_STAGES:
+                raise ValueError(f"Unknown pipeline stage '{stage}' (expected one of {', '.join(PIPELINE_STAGES)})")
+
+        # Documentos partilhados entre etapas ({nome do arquivo: dict})
+        self.datasets = {}
+        # Hashes já calculados nesta execução: {caminho: (mtime_ns, tamanho, sha256)}
+        self._hashes = {}
+
+    def hash_file(self, path: Path) -> str:
+        """SHA-256 de um arquivo, reaproveitado enquanto o mtime/tamanho não mudarem"""
+        stat = path.stat()
+        cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = BackendExporter.hash_file(path)
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def hash_dataset(self, filename: str) -> Optional[str]:
+        """Hash de um dataset (documento JSON ou index.json dos shards, que tem o sha256 de cada shard)"""
+        path = find_dataset(self.datasets_dir, filename)
+        if path is None:
+            return None
+        return self.hash_file(path / INDEX_FILENAME if path.is_dir() else path)
+
+    def dataset_hashes(self) -> Dict[str, Optional[str]]:
+        """Hashes de todos os datasets processados (os mesmos arquivos que o export lê)"""
+        if not self.datasets_dir.exists():
+            return {}
+        names = {path.name for path in self.datasets_dir.glob("*.json")}
+        names.update(f"{path.name}.json" for path in iter_sharded_datasets(self.datasets_dir))
+        return {name: self.hash_dataset(name) for name in sorted(names)}
+
+    def stage_inputs(self, stage: str) -> dict:
+        """Arquivos de que a etapa depende, além do código e da configuração"""
+        if stage == "generate":
+            # Só a geração paramétrica lê o vocabulário das keywords ATS
+            if not self.options["generate"].get("parametric"):
+                return {}
+            return {path.name: self.hash_file(path) for path in sorted(self.ats_dir.glob("*.json"))}
+        if stage == "etl":
+            return {name: self.hash_file(self.raw_dir / name) for name in RAW_DATASETS if (self.raw_dir / name).exists()}
+        return self.dataset_hashes()
+
+    def stage_outputs(self, stage: str) -> Optional[dict]:
+        """Estado atual dos outputs da etapa (None se faltar algum)"""
+        if stage == "generate":
+            outputs = {name: self.hash_dataset(name) for name in GENERATED_DATASETS}
+            columnar_meta = self.datasets_dir / "columnar" / "skills" / "meta.json"
+            outputs["columnar"] = self.hash_file(columnar_meta) if columnar_meta.exists() else None
+        elif stage == "etl":
+            state_file = self.datasets_dir.parent / ETL_STATE_FILENAME
+            outputs = {
+                processed_name: self.hash_dataset(processed_name)
+                for raw_name, (processed_name, *_) in RAW_DATASETS.items() if (self.raw_dir / raw_name).exists()
+            }
+            outputs[ETL_STATE_FILENAME] = self.hash_file(state_file) if state_file.exists() else None
+        elif stage == "export":
+            manifest_path = self.backend_dir / MANIFEST_FILENAME
+            if not manifest_path.exists():
+                return None
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            written = [name for entry in manifest.get("files", {}).values() for name in entry.get("outputs", [])]
+            if not all((self.backend_dir / name).exists() for name in written + ["index.js"]):
+                return None
+            outputs = {MANIFEST_FILENAME: self.hash_file(manifest_path)}
+        else:
+            outputs = {}
+        return None if None in outputs.values() else outputs
+
+    def stage_key(self, stage: str) -> str:
+        """Chave de cache: configuração + código-fonte + arquivos de entrada"""
+        _, module = PIPELINE_STAGES[stage]
+        key = {
+            "version": CACHE_VERSION,
+            "stage": stage,
+            # O nº de processos não muda o resultado (a geração paramétrica é determinística)
+            "options": {name: value for name, value in self.options[stage].items() if name != "workers"},
+            "paths": [str(self.datasets_dir.resolve()), str(self.backend_dir.resolve()), str(self.raw_dir.resolve())],
+            "sources": {path.name: self.hash_file(path) for path in source_files(module)},
+            "inputs": self.stage_inputs(stage)
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=list).encode()).hexdigest()
+
+    def load_cache(self) -> dict:
+        """Cache da última execução ({etapa: {key, outputs, finished_at}})"""
+        if self.force or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return cache.get("stages", {}) if cache.get("version") == CACHE_VERSION else {}
+
+    def save_cache(self, stages: dict):
+        """Grava a cache (escrita atómica)"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.cache_file.with_name(f".{self.cache_file.name}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "stages": stages}, f, ensure_ascii=False, indent=2)
+        os.replace(temp, self.cache_file)
+
+    def run_stage(self, stage: str) -> bool:
+        """Corre uma etapa, partilhando os datasets em memória com as seguintes"""
+        options = self.options[stage]
+        if stage == "generate":
+            generator = CVDatasetGenerator(self.datasets_dir, metrics=self.metrics, ats_dir=self.ats_dir, **options)
+            generator.save_all_datasets()
+            self.datasets.update(generator.datasets)
+            return True
+        if stage == "etl":
+            etl = RawETL(self.raw_dir, self.datasets_dir, force=self.force, metrics=self.metrics, datasets=self.datasets)
+            return etl.run()
+        if stage == "validate":
+            validator = DatasetValidator(datasets_dir=self.datasets_dir, metrics=self.metrics,
+                                         datasets=self.datasets, **options)
+            return validator.validate_all()
+        exporter = BackendExporter(force=self.force, datasets_dir=self.datasets_dir, backend_dir=self.backend_dir,
+                                   metrics=self.metrics, datasets=self.datasets, **options)
+        return exporter.export_all()
+
+    def run(self) -> bool:
+        """Corre as etapas pedidas pela ordem do DAG; devolve False se alguma falhar"""
+        print("\n" + "="*70)
+        print("🔗 CV Builder - Pipeline")
+        print("="*70)
+        print(f"📂 Datasets: {self.datasets_dir.absolute()}")
+        print(f"📁 Backend: {self.backend_dir.absolute()}")
+        print(f"🗂️  Cache: {self.cache_file.absolute()}" + (" (--force: ignorada)" if self.force else ""))
+
+        graph = {stage: [dep for dep in PIPELINE_STAGES[stage][0] if dep in self.stages] for stage in self.stages}
+        order = list(TopologicalSorter(graph).static_order())
+        print(f"🧭 Etapas: {' → '.join(order)}")
+
+        previous = self.load_cache()
+        cache = dict(previous)
+        results = {}
+
+        for stage in order:
+            failed = [dep for dep in graph[stage] if results[dep] in ("failed", "blocked")]
+            if failed:
+                print(f"\n⛔ {stage}: não executada ({', '.join(failed)} falhou)")
+                results[stage] = "blocked"
+                continue
+
+            key = self.stage_key(stage)
+            entry = previous.get(stage)
+            if entry and entry.get("key") == key and entry.get("outputs") == self.stage_outputs(stage):
+                print(f"\n⏭️  {stage}: sem alterações desde {entry.get('finished_at', '?')} (cache)")
+                results[stage] = "cached"
+                continue
+
+            with self.metrics.stage(stage):
+                success = self.run_stage(stage)
+
+            if success is False:
+                results[stage] = "failed"
+                cache.pop(stage, None)
+            else:
+                results[stage] = "ok"
+                cache[stage] = {
+                    "key": key,
+                    "outputs": self.stage_outputs(stage),
+                    "finished_at": datetime.now().isoformat(timespec="seconds")
+                }
+                for rewritten in STAGE_REWRITES.get(stage, ()):
+                    if rewritten in cache:
+                        cache[rewritten]["outputs"] = self.stage_outputs(rewritten)
+            self.save_cache(cache)
+
+        icons = {"ok": "✅", "cached": "⏭️ ", "failed": "❌", "blocked": "⛔"}
+        print("\n" + "="*70)
+        print("🔗 Resumo do pipeline:")
+        for stage in order:
+            print(f"   {icons[results[stage]]} {stage}: {results[stage]}")
+        print("="*70)
+
+        return all(result in ("ok", "cached") for result in results.values())
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Corre generate → etl → validate → export num só processo, com cache por etapa")
+    parser.add_argument("--stages", nargs="+", choices=list(PIPELINE_STAGES), default=list(PIPELINE_STAGES),
+                        help="Etapas a correr (default: todas, pela ordem do DAG)")
+    parser.add_argument("--force", action="store_true", help="Ignora a cache e reexecuta as etapas pedidas")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Pasta dos datasets processados")
+    parser.add_argument("--backend-dir", type=Path, default=BACKEND_DATA_DIR, help="Pasta dos módulos do backend")
+    parser.add_argument("--ats-dir", type=Path, default=ATS_KEYWORDS_DIR, help="Keywords ATS por indústria")
+    parser.add_argument("--raw-dir", type=Path, default=RAW_DATASETS_DIR, help="Datasets raw (etapa etl)")
+    parser.add_argument("--cache-file", type=Path, help=f"Cache das etapas (default: <datasets-dir>/../{CACHE_FILENAME})")
+
+    generate = parser.add_argument_group("generate")
+    generate.add_argument("--parametric", type=int, default=0, help="Nº de exemplos paramétricos (0 = só os base)")
+    generate.add_argument("--seed", type=int, default=42, help="Seed da geração paramétrica")
+    generate.add_argument("--format", choices=["json", "jsonl"], default="json", help="Formato de text_improvement")
+    generate.add_argument("--shard-size", type=int, default=50000, help="Exemplos por shard JSONL")
+    generate.add_argument("--compress-shards", action="store_true", help="Comprimir os shards JSONL com gzip")
+
+    validate = parser.add_argument_group("validate")
+    validate.add_argument("--stream", action="store_true", help="Validação em streaming (memória constante)")
+    validate.add_argument("--near-duplicates", type=float,
+                          help=f"Jaccard mínima dos quase duplicados (default: {DEFAULT_THRESHOLD}, "
+                               f"desligado com --stream; 0 = desligado)")
+
+    export = parser.add_argument_group("export")
+    export.add_argument("--mode", choices=EXPORT_MODES, default="pretty", help="Formato dos módulos JS")
+    export.add_argument("--compress", nargs="+", choices=["gzip", "brotli"], default=[],
+                        help="Irmãos pré-comprimidos dos módulos")
+    export.add_argument("--chunked", action="store_true", help="Chunks por área/role lidos no 1º acesso")
+
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processos da geração paramétrica e da validação (0 = todos os cores)")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    runner = PipelineRunner(
+        datasets_dir=args.datasets_dir,
+        backend_dir=args.backend_dir,
+        ats_dir=args.ats_dir,
+        raw_dir=args.raw_dir,
+        cache_file=args.cache_file,
+        stages=args.stages,
+        force=args.force,
+        generate_options={
+            "parametric": args.parametric,
+            "workers": workers,
+            "seed": args.seed,
+            "output_format": args.format,
+            "shard_size": args.shard_size,
+            "compress": args.compress_shards
+        },
+        validate_options={
+            "streaming": args.stream,
+            "workers": workers,
+            "near_duplicate_threshold": args.near_duplicates
+        },
+        export_options={
+            "mode": args.mode,
+            "compress": tuple(args.compress),
+            "chunked": args.chunked
+        },
+        metrics=Metrics("pipeline", trace_memory=args.tracemalloc)
+    )
+    success = run_with_metrics(runner.metrics, runner.run, args)
+    exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+⚙️ CV Builder - Schema Compiler
+Compila os JSON Schemas dos datasets (ml_engine/schemas/) em funções Python
+
+Os schemas descrevem cada dataset processado de forma declarativa (JSON
+Schema 2020-12). Só as definições de cada item ($defs: exemplo de texto,
+skill, lista de keywords) são compiladas, uma vez, ao importar o validador,
+numa função Python gerada só para esse schema: os tipos, campos e limites
+ficam como constantes no código, sem interpretar o schema a cada documento.
+Cada violação é registada como diagnóstico com código (diagnostics.py).
+
+O nível do documento (metadata, secções, áreas/categorias) é verificado
+pelo próprio validador, também em streaming, e no schema é só descritivo:
+aceita apenas type, required, properties e anotações; outras keywords
+(ex: additionalProperties, anyOf, $ref) dão erro, por nunca serem aplicadas.
+
+Keywords suportadas nas definições: type, required, properties, items,
+minLength, minItems, minimum, maximum, enum, pattern. Extensões (avisos e
+estatísticas):
+- x-warnBelow + x-label: aviso 'low_score' abaixo do valor
+- x-warnMinItems: aviso 'empty_list' / 'few_items' com menos itens
+- x-recommended: aviso 'missing_recommended' para campos em falta
+- x-notBlank: erro 'empty_field' para strings só com espaços
+- x-severity: 'warning' + x-format: pattern como aviso, com o formato esperado na mensagem
+- x-collect: a função devolve o valor (se válido), pela ordem do schema
+
+Uso:
+    validate_skill = compile_definition("skills_by_area", "skill")
+    priority, demand_score = validate_skill(skill, "React", "skill", diagnostics.add)
+
+    python scripts/schema_compiler.py --show skills_by_area skill   # código gerado
+    python scripts/schema_compiler.py --benchmark 30000             # compilado vs escrito à mão vs jsonschema
+"""
+
+import re
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, List
+
+try:
+    import jsonschema
+except ImportError:  # Só para verificar os schemas e para o benchmark
+    jsonschema = None
+
+from dataset_io import DATASETS_DIR, ML_ENGINE_DIR
+
+SCHEMAS_DIR = ML_ENGINE_DIR / "schemas"
+
+# Definição compilada para cada dataset: (dataset, definição em $defs)
+DATASET_DEFINITIONS = [
+    ("text_improvement", "example"),
+    ("skills_by_area", "skill"),
+    ("ats_keywords", "keywords")
+]
+
+# Tipos exatos do json.load (sem subclasses): type(v) is ... é mais rápido que isinstance e exclui bool de number
+TYPE_CHECKS = {
+    'object': "type({v}) is dict",
+    'array': "type({v}) is list",
+    'string': "type({v}) is str",
+    'number': "type({v}) in _NUMBER",
+    'integer': "type({v}) is int",
+    'boolean': "type({v}) is bool",
+    'null': "{v} is None"
+}
+
+TYPE_NAMES = {
+    'object': "an object",
+    'array': "a list",
+    'string': "a string",
+    'number': "a number",
+    'integer': "an integer",
+    'boolean': "a boolean",
+    'null': "null"
+}
+
+ANNOTATIONS = {'title', 'description', '$comment', '$schema', '$id', '$defs', 'default', 'examples'}
+KEYWORDS = {
+    'type', 'required', 'properties', 'items', 'minLength', 'minItems', 'minimum', 'maximum', 'enum', 'pattern',
+    'x-warnBelow', 'x-label', 'x-warnMinItems', 'x-recommended', 'x-notBlank', 'x-severity', 'x-format', 'x-collect'
+}
+
+# Nível do documento: só descritivo (a estrutura é verificada pelo validate_datasets.py)
+DOCUMENT_KEYWORDS = {'type', 'required', 'properties'}
+
+class _Missing:
+    """Marca de campo ausente (distingue de um campo com valor null)"""
+    def __repr__(self):
+        return "<missing>"
+
+_MISSING = _Missing()
+
+class _Generator:
+    """Gera o código-fonte de uma função de validação a partir de um schema"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lines: List[str] = []
+        self.constants = {'_MISSING': _MISSING, '_NUMBER': (int, float)}
+        self.collected: List[str] = []
+        self.counter = 0
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, prefix: str, value) -> str:
+        name = f"_{prefix.upper()}{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def add(self, code: str, field: str, **params) -> str:
+        """Chamada a add(...) com os parâmetros já como expressões Python"""
+        args = "".join(f", {name}={value}" for name, value in params.items())
+        return f"add({code!r}, ref=ref, field={field}{args})"
+
+    def value(self, schema: dict, v: str, field: str, indent: int):
+        """Código que valida o valor na variável `v`; `field` é a expressão com o nome do campo"""
+        unknown = set(schema) - KEYWORDS - ANNOTATIONS
+        if unknown:
+            raise ValueError(f"Unsupported schema keywords in '{self.name}': {', '.join(sorted(unknown))}")
+
+        # Erros: o primeiro que falhar impede os seguintes (ex: não comparar um número que é string)
+        checks = []
+        types = schema.get('type')
+        if types:
+            types = [types] if isinstance(types, str) else types
+            condition = " or ".join(TYPE_CHECKS[t].format(v=v) for t in types)
+            expected = " or ".join(TYPE_NAMES[t] for t in types)
+            checks.append((f"not ({condition})",
+                           self.add('wrong_type', field, expected=repr(expected), actual=f"type({v}).__name__")))
+        if 'minLength' in schema or 'minItems' in schema:
+            minimum = schema.get('minLength', schema.get('minItems'))
+            if minimum == 1:
+                checks.append((f"not {v}", self.add('empty_field', field)))
+            else:
+                checks.append((f"len({v}) < {minimum}",
+                               self.add('too_short', field, count=f"len({v})", minimum=repr(minimum))))
+        if schema.get('x-notBlank'):
+            checks.append((f"not {v}.strip()", self.add('empty_field', field)))
+        if 'enum' in schema:
+            allowed = self.constant('enum', tuple(schema['enum']))
+            checks.append((f"{v} not in {allowed}",
+                           self.add('invalid_enum', field, value=v, allowed=repr(list(schema['enum'])))))
+        if 'minimum' in schema or 'maximum' in schema:
+            bounds = []
+            if 'minimum' in schema:
+                bounds.append(f"{v} < {schema['minimum']!r}")
+            if 'maximum' in schema:
+                bounds.append(f"{v} > {schema['maximum']!r}")
+            checks.append((" or ".join(bounds),
+                           self.add('out_of_range', field, value=v, minimum=repr(schema.get('minimum')),
+                                    maximum=repr(schema.get('maximum')))))
+        pattern_check = None
+        if 'pattern' in schema:
+            regex = self.constant('pattern', re.compile(schema['pattern']))
+            severity = schema.get('x-severity', 'error')
+            pattern_check = (f"{regex}.search({v}) is None",
+                             self.add('format_mismatch' if severity == 'error' else 'unexpected_format', field,
+                                      value=v, format=repr(schema.get('x-format', schema['pattern']))))
+            if severity == 'error':
+                checks.append(pattern_check)
+                pattern_check = None
+
+        for position, (condition, action) in enumerate(checks):
+            self.emit(indent, f"{'if' if position == 0 else 'elif'} {condition}:")
+            self.emit(indent + 1, action)
+
+        # Valor válido: estatísticas, avisos e filhos
+        body = len(self.lines)
+        body_indent = indent + 1 if checks else indent
+        if checks:
+            self.emit(indent, "else:")
+        self.valid_value(schema, v, field, body_indent, pattern_check)
+        if checks and len(self.lines) == body + 1:
+            self.lines.pop()
+
+    def valid_value(self, schema: dict, v: str, field: str, indent: int, pattern_check):
+        if schema.get('x-collect'):
+            collected = self.var("collected")
+            self.collected.append(collected)
+            self.emit(indent, f"{collected} = {v}")
+        if 'x-warnBelow' in schema:
+            self.emit(indent, f"if {v} < {schema['x-warnBelow']!r}:")
+            self.emit(indent + 1, self.add('low_score', field, score=repr(schema.get('x-label', '')), value=v))
+        if 'x-warnMinItems' in schema:
+            minimum = schema['x-warnMinItems']
+            branch = "if"
+            if not schema.get('minItems'):
+                # Com minItems a lista vazia já é um erro
+                self.emit(indent, f"if not {v}:")
+                self.emit(indent + 1, self.add('empty_list', field))
+                branch = "elif"
+            if minimum > 1:
+                self.emit(indent, f"{branch} len({v}) < {minimum}:")
+                self.emit(indent + 1, self.add('few_items', field, count=f"len({v})", minimum=repr(minimum)))
+        if pattern_check:
+            self.emit(indent, f"if {pattern_check[0]}:")
+            self.emit(indent + 1, pattern_check[1])
+
+        # Campos em falta: 'required' é erro, 'x-recommended' é aviso
+        missing = {name: 'missing_recommended' for name in schema.get('x-recommended', [])}
+        missing.update({name: 'missing_field' for name in schema.get('required', [])})
+        properties = schema.get('properties', {})
+        for name, code in missing.items():
+            if name not in properties:
+                self.emit(indent, f"if {name!r} not in {v}:")
+                self.emit(indent + 1, self.add(code, repr(name)))
+        for name, child in properties.items():
+            # Um só lookup por campo: ausente -> diagnóstico de falta, presente -> verificações do schema
+            child_var = self.var("v")
+            self.emit(indent, f"{child_var} = {v}.get({name!r}, _MISSING)")
+            start = len(self.lines)
+            if name in missing:
+                self.emit(indent, f"if {child_var} is _MISSING:")
+                self.emit(indent + 1, self.add(missing[name], repr(name)))
+                self.emit(indent, "else:")
+            else:
+                self.emit(indent, f"if {child_var} is not _MISSING:")
+            checks = len(self.lines)
+            self.value(child, child_var, repr(name), indent + 1)
+            if len(self.lines) == checks:
+                # Propriedade sem verificações (só documentação)
+                del self.lines[checks - 1:]
+                if name not in missing:
+                    del self.lines[start - 1:]
+
+        if 'items' in schema:
+            index, item = self.var("i"), self.var("item")
+            self.emit(indent, f"for {index}, {item} in enumerate({v}):")
+            self.value(schema['items'], item, f"{field} + '[' + str({index}) + ']'", indent + 1)
+
+    def build(self, schema: dict) -> str:
+        self.value(schema, "value", "field", 1)
+        body = self.lines
+        self.lines = []
+        self.emit(0, f"def validate_{self.name}(value, ref, field, add):")
+        for collected in self.collected:
+            self.emit(1, f"{collected} = None")
+        self.lines.extend(body)
+        self.emit(1, f"return ({''.join(f'{c}, ' for c in self.collected)})")
+        return "\n".join(self.lines) + "\n"
+
+def compile_schema(schema: dict, name: str) -> Callable:
+    """Gera e compila a função validate_<name>(value, ref, field, add) -> valores de x-collect"""
+    generator = _Generator(re.sub(r'\W', '_', name))
+    source = generator.build(schema)
+    namespace = dict(generator.constants)
+    exec(compile(source, f"<schema {name}>", "exec"), namespace)
+    validate = namespace[f"validate_{generator.name}"]
+    validate.source = source
+    return validate
+
+def check_document(schema: dict, name: str):
+    """O nível do documento não é compilado: recusa keywords que pareceriam aplicadas"""
+    unknown = set(schema) - DOCUMENT_KEYWORDS - ANNOTATIONS
+    if unknown:
+        raise ValueError(f"Unsupported document-level keywords in '{name}': {', '.join(sorted(unknown))} "
+                         f"(only $defs are compiled)")
+    for child in schema.get('properties', {}).values():
+        check_document(child, name)
+
+def load_schema(dataset: str) -> dict:
+    """Schema de um dataset (verificado contra o meta-schema, se o jsonschema estiver instalado)"""
+    with open(SCHEMAS_DIR / f"{dataset}.schema.json", "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    if jsonschema is not None:
+        jsonschema.Draft202012Validator.check_schema(schema)
+    check_document(schema, dataset)
+    return schema
+
+def compile_definition(dataset: str, definition: str) -> Callable:
+    """Compila uma definição ($defs) do schema de um dataset"""
+    schema = load_schema(dataset)
+    if definition not in schema.get('$defs', {}):
+        raise KeyError(f"Schema '{dataset}' has no definition '{definition}'")
+    return compile_schema(schema['$defs'][definition], definition)
+
+def _handwritten_example(example: dict, ref: str, field: str, add: Callable) -> tuple:
+    """Baseline do benchmark: verificações de um exemplo escritas à mão (antes dos schemas)"""
+    ats_score = None
+    quality_score = None
+
+    for name in ['original', 'improved', 'keywords']:
+        if name not in example:
+            add('missing_field', ref=ref, field=name)
+        elif not example[name]:
+            add('empty_field', ref=ref, field=name)
+
+    if 'keywords' in example:
+        if not isinstance(example['keywords'], list):
+            add('wrong_type', ref=ref, field='keywords', expected='a list', actual=type(example['keywords']).__name__)
+        elif 0 < len(example['keywords']) < 3:
+            add('few_items', ref=ref, field='keywords', count=len(example['keywords']), minimum=3)
+
+    for name in ('ats_score', 'quality_score'):
+        if name in example:
+            score = example[name]
+            if not isinstance(score, (int, float)) or isinstance(score, bool):
+                add('wrong_type', ref=ref, field=name, expected='a number', actual=type(score).__name__)
+            elif not (0 <= score <= 100):
+                add('out_of_range', ref=ref, field=name, value=score, minimum=0, maximum=100)
+            elif name == 'ats_score':
+                ats_score = score
+                if score < 70:
+                    add('low_score', ref=ref, field=name, score='ATS', value=score)
+            else:
+                quality_score = score
+
+    if 'improvements' in example and not isinstance(example['improvements'], list):
+        add('wrong_type', ref=ref, field='improvements', expected='a list',
+            actual=type(example['improvements']).__name__)
+
+    return ats_score, quality_score
+
+def _handwritten_skill(skill: dict, ref: str, field: str, add: Callable) -> tuple:
+    """Baseline do benchmark: verificações de uma skill escritas à mão (antes dos schemas)"""
+    priority = None
+    demand_score = None
+
+    for name in ['name', 'priority', 'demand_score']:
+        if name not in skill:
+            add('missing_field', ref=ref, field=name)
+        elif skill[name] is None or skill[name] == '':
+            add('empty_field', ref=ref, field=name)
+
+    if 'priority' in skill:
+        if skill['priority'] not in ['high', 'medium', 'low']:
+            add('invalid_enum', ref=ref, field='priority', value=skill['priority'], allowed=['high', 'medium', 'low'])
+        else:
+            priority = skill['priority']
+
+    if 'demand_score' in skill:
+        score = skill['demand_score']
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            add('wrong_type', ref=ref, field='demand_score', expected='a number', actual=type(score).__name__)
+        elif not (0 <= score <= 100):
+            add('out_of_range', ref=ref, field='demand_score', value=score, minimum=0, maximum=100)
+        else:
+            demand_score = score
+            if score < 50:
+                add('low_score', ref=ref, field='demand_score', score='demand', value=score)
+
+    if 'salary_impact' in skill:
+        impact = skill['salary_impact']
+        if not isinstance(impact, str):
+            add('wrong_type', ref=ref, field='salary_impact', expected='a string', actual=type(impact).__name__)
+        elif not impact.startswith('+') or not impact.endswith('%'):
+            add('unexpected_format', ref=ref, field='salary_impact', value=impact, format='+X%')
+
+    if 'related_skills' in skill:
+        if not isinstance(skill['related_skills'], list):
+            add('wrong_type', ref=ref, field='related_skills', expected='a list',
+                actual=type(skill['related_skills']).__name__)
+        elif len(skill['related_skills']) == 0:
+            add('empty_list', ref=ref, field='related_skills')
+
+    if 'category' not in skill:
+        add('missing_recommended', ref=ref, field='category')
+
+    return priority, demand_score
+
+def _handwritten_keywords(keywords: list, ref: str, field: str, add: Callable) -> tuple:
+    """Baseline do benchmark: verificações de uma lista de keywords escritas à mão (antes dos schemas)"""
+    if not isinstance(keywords, list):
+        add('wrong_type', ref=ref, field=field, expected='a list', actual=type(keywords).__name__)
+        return ()
+    if len(keywords) == 0:
+        add('empty_list', ref=ref, field=field)
+    elif len(keywords) < 5:
+        add('few_items', ref=ref, field=field, count=len(keywords), minimum=5)
+    for idx, keyword in enumerate(keywords):
+        if not isinstance(keyword, str):
+            add('wrong_type', ref=ref, field=f'{field}[{idx}]', expected='a string', actual=type(keyword).__name__)
+        elif not keyword.strip():
+            add('empty_field', ref=ref, field=f'{field}[{idx}]')
+    return ()
+
+# Loops escritos à mão que as funções compiladas substituíram (baseline do benchmark)
+HANDWRITTEN = {
+    "example": _handwritten_example,
+    "skill": _handwritten_skill,
+    "keywords": _handwritten_keywords
+}
+
+def _rate(validate: Callable, items: list) -> float:
+    """Itens/s de uma função de validação (value, ref, field, add)"""
+    from diagnostics import Diagnostics
+
+    diagnostics = Diagnostics()
+    start = time.perf_counter()
+    for value, ref, field in items:
+        validate(value, ref, field, diagnostics.add)
+    return len(items) / (time.perf_counter() - start)
+
+def _sample_items(dataset: str, definition: str, datasets_dir: Path) -> list:
+    """Itens reais de um dataset para o benchmark: (valor, ref, campo)"""
+    path = datasets_dir / f"{dataset}.json"
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = []
+    if definition == "example":
+        for section, examples in data.get("by_section", {}).items():
+            items.extend((example, example.get('id', section), "example") for example in examples)
+        return items
+
+    def walk(node: dict, path: str):
+        for key, value in node.items():
+            if key == 'metadata':
+                continue
+            if isinstance(value, dict):
+                walk(value, f"{path}.{key}" if path else key)
+            elif isinstance(value, list) and definition == "keywords":
+                items.append((value, path, key))
+            elif isinstance(value, list):
+                items.extend((skill, skill.get('name', key), "skill") for skill in value if isinstance(skill, dict))
+
+    walk(data, "")
+    return items
+
+def benchmark(count: int, datasets_dir: Path):
+    """Itens/s do validador compilado vs. loops escritos à mão e jsonschema, por definição"""
+    print(f"\n⏱️  Schemas compilados vs. escritos à mão vs. jsonschema ({count:,} itens por definição)")
+    print("-"*70)
+    for dataset, definition in DATASET_DEFINITIONS:
+        items = _sample_items(dataset, definition, datasets_dir)
+        if not items:
+            print(f"   ⚠️  {dataset}: sem itens em {datasets_dir}")
+            continue
+        items = (items * (count // len(items) + 1))[:count]
+
+        compiled = _rate(compile_definition(dataset, definition), items)
+        handwritten = _rate(HANDWRITTEN[definition], items)
+
+        line = (f"   {dataset + '/' + definition:<32} compilado {compiled:>12,.0f} itens/s"
+                f"   à mão {handwritten:>10,.0f} itens/s ({compiled / handwritten:.2f}x)")
+        if jsonschema is not None:
+            interpreted = jsonschema.Draft202012Validator(load_schema(dataset)['$defs'][definition])
+            start = time.perf_counter()
+            for value, _, _ in items:
+                for _ in interpreted.iter_errors(value):
+                    pass
+            rate = count / (time.perf_counter() - start)
+            line += f"   jsonschema {rate:>10,.0f} itens/s ({compiled / rate:.0f}x)"
+        print(line)
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Compila os schemas dos datasets em funções de validação")
+    parser.add_argument("--show", nargs=2, metavar=("DATASET", "DEFINITION"), help="Mostra o código gerado")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Mede itens/s com N itens por definição")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR, help="Datasets usados no benchmark")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.show:
+        print(compile_definition(*args.show).source)
+    if args.benchmark:
+        benchmark(args.benchmark, args.datasets_dir)
+    if not args.show and not args.benchmark:
+        for dataset, definition in DATASET_DEFINITIONS:
+            compile_definition(dataset, definition)
+            print(f"✅ {dataset}.schema.json → validate_{definition}")
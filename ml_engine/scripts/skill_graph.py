@@ -0,0 +1,230 @@
+"""
+🕸️ CV Builder - Skill Graph
+Recomendações de skills pré-calculadas a partir do grafo de related_skills
+
+O grafo é uma matriz de adjacência esparsa (CSR) com uma linha por skill:
+arestas related_skills com peso 1 e as arestas inversas com REVERSE_WEIGHT.
+Depois de normalizar as linhas, os scores multi-hop de todas as skills saem
+de uma só passagem vetorizada:
+
+    S = P + decay·P² + decay²·P³ + ...   (diagonal a zero)
+
+e cada coluna é ponderada pelo demand_score da skill recomendada. O export
+guarda apenas o top-k de cada skill, por isso "sugerir skills" no backend é
+um lookup e não uma travessia do grafo em cada pedido.
+
+Uso:
+    python scripts/skill_graph.py --skill React --skill Docker
+    python scripts/skill_graph.py --source datasets/processed/skills_by_area.json --enrich datasets/raw/skills_database_raw.json
+"""
+
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from dataset_io import DATASETS_DIR
+from skills_table import iter_skill_records
+
+DEFAULT_HOPS = 3
+DEFAULT_DECAY = 0.5
+DEFAULT_TOP_K = 10
+REVERSE_WEIGHT = 0.5   # "B é related de A" conta menos do que "A é related de B"
+DEMAND_WEIGHT = 0.5    # score final = propagação × (1 - w + w · demand/100)
+
+class SkillGraph:
+    """Grafo de related_skills (CSR) com scores de recomendação multi-hop"""
+
+    def __init__(self, names: List[str], demand: np.ndarray, adjacency: sparse.csr_matrix):
+        """
+        Args:
+            names: nome de cada nó (skill), único sem distinguir maiúsculas
+            demand: demand_score de cada nó (NaN se desconhecido)
+            adjacency: arestas diretas nó -> related_skill (pesos 1)
+        """
+        self.names = names
+        self.demand = demand
+        self.adjacency = adjacency
+        self.ids = {name.lower(): idx for idx, name in enumerate(names)}
+
+    @classmethod
+    def from_datasets(cls, *datasets: dict) -> "SkillGraph":
+        """Junta as skills (e respetivas related_skills) de vários datasets pelo nome
+
+        Skills só referidas em related_skills também são nós, sem demand_score.
+        """
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+        demand: Dict[int, float] = {}
+        edges = set()
+
+        def node(name: str) -> int:
+            key = name.lower()
+            if key not in ids:
+                ids[key] = len(names)
+                names.append(name)
+            return ids[key]
+
+        for data in datasets:
+            for _, _, skill in iter_skill_records(data):
+                name = skill.get('name')
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                source = node(name)
+                score = skill.get('demand_score')
+                if isinstance(score, (int, float)) and not isinstance(score, bool):
+                    demand.setdefault(source, float(score))
+
+                related = skill.get('related_skills')
+                for related_name in related if isinstance(related, list) else []:
+                    if isinstance(related_name, str) and related_name.strip():
+                        target = node(related_name)
+                        if target != source:
+                            edges.add((source, target))
+
+        n = len(names)
+        pairs = sorted(edges)
+        rows = np.array([source for source, _ in pairs], dtype=np.int64)
+        cols = np.array([target for _, target in pairs], dtype=np.int64)
+        adjacency = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+        demand_array = np.full(n, np.nan)
+        demand_array[list(demand)] = list(demand.values())
+        return cls(names, demand_array, adjacency)
+
+    def transition(self) -> sparse.csr_matrix:
+        """Adjacência simétrica ponderada com linhas normalizadas (soma 1)"""
+        weighted = self.adjacency.maximum(self.adjacency.T * REVERSE_WEIGHT).tocsr()
+        degree = np.asarray(weighted.sum(axis=1)).ravel()
+        degree[degree == 0] = 1.0
+        return (sparse.diags(1.0 / degree) @ weighted).tocsr()
+
+    def boost(self) -> np.ndarray:
+        """Peso de cada skill recomendada pelo demand_score (desconhecido = mediana)"""
+        known = self.demand[~np.isnan(self.demand)]
+        demand = np.nan_to_num(self.demand, nan=float(np.median(known)) if len(known) else 50.0)
+        return (1 - DEMAND_WEIGHT) + DEMAND_WEIGHT * np.clip(demand, 0, 100) / 100
+
+    def scores(self, hops: int = DEFAULT_HOPS, decay: float = DEFAULT_DECAY,
+               start: int = 0, end: Optional[int] = None,
+               transition: Optional[sparse.csr_matrix] = None) -> sparse.csr_matrix:
+        """Scores de recomendação das skills de origem start:end (todas por defeito)"""
+        transition = transition if transition is not None else self.transition()
+        end = transition.shape[0] if end is None else end
+        term = transition[start:end]
+        total = term.copy()
+        for _ in range(hops - 1):
+            term = (term @ transition) * decay
+            total = total + term
+
+        total = (total @ sparse.diags(self.boost())).tocoo()
+        # Uma skill não se recomenda a si própria
+        keep = (total.col != total.row + start) & (total.data > 0)
+        return sparse.csr_matrix(
+            (total.data[keep], (total.row[keep], total.col[keep])), shape=total.shape
+        )
+
+    def top_k(self, k: int = DEFAULT_TOP_K, hops: int = DEFAULT_HOPS, decay: float = DEFAULT_DECAY,
+              block_size: int = 4096) -> List[List[Tuple[int, float]]]:
+        """Top-k (nó, score) de cada skill, por score descendente e empates pelo id
+
+        As linhas são processadas em blocos: o fan-out multi-hop de grafos
+        grandes não cabe numa matriz completa, mas o top-k de cada bloco sim.
+        """
+        transition = self.transition()
+        table = []
+        for start in range(0, transition.shape[0], block_size):
+            block = self.scores(hops, decay, start, start + block_size, transition)
+            block.sort_indices()
+            block = block.tocoo()
+            # Ordenar por (linha, -score, coluna): duas ordenações estáveis sobre a
+            # ordem (linha, coluna) do CSR são mais rápidas do que um lexsort
+            order = np.argsort(-block.data, kind='stable')
+            order = order[np.argsort(block.row[order], kind='stable')]
+            rows = block.row[order]
+            first = np.searchsorted(rows, rows)
+            order = order[np.arange(len(order)) - first < k]
+
+            cols = block.col[order].tolist()
+            values = block.data[order].tolist()
+            counts = np.bincount(block.row[order], minlength=block.shape[0])
+            offset = 0
+            for count in counts.tolist():
+                table.append(list(zip(cols[offset:offset + count], values[offset:offset + count])))
+                offset += count
+        return table
+
+    def recommend(self, current_skills: List[str], limit: int = 10,
+                  table: Optional[List[List[Tuple[int, float]]]] = None) -> List[Tuple[str, float]]:
+        """Soma os top-k das skills atuais (mesma lógica do getRecommendedSkills em JS)"""
+        table = table if table is not None else self.top_k()
+        owned = {self.ids[name.lower()] for name in current_skills if name.lower() in self.ids}
+        totals: Dict[int, float] = {}
+        for source in owned:
+            for target, score in table[source]:
+                if target not in owned:
+                    totals[target] = totals.get(target, 0.0) + score
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.names[idx], score) for idx, score in ranked]
+
+    def to_export(self, k: int = DEFAULT_TOP_K, hops: int = DEFAULT_HOPS,
+                  decay: float = DEFAULT_DECAY, precision: int = 4) -> dict:
+        """Tabela para o módulo skill_recommendations.js: top[i] = [id, score, id, score, ...]"""
+        top = []
+        for row in self.top_k(k, hops, decay):
+            flat = []
+            for target, score in row:
+                flat.extend((target, round(score, precision)))
+            top.append(flat)
+
+        return {
+            'version': '1.0.0',
+            'hops': hops,
+            'decay': decay,
+            'top_k': k,
+            'skills': self.names,
+            'top': top
+        }
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Recomendações de skills a partir do grafo de related_skills")
+    parser.add_argument("--source", type=Path, default=DATASETS_DIR / "skills_by_area.json",
+                        help="Dataset de skills (default: datasets/processed/skills_by_area.json)")
+    parser.add_argument("--enrich", type=Path, default=None,
+                        help="Dataset extra cujas related_skills entram no grafo (ex: datasets/raw/skills_database_raw.json)")
+    parser.add_argument("--skill", action="append", default=[], help="Skill atual do utilizador (pode repetir)")
+    parser.add_argument("--limit", type=int, default=10, help="Número de recomendações (default: 10)")
+    parser.add_argument("--hops", type=int, default=DEFAULT_HOPS, help=f"Saltos no grafo (default: {DEFAULT_HOPS})")
+    parser.add_argument("--decay", type=float, default=DEFAULT_DECAY, help=f"Decaimento por salto (default: {DEFAULT_DECAY})")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    datasets = []
+    for path in [args.source, args.enrich]:
+        if path is None:
+            continue
+        if not path.exists():
+            print(f"❌ {path} não encontrado")
+            exit(1)
+        with open(path, "r", encoding="utf-8") as f:
+            datasets.append(json.load(f))
+
+    graph = SkillGraph.from_datasets(*datasets)
+    print(f"🕸️  {len(graph.names)} skills, {graph.adjacency.nnz} arestas related_skills")
+
+    if not args.skill:
+        return
+
+    table = graph.top_k(max(args.limit, DEFAULT_TOP_K), args.hops, args.decay)
+    print(f"\n💡 Recomendações para: {', '.join(args.skill)}")
+    for name, score in graph.recommend(args.skill, args.limit, table):
+        print(f"   {score:.3f}  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+🗂️ CV Builder - Columnar Skills Database
+Converte a base de skills (dicts aninhados) em arrays NumPy colunares
+
+Formato (uma pasta, tudo memory-mappable com np.load(mmap_mode='r')):
+- skills.npy   structured array, uma linha por skill
+- strings.npy  tabela de strings (nomes, áreas, categorias)
+- related.npy  ids (em strings.npy) das related_skills de todas as skills;
+               cada skill aponta para o seu bloco com related_start/related_count
+- meta.json    schema, códigos de prioridade e origem
+
+Vários processos podem carregar a mesma pasta e partilham as páginas em
+memória do sistema operativo, filtrando e ordenando com operações
+vetorizadas em vez de percorrer dicts.
+
+Uso:
+    python scripts/skills_columnar.py
+    python scripts/skills_columnar.py --source datasets/raw/skills_database_raw.json --output /tmp/skills
+"""
+
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dataset_io import DATASETS_DIR, RAW_DATASETS_DIR
+from skills_table import as_number, iter_skill_records
+
+PRIORITY_CODES = {'high': 0, 'medium': 1, 'low': 2}
+
+SKILL_DTYPE = np.dtype([
+    ('name_id', np.int32),
+    ('area_id', np.int32),
+    ('category_id', np.int32),
+    ('priority', np.int8),            # PRIORITY_CODES, -1 = desconhecida
+    ('demand_score', np.float32),     # NaN = em falta
+    ('salary_impact', np.float32),    # percentagem ("+18%" -> 18.0)
+    ('years_to_master', np.float32),
+    ('related_start', np.int32),
+    ('related_count', np.int32),
+])
+
+def parse_percentage(value) -> float:
+    """'+18%' -> 18.0 (NaN se não for interpretável)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip('%'))
+        except ValueError:
+            pass
+    return float('nan')
+
+def build_columnar(data: dict, enrich: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Constrói (skills, strings, related) a partir de um dict de skills
+
+    Args:
+        data: skills_by_area.json ou skills_database_raw.json
+        enrich: dataset extra (ex: raw) usado para preencher campos em falta por nome
+    """
+    extra = {}
+    if enrich:
+        for _, _, skill in iter_skill_records(enrich):
+            name = skill.get('name')
+            if isinstance(name, str):
+                extra.setdefault(name.lower(), skill)
+
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        return string_ids.setdefault(value, len(string_ids))
+
+    rows = []
+    related = []
+    for area, category, skill in iter_skill_records(data):
+        name = skill.get('name')
+        name = name if isinstance(name, str) else ''
+        fallback = extra.get(name.lower(), {})
+
+        def field(*keys):
+            for source in (skill, fallback):
+                for key in keys:
+                    if key in source:
+                        return source[key]
+            return None
+
+        related_names = field('related_skills')
+        related_names = [r for r in related_names if isinstance(r, str)] if isinstance(related_names, list) else []
+
+        rows.append((
+            intern(name),
+            intern(area),
+            intern(category),
+            PRIORITY_CODES.get(skill.get('priority'), -1),
+            as_number(field('demand_score')),
+            parse_percentage(field('salary_impact', 'avg_salary_impact')),
+            as_number(field('years_to_master')),
+            len(related),
+            len(related_names),
+        ))
+        related.extend(intern(related_name) for related_name in related_names)
+
+    skills = np.array(rows, dtype=SKILL_DTYPE)
+    strings = np.array(list(string_ids), dtype=str) if string_ids else np.array([], dtype='U1')
+    return skills, strings, np.array(related, dtype=np.int32)
+
+def write_columnar(data: dict, output_dir: Path, source: str = '', enrich: Optional[dict] = None) -> Path:
+    """Escreve a base colunar numa pasta; devolve a pasta"""
+    skills, strings, related = build_columnar(data, enrich)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    np.save(output_dir / "skills.npy", skills)
+    np.save(output_dir / "strings.npy", strings)
+    np.save(output_dir / "related.npy", related)
+
+    meta = {
+        "version": "1.0.0",
+        "created_at": datetime.now().isoformat(),
+        "source": source,
+        "total_skills": int(len(skills)),
+        "fields": list(SKILL_DTYPE.names),
+        "priority_codes": PRIORITY_CODES
+    }
+    with open(output_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    return output_dir
+
+class ColumnarSkills:
+    """Acesso vetorizado à base colunar (memory-mapped por defeito)"""
+
+    def __init__(self, skills: np.ndarray, strings: np.ndarray, related: np.ndarray):
+        self.skills = skills
+        self.strings = strings
+        self.related_ids = related
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "ColumnarSkills":
+        """Carrega a pasta gerada por write_columnar"""
+        mode = 'r' if mmap else None
+        path = Path(path)
+        return cls(
+            np.load(path / "skills.npy", mmap_mode=mode),
+            np.load(path / "strings.npy", mmap_mode=mode),
+            np.load(path / "related.npy", mmap_mode=mode),
+        )
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _string_id(self, value: str) -> int:
+        ids = np.flatnonzero(self.strings == value)
+        return int(ids[0]) if len(ids) else -1
+
+    @property
+    def names(self) -> np.ndarray:
+        return self.strings[self.skills['name_id']]
+
+    def mask(self, area: Optional[str] = None, category: Optional[str] = None,
+             priority: Optional[str] = None, min_demand: Optional[float] = None) -> np.ndarray:
+        """Máscara booleana das skills que cumprem todos os filtros"""
+        mask = np.ones(len(self.skills), dtype=bool)
+        if area is not None:
+            mask &= self.skills['area_id'] == self._string_id(area)
+        if category is not None:
+            mask &= self.skills['category_id'] == self._string_id(category)
+        if priority is not None:
+            mask &= self.skills['priority'] == PRIORITY_CODES.get(priority, -2)
+        if min_demand is not None:
+            mask &= self.skills['demand_score'] >= min_demand
+        return mask
+
+    def top_by_demand(self, k: int = 10, **filters) -> np.ndarray:
+        """Índices das k skills com maior demand_score (estável para empates)"""
+        rows = np.flatnonzero(self.mask(**filters))
+        scores = np.nan_to_num(self.skills['demand_score'][rows], nan=-np.inf)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return rows[order]
+
+    def related(self, row: int) -> List[str]:
+        """related_skills de uma skill"""
+        start = int(self.skills['related_start'][row])
+        count = int(self.skills['related_count'][row])
+        return self.strings[self.related_ids[start:start + count]].tolist()
+
+    def record(self, row: int) -> dict:
+        """Linha como dict (para debug / serialização)"""
+        skill = self.skills[row]
+        priorities = {code: name for name, code in PRIORITY_CODES.items()}
+        return {
+            'name': str(self.strings[skill['name_id']]),
+            'area': str(self.strings[skill['area_id']]),
+            'category': str(self.strings[skill['category_id']]),
+            'priority': priorities.get(int(skill['priority'])),
+            'demand_score': float(skill['demand_score']),
+            'salary_impact': float(skill['salary_impact']),
+            'years_to_master': float(skill['years_to_master']),
+            'related_skills': self.related(row)
+        }
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Gera a base de skills em formato colunar (NumPy)")
+    parser.add_argument("--source", type=Path, default=DATASETS_DIR / "skills_by_area.json",
+                        help="Dataset de skills (default: datasets/processed/skills_by_area.json)")
+    parser.add_argument("--enrich", type=Path, default=RAW_DATASETS_DIR / "skills_database_raw.json",
+                        help="Dataset usado para preencher campos em falta (ex: years_to_master)")
+    parser.add_argument("--output", type=Path, default=DATASETS_DIR / "columnar" / "skills",
+                        help="Pasta de saída")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    enrich = None
+    if args.enrich and args.enrich.exists() and args.enrich != args.source:
+        with open(args.enrich, "r", encoding="utf-8") as f:
+            enrich = json.load(f)
+
+    output = write_columnar(data, args.output, source=args.source.name, enrich=enrich)
+    table = ColumnarSkills.load(output)
+
+    print(f"✅ {len(table)} skills em formato colunar")
+    print(f"📁 Localização: {output.absolute()}")
+
+if __name__ == "__main__":
+    main()
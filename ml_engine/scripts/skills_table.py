@@ -0,0 +1,169 @@
+"""
+🧮 CV Builder - Skills Table
+Tabela canónica das skills: uma linha por skill, qualquer que seja o aninhamento
+
+skills_by_area mistura listas de skills diretamente numa área (soft_skills),
+por categoria (technology.frontend) e em subcategorias mais fundas. Uma só
+passagem recursiva achata tudo numa tabela (pandas DataFrame):
+
+- area / category   área e caminho abaixo dela ("frontend", "frontend.frameworks");
+                    listas diretamente numa área usam o nome da área
+- list_id / position lista de origem (SkillsTable.lists[list_id] = chaves desde a
+                    raiz) e índice da skill nessa lista
+- name / priority / demand_score   colunas para filtros e estatísticas
+- is_skill          False para itens da lista que não são objetos
+
+Os objetos originais ficam em SkillsTable.skills (mesma ordem das linhas) e
+os nós que não são listas nem objetos em SkillsTable.unexpected.
+
+skills_table(data) constrói a tabela uma vez por documento e devolve a mesma
+instância nas chamadas seguintes do processo: validação, export (índices,
+grafo de recomendações, títulos de cargo) e base colunar partilham-na em vez
+de voltar a percorrer os dicts. Os datasets não são alterados depois de
+carregados, por isso a identidade do dict basta como chave.
+
+Uso:
+    table = skills_table(skills_data)
+    table.frame.groupby('area').demand_score.mean()
+    for area, category, skill in table.records():
+        ...
+"""
+
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from json_stream import JSONStreamReader
+
+MAX_CACHED_TABLES = 8
+
+# Linha da passagem recursiva: (área, categoria, caminho da lista, posição, valor);
+# posição None = nó que não é lista nem objeto (categoria '' se for a própria área)
+SkillRow = Tuple[str, str, Tuple[str, ...], Optional[int], Any]
+
+def _category(path: Tuple[str, ...]) -> str:
+    return '.'.join(path[1:]) or path[0]
+
+def iter_skill_rows(data: dict) -> Iterator[SkillRow]:
+    """Percorre todas as listas de skills, a qualquer profundidade"""
+    def walk(node, path: Tuple[str, ...]):
+        if isinstance(node, list):
+            category = _category(path)
+            for position, value in enumerate(node):
+                yield path[0], category, path, position, value
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if not path and key == 'metadata':
+                    continue
+                yield from walk(value, path + (key,))
+        else:
+            yield path[0], '.'.join(path[1:]), path, None, node
+
+    yield from walk(data, ())
+
+def iter_skill_rows_stream(reader: JSONStreamReader) -> Iterator[SkillRow]:
+    """Mesma passagem que iter_skill_rows, sobre um documento em streaming (uma skill de cada vez)"""
+    def walk(path: Tuple[str, ...]):
+        kind = reader.peek_type()
+        if kind == 'array':
+            category = _category(path)
+            for position, value in enumerate(reader.iter_items()):
+                yield path[0], category, path, position, value
+        elif kind == 'object':
+            for key in reader.iter_object():
+                if not path and key == 'metadata':
+                    reader.skip_value()
+                    continue
+                yield from walk(path + (key,))
+        else:
+            yield path[0], '.'.join(path[1:]), path, None, reader.read_value()
+
+    yield from walk(())
+
+def as_number(value) -> float:
+    """Valor numérico como float (NaN se faltar ou não for número; bool não conta)"""
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else float('nan')
+
+class SkillsTable:
+    """Skills achatadas: DataFrame + objetos originais + caminho de cada lista"""
+
+    def __init__(self, frame: pd.DataFrame, skills: list, lists: List[Tuple[str, ...]],
+                 areas: List[str], unexpected: List[Tuple[str, str, Any]]):
+        self.frame = frame
+        self.skills = skills
+        self.lists = lists
+        self.areas = areas
+        self.unexpected = unexpected
+
+    @classmethod
+    def from_rows(cls, rows: Iterator[SkillRow], keep_objects: bool = True) -> "SkillsTable":
+        """Tabela a partir das linhas da passagem recursiva (keep_objects=False: só as colunas)"""
+        columns = {name: [] for name in ('area', 'category', 'list_id', 'position', 'name', 'priority', 'demand_score', 'is_skill')}
+        skills = []
+        list_ids = {}
+        areas = {}
+        unexpected = []
+
+        for area, category, path, position, value in rows:
+            areas.setdefault(area, None)
+            if position is None:
+                unexpected.append((area, category, value))
+                continue
+            list_id = list_ids.setdefault(path, len(list_ids))
+            is_skill = isinstance(value, dict)
+            skill = value if is_skill else {}
+            name = skill.get('name')
+            priority = skill.get('priority')
+
+            columns['area'].append(area)
+            columns['category'].append(category)
+            columns['list_id'].append(list_id)
+            columns['position'].append(position)
+            columns['name'].append(name if isinstance(name, str) else None)
+            columns['priority'].append(priority if isinstance(priority, str) else None)
+            columns['demand_score'].append(as_number(skill.get('demand_score')))
+            columns['is_skill'].append(is_skill)
+            skills.append(value if keep_objects else None)
+
+        frame = pd.DataFrame(columns)
+        frame = frame.astype({'list_id': 'int32', 'position': 'int32', 'demand_score': 'float64', 'is_skill': bool})
+        return cls(frame, skills, list(list_ids), list(areas), unexpected)
+
+    @classmethod
+    def from_dataset(cls, data: dict) -> "SkillsTable":
+        return cls.from_rows(iter_skill_rows(data))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def refs(self) -> Iterator[str]:
+        """Referência legível de cada linha: area.categoria[posição]"""
+        for area, category, position in zip(self.frame['area'], self.frame['category'], self.frame['position']):
+            yield f'{area}.{category}[{position}]'
+
+    def records(self) -> Iterator[Tuple[str, str, dict]]:
+        """(área, categoria, skill) de cada linha que é um objeto"""
+        for area, category, is_skill, skill in zip(self.frame['area'], self.frame['category'],
+                                                   self.frame['is_skill'], self.skills):
+            if is_skill:
+                yield area, category, skill
+
+_TABLES: "OrderedDict[int, Tuple[dict, SkillsTable]]" = OrderedDict()
+
+def skills_table(data: dict) -> SkillsTable:
+    """Tabela de um documento de skills, construída só na 1ª chamada para esse documento"""
+    cached = _TABLES.get(id(data))
+    if cached is not None and cached[0] is data:
+        _TABLES.move_to_end(id(data))
+        return cached[1]
+
+    table = SkillsTable.from_dataset(data)
+    _TABLES[id(data)] = (data, table)
+    while len(_TABLES) > MAX_CACHED_TABLES:
+        _TABLES.popitem(last=False)
+    return table
+
+def iter_skill_records(data: dict) -> Iterator[Tuple[str, str, dict]]:
+    """(área, categoria, skill) de todas as skills de um documento (via tabela partilhada)"""
+    return skills_table(data).records()
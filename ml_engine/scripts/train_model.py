@@ -0,0 +1,320 @@
+"""
+🧠 CV Builder - Score Model Training
+Treina um preditor de ATS score e quality score a partir dos exemplos de text_improvement
+
+- Features esparsas com hashing (sem vocabulário em memória): n-gramas do
+  texto melhorado, palavras do original, keywords e alguns sinais numéricos
+- Treino out-of-core com SGDRegressor.partial_fit, por blocos de exemplos
+  lidos em streaming (text_improvement.json ou shards JSONL)
+- Split de validação determinístico pelo hash do id do exemplo
+- Por época: exemplos/s e MAE, RMSE e R² de validação por alvo
+
+Uso:
+    python scripts/train_model.py
+    python scripts/train_model.py --epochs 5 --chunk-size 20000 --output models/score_model.joblib
+"""
+
+import re
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDRegressor
+
+from dataset_io import DATASETS_DIR, MODELS_DIR, find_dataset, iter_examples
+from keyword_matcher import ACTION_VERB_MATCHER
+
+TARGETS = ['ats_score', 'quality_score']
+MODEL_VERSION = "1.0.0"
+
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)?')
+
+class ExampleFeaturizer:
+    """Converte exemplos (original, improved, keywords) numa matriz esparsa de tamanho fixo"""
+
+    # Sinais numéricos acrescentados às features de hashing
+    DENSE_FEATURES = ['improved_words', 'length_ratio', 'numbers', 'percentages', 'keywords', 'action_verb']
+
+    def __init__(self, n_features: int = 2 ** 18):
+        self.n_features = n_features
+        self.improved_vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2'
+        )
+        self.original_vectorizer = HashingVectorizer(
+            n_features=n_features // 4, alternate_sign=False, norm='l2'
+        )
+        self.keyword_hasher = FeatureHasher(
+            n_features=n_features // 4, input_type='string', alternate_sign=False
+        )
+
+    @staticmethod
+    def _dense(example: dict) -> List[float]:
+        improved = example.get('improved') or ''
+        original = example.get('original') or ''
+        keywords = example.get('keywords') if isinstance(example.get('keywords'), list) else []
+        numbers = NUMBER_PATTERN.findall(improved)
+        # Escalas aproximadas para ficar na mesma ordem de grandeza das features normalizadas
+        return [
+            min(len(improved.split()) / 50, 2.0),
+            min(len(improved) / max(len(original), 1) / 10, 2.0),
+            min(len(numbers) / 5, 2.0),
+            min(improved.count('%') / 3, 2.0),
+            min(len(keywords) / 10, 2.0),
+            1.0 if ACTION_VERB_MATCHER.contains_any(improved) else 0.0
+        ]
+
+    def transform(self, examples: List[dict]) -> sparse.csr_matrix:
+        """Matriz (exemplos × dimension)"""
+        improved = self.improved_vectorizer.transform([example.get('improved') or '' for example in examples])
+        original = self.original_vectorizer.transform([example.get('original') or '' for example in examples])
+        keywords = self.keyword_hasher.transform(
+            [[str(keyword).lower() for keyword in example.get('keywords') or []] for example in examples]
+        )
+        if keywords.nnz:
+            keywords.data = np.minimum(keywords.data, 1.0)
+        dense = sparse.csr_matrix(np.asarray([self._dense(example) for example in examples], dtype=np.float64))
+        return sparse.hstack([improved, original, keywords, dense], format='csr')
+
+class ScoreModel:
+    """Um SGDRegressor por alvo sobre as features do ExampleFeaturizer (scores 0-100)"""
+
+    def __init__(self, targets: List[str] = None, n_features: int = 2 ** 18, alpha: float = 1e-5, seed: int = 42):
+        self.targets = list(targets or TARGETS)
+        self.featurizer = ExampleFeaturizer(n_features)
+        self.regressors = {
+            target: SGDRegressor(alpha=alpha, learning_rate='invscaling', eta0=0.05, random_state=seed)
+            for target in self.targets
+        }
+        # (média, desvio) de cada alvo, fixados no primeiro bloco de treino
+        self.target_scaling: Dict[str, Tuple[float, float]] = {}
+        self.metadata = {'version': MODEL_VERSION, 'targets': self.targets, 'n_features': n_features}
+
+    def partial_fit(self, X: sparse.csr_matrix, labels: Dict[str, np.ndarray]):
+        """Atualiza cada regressor com as linhas que têm o respetivo alvo"""
+        for target, regressor in self.regressors.items():
+            y = labels[target]
+            known = ~np.isnan(y)
+            if known.any():
+                # Alvos padronizados: o SGD não tem de aprender o intercept (~85) do zero
+                if target not in self.target_scaling:
+                    self.target_scaling[target] = (float(y[known].mean()), float(y[known].std()) or 1.0)
+                mean, std = self.target_scaling[target]
+                regressor.partial_fit(X[known], (y[known] - mean) / std)
+
+    def predict_matrix(self, X: sparse.csr_matrix) -> Dict[str, np.ndarray]:
+        """Previsões (0-100) por alvo para uma matriz de features"""
+        predictions = {}
+        for target, regressor in self.regressors.items():
+            if hasattr(regressor, 'coef_'):
+                mean, std = self.target_scaling[target]
+                predictions[target] = np.clip(regressor.predict(X) * std + mean, 0, 100)
+            else:
+                predictions[target] = np.full(X.shape[0], np.nan)
+        return predictions
+
+    def predict(self, examples: List[dict]) -> Dict[str, np.ndarray]:
+        """Previsões (0-100) por alvo para uma lista de exemplos"""
+        return self.predict_matrix(self.featurizer.transform(examples))
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    @staticmethod
+    def load(path: Path) -> "ScoreModel":
+        model = joblib.load(path)
+        if not isinstance(model, ScoreModel):
+            raise TypeError(f"{path} does not contain a ScoreModel")
+        return model
+
+class RegressionMetrics:
+    """MAE, RMSE e R² acumulados em streaming (sem guardar previsões)"""
+
+    def __init__(self):
+        self.count = 0
+        self.abs_error = 0.0
+        self.sq_error = 0.0
+        self.y_sum = 0.0
+        self.y_sq_sum = 0.0
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        known = ~np.isnan(y_true) & ~np.isnan(y_pred)
+        y_true, y_pred = y_true[known], y_pred[known]
+        errors = y_pred - y_true
+        self.count += len(y_true)
+        self.abs_error += float(np.abs(errors).sum())
+        self.sq_error += float((errors ** 2).sum())
+        self.y_sum += float(y_true.sum())
+        self.y_sq_sum += float((y_true ** 2).sum())
+
+    def result(self) -> Dict[str, Optional[float]]:
+        if not self.count:
+            return {'count': 0, 'mae': None, 'rmse': None, 'r2': None}
+        total_variance = self.y_sq_sum - self.y_sum ** 2 / self.count
+        return {
+            'count': self.count,
+            'mae': self.abs_error / self.count,
+            'rmse': (self.sq_error / self.count) ** 0.5,
+            'r2': 1 - self.sq_error / total_variance if total_variance > 0 else None
+        }
+
+def is_validation(example: dict, index: int, fraction: float) -> bool:
+    """Split estável: depende só do id (ou posição) do exemplo, não da ordem de leitura"""
+    key = str(example.get('id', index)).encode('utf-8')
+    bucket = int.from_bytes(hashlib.blake2b(key, digest_size=4).digest(), 'little') / 2 ** 32
+    return bucket < fraction
+
+def iter_chunks(dataset: Path, chunk_size: int, val_fraction: float) -> Iterator[Tuple[bool, List[dict]]]:
+    """Blocos de exemplos (is_validation, exemplos) lidos em streaming"""
+    buffers = {True: [], False: []}
+    for index, (_, example) in enumerate(iter_examples(dataset)):
+        is_val = is_validation(example, index, val_fraction)
+        buffer = buffers[is_val]
+        buffer.append(example)
+        if len(buffer) == chunk_size:
+            yield is_val, buffer
+            buffers[is_val] = []
+    for is_val, buffer in buffers.items():
+        if buffer:
+            yield is_val, buffer
+
+def labels_for(examples: List[dict], targets: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Alvos por exemplo (NaN quando em falta ou inválido)"""
+    labels = {}
+    for target in targets:
+        values = [example.get(target) for example in examples]
+        labels[target] = np.asarray(
+            [value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan for value in values],
+            dtype=np.float64
+        )
+    return labels
+
+def evaluate(model: "ScoreModel", dataset: Path, chunk_size: int, val_fraction: float) -> Dict[str, dict]:
+    """Métricas de validação: passagem em streaming só pelos exemplos de validação"""
+    metrics = {target: RegressionMetrics() for target in model.targets}
+    for is_val, examples in iter_chunks(dataset, chunk_size, val_fraction):
+        if not is_val:
+            continue
+        labels = labels_for(examples, model.targets)
+        predictions = model.predict(examples)
+        for target in model.targets:
+            metrics[target].update(labels[target], predictions[target])
+    return {target: metric.result() for target, metric in metrics.items()}
+
+def train(dataset: Path, epochs: int = 3, chunk_size: int = 10000, val_fraction: float = 0.1,
+          n_features: int = 2 ** 18, alpha: float = 1e-5, seed: int = 42) -> Tuple[ScoreModel, List[dict]]:
+    """Treina um ScoreModel fazendo uma passagem em streaming pelo dataset por época"""
+    model = ScoreModel(TARGETS, n_features, alpha, seed)
+    rng = np.random.default_rng(seed)
+    history = []
+
+    for epoch in range(1, epochs + 1):
+        trained = 0
+        train_time = 0.0
+        start = time.perf_counter()
+
+        for is_val, examples in iter_chunks(dataset, chunk_size, val_fraction):
+            if is_val:
+                continue
+            X = model.featurizer.transform(examples)
+            labels = labels_for(examples, model.targets)
+
+            # Baralhar dentro do bloco (a ordem entre blocos é a do dataset)
+            order = rng.permutation(len(examples))
+            chunk_start = time.perf_counter()
+            model.partial_fit(X[order], {target: y[order] for target, y in labels.items()})
+            train_time += time.perf_counter() - chunk_start
+            trained += len(examples)
+
+        elapsed = time.perf_counter() - start
+        epoch_result = {
+            'epoch': epoch,
+            'train_examples': trained,
+            'seconds': elapsed,
+            'examples_per_s': trained / elapsed if elapsed > 0 else None,
+            'fit_examples_per_s': trained / train_time if train_time > 0 else None,
+            'validation': evaluate(model, dataset, chunk_size, val_fraction)
+        }
+        history.append(epoch_result)
+        print_epoch(epoch_result)
+
+    model.metadata.update({
+        'trained_at': datetime.now().isoformat(),
+        'dataset': str(dataset),
+        'epochs': epochs,
+        'chunk_size': chunk_size,
+        'val_fraction': val_fraction,
+        'history': history
+    })
+    return model, history
+
+def print_epoch(result: dict):
+    """Linha de progresso de uma época"""
+    rate = result['examples_per_s'] or 0
+    print(f"   Época {result['epoch']}: {result['train_examples']:,} exemplos em {result['seconds']:.1f}s ({rate:,.0f} exemplos/s)")
+    for target, metric in result['validation'].items():
+        if not metric['count']:
+            print(f"      {target}: sem exemplos de validação")
+            continue
+        r2 = f"{metric['r2']:.3f}" if metric['r2'] is not None else "n/a"
+        print(f"      {target}: MAE {metric['mae']:.2f} | RMSE {metric['rmse']:.2f} | R² {r2} ({metric['count']:,} val)")
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Treina o preditor de ATS/quality score (out-of-core)")
+    parser.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR,
+                        help="Pasta com text_improvement.json ou text_improvement/ (shards)")
+    parser.add_argument("--epochs", type=int, default=3, help="Passagens pelo dataset (default: 3)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Exemplos por partial_fit (default: 10000)")
+    parser.add_argument("--val-fraction", type=float, default=0.1, help="Fração de validação (default: 0.1)")
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="Dimensão do hashing do texto (default: 2^18)")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="Regularização L2 do SGD")
+    parser.add_argument("--seed", type=int, default=42, help="Seed")
+    parser.add_argument("--output", type=Path, default=MODELS_DIR / "score_model.joblib", help="Modelo treinado")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    args = parse_args()
+
+    print("\n" + "="*70)
+    print("🧠 CV Builder - Score Model Training")
+    print("="*70)
+    print()
+
+    dataset = find_dataset(args.datasets_dir, "text_improvement.json")
+    if dataset is None:
+        print(f"❌ text_improvement não encontrado em {args.datasets_dir}")
+        print("💡 Execute primeiro: python scripts/generate_datasets.py")
+        exit(1)
+
+    print(f"📂 Dataset: {dataset}")
+    print(f"⚙️  {args.epochs} épocas, blocos de {args.chunk_size:,}, validação {args.val_fraction:.0%}")
+    print()
+
+    model, history = train(
+        dataset, args.epochs, args.chunk_size, args.val_fraction, args.n_features, args.alpha, args.seed
+    )
+    if not history or not history[-1]['train_examples']:
+        print("\n❌ Nenhum exemplo de treino")
+        exit(1)
+
+    output = model.save(args.output)
+    print()
+    print("="*70)
+    print(f"✨ Modelo guardado: {output.absolute()}")
+
+if __name__ == "__main__":
+    # Via módulo, para o pickle referir train_model.ScoreModel e não __main__.ScoreModel
+    import train_model
+    train_model.main()
@@ -11,238 +11,369 @@ Este script verifica:
 
 Uso:
     python scripts/validate_datasets.py
+    python scripts/validate_datasets.py --stream   # datasets muito grandes
+    python scripts/validate_datasets.py --workers 0   # paralelo, todos os cores
+    python scripts/validate_datasets.py --near-duplicates 0.7   # Jaccard mínima (0 = desligado)
+    python scripts/validate_datasets.py --metrics-out metrics/validate.prom   # tempos por arquivo/secção
+    python scripts/validate_datasets.py --diagnostics-out diagnostics.json --max-samples 20
+    python scripts/validate_datasets.py --report-out reports/datasets.json   # percentis, histogramas, keywords
+
+text_improvement pode estar em text_improvement.json ou em shards JSONL
+(text_improvement/index.json, ver dataset_io.py); os shards são validados
+em streaming e, com --workers, um shard por tarefa, lido pelo próprio worker.
+Um text_improvement.json único é validado num só processo mesmo com
+--workers (lê-lo, dividi-lo e serializá-lo para o pool ficaria no processo
+principal e seria mais lento); os outros arquivos vão para o pool.
+
+Durante a validação exemplo a exemplo calculam-se também as assinaturas
+MinHash (near_duplicates.py); no fim, o LSH agrupa exemplos quase duplicados
+em todo o corpus e reporta cada cluster como aviso. Com --stream a deteção
+fica desligada (as assinaturas crescem com o corpus) salvo --near-duplicates.
+
+As skills são lidas da tabela achatada de skills_table.py (partilhada com o
+export): todas as listas de skills são validadas, seja qual for o
+aninhamento (technology.frontend.frameworks, soft_skills direto na área).
+
+Os campos de cada exemplo, skill e lista de keywords são verificados por
+funções compiladas a partir dos schemas declarativos em ml_engine/schemas
+(schema_compiler.py); só as heurísticas entre campos ficam escritas à mão.
+
+Erros e avisos são registos com código (diagnostics.py): contagem por
+código e só as primeiras --max-samples ocorrências de cada um, formatadas
+ao mostrar, por isso a memória não cresce com o nº de exemplos inválidos.
+
+As estatísticas por secção vêm de acumuladores de memória constante
+(contagens e somas dos scores já validados, dataset_stats.py). Só com
+--report-out se guardam colunas compactas de todos os exemplos, para gravar
+percentis, histogramas, breakdowns por indústria/senioridade e frequências
+de keywords.
 """
 
 import json
+import argparse
 from pathlib import Path
-from typing import List, Dict, Tuple
-from collections import Counter
+import io
+import os
+from contextlib import redirect_stdout
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, TextIO, Callable, Iterator, Any
+from collections import deque
+
+from json_stream import JSONStreamReader
+from dataset_io import DATASETS_DIR, find_dataset, iter_shard, iter_shards, load_index
+from keyword_matcher import ACTION_VERB_MATCHER
+from near_duplicates import DEFAULT_THRESHOLD, NearDuplicateDetector
+from metrics import Metrics, add_metrics_arguments, run_with_metrics
+from diagnostics import DEFAULT_MAX_SAMPLES, Diagnostics
+from schema_compiler import compile_definition
+from skills_table import SkillsTable, iter_skill_rows_stream, skills_table
+from dataset_stats import ExampleColumns, SectionStats, build_report, skills_summary, write_report
+
+# Validadores gerados a partir dos schemas em ml_engine/schemas (compilados uma vez, ao importar)
+TEXT_EXAMPLE_VALIDATOR = compile_definition('text_improvement', 'example')
+SKILL_VALIDATOR = compile_definition('skills_by_area', 'skill')
+ATS_KEYWORDS_VALIDATOR = compile_definition('ats_keywords', 'keywords')
+
+# Estatística com o nº de itens de cada arquivo (throughput nas métricas)
+ITEM_STATS = {
+    'text_improvement.json': ('text_improvement', 'total_examples'),
+    'skills_by_area.json': ('skills_database', 'total_skills'),
+    'ats_keywords.json': ('ats_keywords', 'areas'),
+    'summary_templates.json': ('summary_templates', 'total_roles')
+}
 
 class DatasetValidator:
-    def __init__(self):
-        self.datasets_dir = Path("datasets/processed")
-        self.errors = []
-        self.warnings = []
+    def __init__(self, streaming: bool = False, workers: int = 1, shard_size: int = 5000,
+                 datasets_dir: Path = None, near_duplicate_threshold: Optional[float] = None,
+                 metrics: Metrics = None, datasets: Dict[str, dict] = None, max_samples: int = DEFAULT_MAX_SAMPLES,
+                 collect_tables: bool = False):
+        self.datasets_dir = Path(datasets_dir or DATASETS_DIR)
+        self.streaming = streaming
+        self.workers = workers
+        self.shard_size = shard_size
+        # Quase duplicados: ligados por omissão, exceto em streaming (as assinaturas crescem com o corpus)
+        if near_duplicate_threshold is None:
+            near_duplicate_threshold = 0 if streaming else DEFAULT_THRESHOLD
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._near_duplicates: Optional[NearDuplicateDetector] = None
+        self.metrics = metrics or Metrics("validate")
+        # Documentos já carregados ({nome do arquivo: dict}, ex: do run_pipeline): usados em vez
+        # do disco e completados com os que forem lidos inteiros, para a etapa seguinte
+        self.datasets = datasets if datasets is not None else {}
+        # Problemas encontrados: contadores por código + amostras limitadas (ver diagnostics.py)
+        self.max_samples = max_samples
+        self.diagnostics = Diagnostics(max_samples)
         self.stats = {}
+        # Tabelas completas para o relatório (ver dataset_stats.py), só se pedidas
+        self.collect_tables = collect_tables
+        self.tables = {}
     
-    def validate_text_improvement(self, data: dict) -> Tuple[List[str], List[str]]:
+    def validate_text_improvement(self, data: dict) -> Diagnostics:
         """Valida dataset de melhoria de texto"""
-        errors = []
-        warnings = []
+        diagnostics = Diagnostics(self.max_samples)
         
         print("📝 Validando text_improvement.json...")
         
         # Validar estrutura principal
         if "by_section" not in data:
-            errors.append("❌ Missing 'by_section' key in root")
-            return errors, warnings
+            diagnostics.add('missing_key', key='by_section', where='root')
+            return diagnostics
         
         if "metadata" not in data:
-            warnings.append("⚠️  Missing 'metadata' in root (opcional mas recomendado)")
+            diagnostics.add('missing_metadata', where='root')
         
         sections = data["by_section"]
-        total_examples = 0
-        section_stats = {}
+        columns = _example_stats(self.collect_tables)
+        near_duplicates = self._near_duplicate_detector()
         
         # Validar cada secção
         for section_name, examples in sections.items():
             if not isinstance(examples, list):
-                errors.append(f"❌ Section '{section_name}' should be a list, got {type(examples).__name__}")
+                diagnostics.add('section_type', section=section_name, actual=type(examples).__name__)
                 continue
             
-            total_examples += len(examples)
-            section_stats[section_name] = {
-                'count': len(examples),
-                'avg_ats_score': 0,
-                'avg_quality_score': 0
-            }
-            
-            ats_scores = []
-            quality_scores = []
-            
-            # Validar cada exemplo
-            for idx, example in enumerate(examples):
-                example_id = example.get('id', f'{section_name}_{idx}')
-                
-                # 1. Campos obrigatórios
-                required_fields = ['original', 'improved', 'keywords']
-                for field in required_fields:
-                    if field not in example:
-                        errors.append(f"❌ [{example_id}] Missing required field: '{field}'")
-                    elif not example[field]:
-                        errors.append(f"❌ [{example_id}] Field '{field}' is empty")
-                
-                # 2. Validar que o texto melhorado é diferente do original
-                if example.get('original') and example.get('improved'):
-                    if example['original'] == example['improved']:
-                        warnings.append(f"⚠️  [{example_id}] 'improved' is identical to 'original'")
-                    
-                    # Verificar se melhorou (geralmente mais longo e detalhado)
-                    original_len = len(example['original'])
-                    improved_len = len(example['improved'])
-                    
-                    if improved_len < original_len * 0.5:
-                        warnings.append(f"⚠️  [{example_id}] 'improved' is much shorter than 'original' ({improved_len} vs {original_len} chars)")
-                    elif improved_len < original_len:
-                        warnings.append(f"⚠️  [{example_id}] 'improved' is shorter than 'original'")
-                    
-                    # Verificar se tem verbos de ação
-                    action_verbs = ['desenvolvi', 'implementei', 'geri', 'liderei', 'otimizei', 'aumentei', 'reduzi']
-                    has_action_verb = any(verb in example['improved'].lower() for verb in action_verbs)
-                    if not has_action_verb and section_name == 'experience':
-                        warnings.append(f"⚠️  [{example_id}] 'improved' doesn't contain strong action verbs")
-                
-                # 3. Validar keywords
-                if 'keywords' in example:
-                    if not isinstance(example['keywords'], list):
-                        errors.append(f"❌ [{example_id}] 'keywords' should be a list, got {type(example['keywords']).__name__}")
-                    elif len(example['keywords']) == 0:
-                        warnings.append(f"⚠️  [{example_id}] 'keywords' list is empty")
-                    elif len(example['keywords']) < 3:
-                        warnings.append(f"⚠️  [{example_id}] Only {len(example['keywords'])} keywords (recommended: 5+)")
-                
-                # 4. Validar ATS score
-                if 'ats_score' in example:
-                    score = example['ats_score']
-                    if not isinstance(score, (int, float)):
-                        errors.append(f"❌ [{example_id}] 'ats_score' should be a number, got {type(score).__name__}")
-                    elif not (0 <= score <= 100):
-                        errors.append(f"❌ [{example_id}] 'ats_score' out of range (0-100): {score}")
-                    else:
-                        ats_scores.append(score)
-                        if score < 70:
-                            warnings.append(f"⚠️  [{example_id}] Low ATS score: {score}")
-                
-                # 5. Validar quality_score
-                if 'quality_score' in example:
-                    score = example['quality_score']
-                    if not isinstance(score, (int, float)):
-                        errors.append(f"❌ [{example_id}] 'quality_score' should be a number, got {type(score).__name__}")
-                    elif not (0 <= score <= 100):
-                        errors.append(f"❌ [{example_id}] 'quality_score' out of range (0-100): {score}")
-                    else:
-                        quality_scores.append(score)
-                
-                # 6. Validar improvements (se existir)
-                if 'improvements' in example:
-                    if not isinstance(example['improvements'], list):
-                        errors.append(f"❌ [{example_id}] 'improvements' should be a list")
-            
-            # Calcular médias
-            if ats_scores:
-                section_stats[section_name]['avg_ats_score'] = sum(ats_scores) / len(ats_scores)
-            if quality_scores:
-                section_stats[section_name]['avg_quality_score'] = sum(quality_scores) / len(quality_scores)
-        
+            # Validar cada exemplo (scores válidos ficam para as estatísticas)
+            with self.metrics.stage(section_name, items=len(examples)):
+                scores = [self._check_text_example(example, section_name, idx, diagnostics)
+                          for idx, example in enumerate(examples)]
+                if near_duplicates is not None:
+                    for idx, example in enumerate(examples):
+                        near_duplicates.add_example(section_name, idx, example)
+            columns.add(section_name, examples, [ats for ats, _ in scores], [quality for _, quality in scores])
+        
+        self._finish_text_stats(columns, len(sections), near_duplicates)
+        
+        return diagnostics
+
+    @staticmethod
+    def _check_text_example(example: dict, section_name: str, idx: int,
+                            diagnostics: Diagnostics) -> Tuple[Optional[float], Optional[float]]:
+        """Valida um exemplo de melhoria de texto; devolve (ats_score, quality_score) válidos"""
+        example_id = example.get('id', f'{section_name}_{idx}') if isinstance(example, dict) else f'{section_name}_{idx}'
+
+        # 1. Campos, tipos e ranges (schemas/text_improvement.schema.json)
+        ats_score, quality_score = TEXT_EXAMPLE_VALIDATOR(example, example_id, 'example', diagnostics.add)
+
+        # 2. Validar que o texto melhorado é diferente do original
+        original = example.get('original') if isinstance(example, dict) else None
+        improved = example.get('improved') if isinstance(example, dict) else None
+        if original and improved and isinstance(original, str) and isinstance(improved, str):
+            if original == improved:
+                diagnostics.add('identical_text', ref=example_id)
+
+            # Verificar se melhorou (geralmente mais longo e detalhado)
+            original_len = len(original)
+            improved_len = len(improved)
+
+            if improved_len < original_len * 0.5:
+                diagnostics.add('much_shorter_text', ref=example_id, improved=improved_len, original=original_len)
+            elif improved_len < original_len:
+                diagnostics.add('shorter_text', ref=example_id)
+
+            # Verificar se tem verbos de ação (só exigido na experiência)
+            if section_name == 'experience' and not ACTION_VERB_MATCHER.contains_any(improved):
+                diagnostics.add('no_action_verb', ref=example_id)
+
+        return ats_score, quality_score
+
+    def validate_text_improvement_stream(self, fp: TextIO) -> Diagnostics:
+        """Valida text_improvement.json em streaming (memória constante)"""
+        diagnostics = Diagnostics(self.max_samples)
+
+        print("📝 Validando text_improvement.json (streaming)...")
+
+        reader = JSONStreamReader(fp)
+        has_metadata = False
+        has_sections = False
+        sections = 0
+        columns = _example_stats(self.collect_tables)
+        near_duplicates = self._near_duplicate_detector()
+
+        for key in reader.iter_object():
+            if key == 'metadata':
+                has_metadata = True
+                reader.skip_value()
+                continue
+            if key != 'by_section':
+                reader.skip_value()
+                continue
+
+            has_sections = True
+            for section_name in reader.iter_object():
+                sections += 1
+
+                if reader.peek_type() != 'array':
+                    value = reader.read_value()
+                    diagnostics.add('section_type', section=section_name, actual=type(value).__name__)
+                    continue
+
+                # Exemplos passam às estatísticas em blocos de shard_size (não ficam em memória)
+                count = 0
+                block, scores = [], []
+                columns.add(section_name, [], [], [])
+
+                with self.metrics.stage(section_name) as stage:
+                    for idx, example in enumerate(reader.iter_items()):
+                        count += 1
+                        block.append(example)
+                        scores.append(self._check_text_example(example, section_name, idx, diagnostics))
+                        if near_duplicates is not None:
+                            near_duplicates.add_example(section_name, idx, example)
+                        if len(block) == self.shard_size:
+                            columns.add(section_name, block, [ats for ats, _ in scores], [quality for _, quality in scores])
+                            block, scores = [], []
+                    columns.add(section_name, block, [ats for ats, _ in scores], [quality for _, quality in scores])
+                    stage.items = count
+
+        # Mesmo resultado do modo em memória
+        if not has_sections:
+            diagnostics = Diagnostics(self.max_samples)
+            diagnostics.add('missing_key', key='by_section', where='root')
+            return diagnostics
+
+        if not has_metadata:
+            diagnostics.add('missing_metadata', where='root')
+
+        self._finish_text_stats(columns, sections, near_duplicates)
+
+        return diagnostics
+
+    def validate_text_improvement_shards(self, dataset_dir: Path) -> Diagnostics:
+        """Valida text_improvement em shards JSONL, um shard de cada vez"""
+        diagnostics = Diagnostics(self.max_samples)
+        
+        print("📝 Validando text_improvement/ (shards JSONL)...")
+        
+        index = load_index(dataset_dir)
+        if not isinstance(index.get('sections'), dict):
+            diagnostics.add('missing_key', key='sections', where='shard index')
+            return diagnostics
+        
+        if not index.get('metadata'):
+            diagnostics.add('missing_metadata', where='shard index')
+        
+        columns = _example_stats(self.collect_tables)
+        for section_name in index['sections']:
+            columns.add(section_name, [], [], [])
+        near_duplicates = self._near_duplicate_detector()
+        
+        for section_name, offset, shard_path, expected in iter_shards(dataset_dir, index):
+            with self.metrics.stage(f"{section_name}/{shard_path.name}") as stage:
+                shard_diagnostics, shard_columns, shard_near_duplicates, count = _validate_jsonl_shard(
+                    section_name, offset, str(shard_path), expected, self.max_samples, self.near_duplicate_threshold,
+                    self.collect_tables
+                )
+                stage.items = count
+            diagnostics.merge(shard_diagnostics)
+            columns.merge(shard_columns)
+            if near_duplicates is not None:
+                near_duplicates.merge(shard_near_duplicates)
+        
+        self._finish_text_stats(columns, len(index['sections']), near_duplicates)
+        
+        return diagnostics
+    
+    def _near_duplicate_detector(self) -> Optional[NearDuplicateDetector]:
+        """Detetor alimentado na passagem de validação (None se desligado)"""
+        return NearDuplicateDetector(self.near_duplicate_threshold) if self.near_duplicate_threshold else None
+    
+    def _finish_text_stats(self, columns: SectionStats, sections: int,
+                           near_duplicates: Optional[NearDuplicateDetector] = None):
+        """Estatísticas por secção (a partir dos acumuladores de contagens e somas)"""
+        self._near_duplicates = near_duplicates
+        if self.collect_tables:
+            self.tables['text_improvement'] = columns
         self.stats['text_improvement'] = {
-            'total_examples': total_examples,
-            'sections': len(sections),
-            'section_breakdown': section_stats
+            'total_examples': len(columns),
+            'sections': sections,
+            'section_breakdown': columns.section_breakdown()
         }
-        
-        return errors, warnings
     
-    def validate_skills_database(self, data: dict) -> Tuple[List[str], List[str]]:
-        """Valida database de skills"""
-        errors = []
-        warnings = []
+    def check_near_duplicates(self, detector: NearDuplicateDetector, diagnostics: Diagnostics):
+        """Clusters MinHash/LSH de original+improved: um aviso por cluster de quase duplicados"""
+        threshold = self.near_duplicate_threshold
+        with self.metrics.stage("near_duplicates", items=len(detector.keys)):
+            clusters = detector.clusters()
+        
+        for cluster in clusters:
+            # Só os primeiros ids do cluster; o tamanho fica no aviso
+            diagnostics.add('near_duplicate', size=len(cluster), threshold=threshold, examples=cluster[:5])
+        
+        duplicated = sum(len(cluster) for cluster in clusters)
+        print(f"   🧬 Quase duplicados: {len(clusters)} clusters ({duplicated} exemplos)")
+        self.stats.setdefault('text_improvement', {}).update({
+            'near_duplicate_clusters': len(clusters),
+            'near_duplicate_examples': duplicated
+        })
+    
+    def validate_skills_database(self, data: dict) -> Diagnostics:
+        """Valida database de skills (todas as categorias, a qualquer nível de aninhamento)"""
+        diagnostics = Diagnostics(self.max_samples)
         
         print("💼 Validando skills_by_area.json...")
         
-        total_skills = 0
-        areas_count = 0
-        priority_distribution = Counter()
-        demand_scores = []
+        # Tabela achatada partilhada com o export (skills_table.py)
+        table = skills_table(data)
         
-        for area_name, area_data in data.items():
-            if area_name == 'metadata':
-                continue
-            
-            areas_count += 1
-            
-            if not isinstance(area_data, dict):
-                errors.append(f"❌ Area '{area_name}' should be an object, got {type(area_data).__name__}")
-                continue
-            
-            # Processar cada categoria dentro da área
-            for category, category_data in area_data.items():
-                
-                # Pode ser lista de skills ou nested dict
-                if isinstance(category_data, list):
-                    skills = category_data
-                elif isinstance(category_data, dict):
-                    # Nested structure (ex: technology.frontend)
-                    continue
-                else:
-                    warnings.append(f"⚠️  Category '{area_name}.{category}' has unexpected type: {type(category_data).__name__}")
-                    continue
-                
-                total_skills += len(skills)
-                
-                # Validar cada skill
-                for idx, skill in enumerate(skills):
-                    skill_name = skill.get('name', f'{area_name}.{category}[{idx}]')
-                    
-                    # 1. Campos obrigatórios
-                    required_fields = ['name', 'priority', 'demand_score']
-                    for field in required_fields:
-                        if field not in skill:
-                            errors.append(f"❌ [{skill_name}] Missing required field: '{field}'")
-                        elif skill[field] is None or skill[field] == '':
-                            errors.append(f"❌ [{skill_name}] Field '{field}' is empty")
-                    
-                    # 2. Validar priority
-                    if 'priority' in skill:
-                        valid_priorities = ['high', 'medium', 'low']
-                        if skill['priority'] not in valid_priorities:
-                            errors.append(f"❌ [{skill_name}] Invalid priority: '{skill['priority']}' (must be: {', '.join(valid_priorities)})")
-                        else:
-                            priority_distribution[skill['priority']] += 1
-                    
-                    # 3. Validar demand_score
-                    if 'demand_score' in skill:
-                        score = skill['demand_score']
-                        if not isinstance(score, (int, float)):
-                            errors.append(f"❌ [{skill_name}] 'demand_score' should be a number, got {type(score).__name__}")
-                        elif not (0 <= score <= 100):
-                            errors.append(f"❌ [{skill_name}] 'demand_score' out of range (0-100): {score}")
-                        else:
-                            demand_scores.append(score)
-                            if score < 50:
-                                warnings.append(f"⚠️  [{skill_name}] Low demand score: {score}")
-                    
-                    # 4. Validar salary_impact (opcional mas deve ter formato correto)
-                    if 'salary_impact' in skill:
-                        impact = skill['salary_impact']
-                        if not isinstance(impact, str):
-                            errors.append(f"❌ [{skill_name}] 'salary_impact' should be a string")
-                        elif not impact.startswith('+') or not impact.endswith('%'):
-                            warnings.append(f"⚠️  [{skill_name}] 'salary_impact' should be in format '+X%', got '{impact}'")
-                    
-                    # 5. Validar related_skills
-                    if 'related_skills' in skill:
-                        if not isinstance(skill['related_skills'], list):
-                            errors.append(f"❌ [{skill_name}] 'related_skills' should be a list")
-                        elif len(skill['related_skills']) == 0:
-                            warnings.append(f"⚠️  [{skill_name}] 'related_skills' is empty")
-                    
-                    # 6. Validar category (recomendado)
-                    if 'category' not in skill:
-                        warnings.append(f"⚠️  [{skill_name}] Missing 'category' field (recomendado)")
+        for area_name, category, value in table.unexpected:
+            self._check_skill_node(area_name, category, value, diagnostics)
         
-        self.stats['skills_database'] = {
-            'total_skills': total_skills,
-            'areas': areas_count,
-            'priority_distribution': dict(priority_distribution),
-            'avg_demand_score': sum(demand_scores) / len(demand_scores) if demand_scores else 0
-        }
+        # Validar cada skill
+        for skill_ref, skill in zip(table.refs(), table.skills):
+            self._check_skill(skill, skill_ref, diagnostics)
+        
+        self._finish_skills_stats(table)
         
-        return errors, warnings
+        return diagnostics
     
-    def validate_ats_keywords(self, data: dict) -> Tuple[List[str], List[str]]:
+    def _finish_skills_stats(self, table: SkillsTable):
+        """Prioridades e demand_score médio (vetorizados sobre a tabela de skills)"""
+        if self.collect_tables:
+            self.tables['skills_by_area'] = table.frame
+        self.stats['skills_database'] = {
+            'total_skills': len(table),
+            'areas': len(table.areas),
+            **skills_summary(table.frame)
+        }
+
+    @staticmethod
+    def _check_skill_node(area_name: str, category: str, value: Any, diagnostics: Diagnostics):
+        """Nó de skills_by_area que não é lista de skills nem objeto"""
+        if category:
+            diagnostics.add('category_unexpected_type', category=f'{area_name}.{category}', actual=type(value).__name__)
+        else:
+            diagnostics.add('skills_area_type', area=area_name, actual=type(value).__name__)
+
+    @staticmethod
+    def _check_skill(skill: dict, skill_ref: str, diagnostics: Diagnostics):
+        """Valida uma skill (schemas/skills_by_area.schema.json)"""
+        skill_name = skill.get('name', skill_ref) if isinstance(skill, dict) else skill_ref
+        SKILL_VALIDATOR(skill, skill_name, 'skill', diagnostics.add)
+
+    def validate_skills_database_stream(self, fp: TextIO) -> Diagnostics:
+        """Valida skills_by_area.json em streaming (uma skill de cada vez)"""
+        diagnostics = Diagnostics(self.max_samples)
+
+        print("💼 Validando skills_by_area.json (streaming)...")
+
+        def validated_rows():
+            # Mesma passagem da tabela de skills, uma skill de cada vez
+            for row in iter_skill_rows_stream(JSONStreamReader(fp)):
+                area_name, category, _, position, value = row
+                if position is None:
+                    self._check_skill_node(area_name, category, value, diagnostics)
+                else:
+                    self._check_skill(value, f'{area_name}.{category}[{position}]', diagnostics)
+                yield row
+
+        # Só as colunas ficam na tabela (os objetos das skills não são guardados)
+        self._finish_skills_stats(SkillsTable.from_rows(validated_rows(), keep_objects=False))
+
+        return diagnostics
+
+    def validate_ats_keywords(self, data: dict) -> Diagnostics:
         """Valida keywords ATS"""
-        errors = []
-        warnings = []
+        diagnostics = Diagnostics(self.max_samples)
         
         print("🔑 Validando ats_keywords.json...")
         
@@ -256,28 +387,14 @@ class DatasetValidator:
             areas_count += 1
             
             if not isinstance(area_data, dict):
-                errors.append(f"❌ Area '{area_name}' should be an object, got {type(area_data).__name__}")
+                diagnostics.add('area_type', area=area_name, actual=type(area_data).__name__)
                 continue
             
-            # Validar cada categoria de keywords
+            # Validar cada categoria de keywords (schemas/ats_keywords.schema.json)
             for category, keywords in area_data.items():
-                if not isinstance(keywords, list):
-                    errors.append(f"❌ Category '{area_name}.{category}' should be a list, got {type(keywords).__name__}")
-                    continue
-                
-                total_keywords += len(keywords)
-                
-                if len(keywords) == 0:
-                    warnings.append(f"⚠️  Category '{area_name}.{category}' is empty")
-                elif len(keywords) < 5:
-                    warnings.append(f"⚠️  Category '{area_name}.{category}' has only {len(keywords)} keywords (recommended: 5+)")
-                
-                # Verificar se keywords são strings válidas
-                for idx, keyword in enumerate(keywords):
-                    if not isinstance(keyword, str):
-                        errors.append(f"❌ [{area_name}.{category}[{idx}]] Keyword should be string, got {type(keyword).__name__}")
-                    elif not keyword.strip():
-                        errors.append(f"❌ [{area_name}.{category}[{idx}]] Keyword is empty")
+                ATS_KEYWORDS_VALIDATOR(keywords, area_name, category, diagnostics.add)
+                if isinstance(keywords, list):
+                    total_keywords += len(keywords)
         
         self.stats['ats_keywords'] = {
             'total_keywords': total_keywords,
@@ -285,36 +402,247 @@ class DatasetValidator:
             'avg_keywords_per_area': total_keywords / areas_count if areas_count > 0 else 0
         }
         
-        return errors, warnings
+        return diagnostics
     
-    def validate_summary_templates(self, data: dict) -> Tuple[List[str], List[str]]:
+    def validate_summary_templates(self, data: dict) -> Diagnostics:
         """Valida templates de sumários (se existir)"""
-        errors = []
-        warnings = []
+        diagnostics = Diagnostics(self.max_samples)
         
         print("📝 Validando summary_templates.json...")
         
         if 'templates_by_role' not in data:
-            warnings.append("⚠️  Missing 'templates_by_role' key (opcional)")
-            return errors, warnings
+            diagnostics.add('missing_optional_key', key='templates_by_role')
+            return diagnostics
         
         templates_by_role = data['templates_by_role']
         total_roles = len(templates_by_role)
         
         for role, levels in templates_by_role.items():
             if not isinstance(levels, dict):
-                errors.append(f"❌ Role '{role}' should have levels as object")
+                diagnostics.add('role_levels_type', role=role)
                 continue
             
             # Verificar se tem pelo menos um nível
             if len(levels) == 0:
-                warnings.append(f"⚠️  Role '{role}' has no seniority levels")
+                diagnostics.add('role_no_levels', role=role)
         
         self.stats['summary_templates'] = {
             'total_roles': total_roles
         }
         
-        return errors, warnings
+        return diagnostics
+    
+    def _expected_files(self) -> List[Tuple[str, Callable]]:
+        """Lista de arquivos esperados e respetivos validadores"""
+        return [
+            ('text_improvement.json', self.validate_text_improvement),
+            ('skills_by_area.json', self.validate_skills_database),
+            ('ats_keywords.json', self.validate_ats_keywords),
+            ('summary_templates.json', self.validate_summary_templates)
+        ]
+    
+    def _dataset_path(self, filename: str) -> Optional[Path]:
+        """Caminho do dataset (documento JSON ou pasta de shards JSONL), None se não existir"""
+        return find_dataset(self.datasets_dir, filename)
+    
+    def _validate_file(self, filename: str, validate: Optional[Callable] = None) -> bool:
+        """Valida um arquivo e mostra o resumo; devolve False se tiver erros"""
+        file_path = self._dataset_path(filename) or self.datasets_dir / filename
+        
+        # Validadores incrementais para os datasets que podem ser muito grandes
+        stream_validators = {
+            'text_improvement.json': self.validate_text_improvement_stream,
+            'skills_by_area.json': self.validate_skills_database_stream
+        }
+        
+        with self.metrics.stage(filename) as stage:
+            try:
+                data = self.datasets.get(filename)
+                if validate is not None:
+                    diagnostics = validate(file_path)
+                elif data is not None:
+                    diagnostics = dict(self._expected_files())[filename](data)
+                elif file_path.is_dir():
+                    diagnostics = self.validate_text_improvement_shards(file_path)
+                elif self.streaming and filename in stream_validators:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        diagnostics = stream_validators[filename](f)
+                else:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self.datasets[filename] = data
+                    
+                    diagnostics = dict(self._expected_files())[filename](data)
+                
+                # Quase duplicados em todo o corpus (assinaturas calculadas na passagem de validação)
+                if filename == 'text_improvement.json' and self._near_duplicates is not None:
+                    self.check_near_duplicates(self._near_duplicates, diagnostics)
+                    self._near_duplicates = None
+                
+                # Itens processados: exemplos, skills, áreas ou roles
+                stats_key, items_key = ITEM_STATS[filename]
+                stage.items = self.stats.get(stats_key, {}).get(items_key)
+                
+                self.diagnostics.merge(diagnostics)
+                
+                if diagnostics.errors:
+                    print(f"   ❌ {diagnostics.errors} erros encontrados")
+                else:
+                    print(f"   ✅ Nenhum erro")
+                
+                if diagnostics.warnings:
+                    print(f"   ⚠️  {diagnostics.warnings} avisos")
+                
+                print()
+                return not diagnostics.errors
+                
+            except json.JSONDecodeError as e:
+                print(f"   ❌ Erro ao parsear JSON: {e}")
+                print()
+                return False
+            except Exception as e:
+                print(f"   ❌ Erro inesperado: {e}")
+                print()
+                return False
+    
+    def _validate_all_parallel(self) -> Tuple[bool, int]:
+        """Valida os arquivos num process pool, juntando resultados pela ordem original"""
+        all_valid = True
+        files_found = 0
+        results = []
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Arquivos inteiros vão para o pool; text_improvement em shards JSONL é dividido por shard
+            for filename, _ in self._expected_files():
+                path = self._dataset_path(filename)
+                if path is None:
+                    results.append((filename, None))
+                elif filename == 'text_improvement.json':
+                    results.append((filename, 'sharded' if path.is_dir() else 'local'))
+                else:
+                    results.append((filename, pool.submit(
+                        _validate_file_task, str(self.datasets_dir), filename, self.streaming, self.metrics.trace_memory,
+                        self.max_samples, self.collect_tables
+                    )))
+            
+            for filename, task in results:
+                if task is None:
+                    if filename != 'summary_templates.json':  # Opcional
+                        print(f"⚠️  {filename} não encontrado")
+                        print()
+                    continue
+                
+                files_found += 1
+                if task == 'sharded':
+                    validator = self._sub_validator(self.workers)
+                    result = _run_captured(
+                        validator, filename,
+                        lambda path: validator._validate_text_improvement_sharded(pool, path)
+                    )
+                elif task == 'local':
+                    # Documento único: os exemplos teriam de passar todos pelo processo principal
+                    print("⚠️  --workers só divide text_improvement em shards JSONL "
+                          "(generate_datasets.py --format jsonl); text_improvement.json validado num só processo")
+                    result = _run_captured(self._sub_validator(1), filename)
+                else:
+                    result = task.result()
+                
+                output, valid, diagnostics, stats, tables, stages = result
+                print(output, end='')
+                self.diagnostics.merge(diagnostics)
+                self.stats.update(stats)
+                self.tables.update(tables)
+                # Etapas medidas no worker (tempo de CPU do processo que validou)
+                self.metrics.extend(stages)
+                if not valid:
+                    all_valid = False
+        
+        return all_valid, files_found
+    
+    def _sub_validator(self, workers: int) -> "DatasetValidator":
+        """Validador com a mesma configuração, para validar um arquivo com o output capturado"""
+        return DatasetValidator(self.streaming, workers, self.shard_size, self.datasets_dir,
+                                self.near_duplicate_threshold, Metrics(self.metrics.pipeline, self.metrics.trace_memory),
+                                max_samples=self.max_samples, collect_tables=self.collect_tables)
+    
+    def _iter_text_shards(self, dataset_dir: Path, structure: dict) -> Iterator[Tuple[str, int, Optional[tuple]]]:
+        """Shards JSONL do índice: (section, offset, (caminho, nº de exemplos)); None numa secção vazia"""
+        index = load_index(dataset_dir)
+        structure['has_metadata'] = bool(index.get('metadata'))
+        if not isinstance(index.get('sections'), dict):
+            return
+        structure['has_sections'] = True
+        for section_name, entries in index['sections'].items():
+            if not entries:
+                # Secção vazia: só conta para as estatísticas
+                yield section_name, 0, None
+                continue
+            offset = 0
+            for entry in entries:
+                yield section_name, offset, (str(dataset_dir / entry['file']), entry.get('count', 0))
+                offset += entry.get('count', 0)
+    
+    def _validate_text_improvement_sharded(self, pool: ProcessPoolExecutor, dataset_dir: Path) -> Diagnostics:
+        """Valida text_improvement em shards JSONL, um shard por tarefa do pool"""
+        diagnostics = Diagnostics(self.max_samples)
+        
+        print(f"📝 Validando text_improvement/ (shards JSONL) ({self.workers} workers)...")
+        
+        structure = {'has_metadata': False, 'has_sections': False}
+        sections = 0
+        columns = _example_stats(self.collect_tables)
+        near_duplicates = self._near_duplicate_detector()
+        pending = deque()
+        
+        def merge(section_name: str, future: Future):
+            shard_diagnostics, shard_columns, shard_near_duplicates, _ = future.result()
+            diagnostics.merge(shard_diagnostics)
+            if shard_columns is not None:
+                columns.merge(shard_columns)
+            if near_duplicates is not None and shard_near_duplicates is not None:
+                near_duplicates.merge(shard_near_duplicates)
+        
+        for section_name, offset, shard in self._iter_text_shards(dataset_dir, structure):
+            if section_name not in columns.sections:
+                sections += 1
+                columns.add(section_name, [], [], [])
+            if shard is None:
+                continue
+            # Cada worker lê o seu shard: só o caminho passa entre processos
+            shard_path, expected = shard
+            task = pool.submit(_validate_jsonl_shard, section_name, offset, shard_path, expected, self.max_samples,
+                               self.near_duplicate_threshold, self.collect_tables)
+            pending.append((section_name, task))
+            
+            # Limitar shards em memória
+            while len(pending) > self.workers * 2:
+                merge(*pending.popleft())
+        
+        while pending:
+            merge(*pending.popleft())
+        
+        if not structure['has_sections']:
+            diagnostics = Diagnostics(self.max_samples)
+            diagnostics.add('missing_key', key='sections', where='shard index')
+            return diagnostics
+        
+        if not structure['has_metadata']:
+            diagnostics.add('missing_metadata', where='shard index')
+        
+        self._finish_text_stats(columns, sections, near_duplicates)
+        
+        return diagnostics
+    
+    def _print_diagnostics(self, severity: str, label: str):
+        """Contagem por código e as primeiras 15 mensagens (até 3 por código)"""
+        codes = self.diagnostics.codes(severity)
+        print("   " + ", ".join(f"{code}: {self.diagnostics.counts[code]}" for code in codes))
+        shown = 0
+        for shown, message in enumerate(self.diagnostics.messages(severity, limit=15, per_code=3), 1):
+            print(f"{shown:2}. {message}")
+        remaining = self.diagnostics.total(severity) - shown
+        if remaining > 0:
+            print(f"\n   ... e mais {remaining} {label}")
     
     def validate_all(self):
         """Valida todos os datasets"""
@@ -332,51 +660,19 @@ class DatasetValidator:
         all_valid = True
         files_found = 0
         
-        # Lista de arquivos esperados
-        expected_files = [
-            ('text_improvement.json', self.validate_text_improvement),
-            ('skills_by_area.json', self.validate_skills_database),
-            ('ats_keywords.json', self.validate_ats_keywords),
-            ('summary_templates.json', self.validate_summary_templates)
-        ]
-        
-        # Validar cada arquivo
-        for filename, validator_func in expected_files:
-            file_path = self.datasets_dir / filename
-            
-            if file_path.exists():
-                files_found += 1
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    errors, warnings = validator_func(data)
-                    self.errors.extend(errors)
-                    self.warnings.extend(warnings)
-                    
-                    if errors:
-                        print(f"   ❌ {len(errors)} erros encontrados")
+        if self.workers > 1:
+            all_valid, files_found = self._validate_all_parallel()
+        else:
+            # Validar cada arquivo
+            for filename, _ in self._expected_files():
+                if self._dataset_path(filename) is not None:
+                    files_found += 1
+                    if not self._validate_file(filename):
                         all_valid = False
-                    else:
-                        print(f"   ✅ Nenhum erro")
-                    
-                    if warnings:
-                        print(f"   ⚠️  {len(warnings)} avisos")
-                    
-                    print()
-                    
-                except json.JSONDecodeError as e:
-                    print(f"   ❌ Erro ao parsear JSON: {e}")
-                    print()
-                    all_valid = False
-                except Exception as e:
-                    print(f"   ❌ Erro inesperado: {e}")
-                    print()
-                    all_valid = False
-            else:
-                if filename != 'summary_templates.json':  # Opcional
-                    print(f"⚠️  {filename} não encontrado")
-                    print()
+                else:
+                    if filename != 'summary_templates.json':  # Opcional
+                        print(f"⚠️  {filename} não encontrado")
+                        print()
         
         if files_found == 0:
             print("❌ Nenhum dataset encontrado!")
@@ -386,22 +682,19 @@ class DatasetValidator:
         # Mostrar erros detalhados
         print("="*70)
         
-        if self.errors:
-            print(f"\n❌ ERROS CRÍTICOS ({len(self.errors)}):")
+        errors = self.diagnostics.errors
+        warnings = self.diagnostics.warnings
+        
+        if errors:
+            print(f"\n❌ ERROS CRÍTICOS ({errors}):")
             print("-"*70)
-            for i, error in enumerate(self.errors[:15], 1):  # Mostrar primeiros 15
-                print(f"{i:2}. {error}")
-            if len(self.errors) > 15:
-                print(f"\n   ... e mais {len(self.errors) - 15} erros")
+            self._print_diagnostics('error', "erros")
         
         # Mostrar avisos
-        if self.warnings:
-            print(f"\n⚠️  AVISOS ({len(self.warnings)}):")
+        if warnings:
+            print(f"\n⚠️  AVISOS ({warnings}):")
             print("-"*70)
-            for i, warning in enumerate(self.warnings[:15], 1):  # Mostrar primeiros 15
-                print(f"{i:2}. {warning}")
-            if len(self.warnings) > 15:
-                print(f"\n   ... e mais {len(self.warnings) - 15} avisos")
+            self._print_diagnostics('warning', "avisos")
         
         # Estatísticas
         if self.stats:
@@ -425,23 +718,145 @@ class DatasetValidator:
         print("\n" + "="*70)
         
         # Resultado final
-        if all_valid and not self.errors:
+        if all_valid and not errors:
             print("✨ VALIDAÇÃO COMPLETA: Todos os datasets estão válidos!")
-            if self.warnings:
-                print(f"⚠️  Existem {len(self.warnings)} avisos - recomendado corrigir")
+            if warnings:
+                print(f"⚠️  Existem {warnings} avisos - recomendado corrigir")
             print("\n🎯 Próximo passo: python scripts/export_to_backend.py")
             return True
         else:
             print("❌ VALIDAÇÃO FALHOU: Corrija os erros críticos antes de prosseguir")
             print(f"\n📊 Resumo:")
-            print(f"   • Erros: {len(self.errors)}")
-            print(f"   • Avisos: {len(self.warnings)}")
+            print(f"   • Erros: {errors}")
+            print(f"   • Avisos: {warnings}")
             return False
 
+def _run_captured(validator: DatasetValidator, filename: str, validate: Optional[Callable] = None) -> tuple:
+    """Valida um arquivo capturando o output para ser mostrado pela ordem original"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        valid = validator._validate_file(filename, validate)
+    return output.getvalue(), valid, validator.diagnostics, validator.stats, validator.tables, validator.metrics.stages
+
+def _validate_file_task(datasets_dir: str, filename: str, streaming: bool, trace_memory: bool = False,
+                        max_samples: int = DEFAULT_MAX_SAMPLES, collect_tables: bool = False) -> tuple:
+    """Worker: valida um arquivo completo num processo separado"""
+    validator = DatasetValidator(streaming=streaming, datasets_dir=datasets_dir,
+                                 metrics=Metrics("validate", trace_memory), max_samples=max_samples,
+                                 collect_tables=collect_tables)
+    return _run_captured(validator, filename)
+
+def _example_stats(collect_tables: bool) -> SectionStats:
+    """Colunas de todos os exemplos (relatório) ou só os acumuladores das estatísticas"""
+    return ExampleColumns() if collect_tables else SectionStats()
+
+def _validate_text_shard(section_name: str, offset: int, examples: list, max_samples: int = DEFAULT_MAX_SAMPLES,
+                         near_duplicate_threshold: float = 0, collect_tables: bool = False) -> tuple:
+    """Worker: valida um shard de exemplos; devolve diagnósticos, estatísticas (colunas se collect_tables),
+    assinaturas MinHash (None se desligado) e nº de exemplos"""
+    diagnostics = Diagnostics(max_samples)
+    examples = list(examples)
+    scores = [DatasetValidator._check_text_example(example, section_name, idx, diagnostics)
+              for idx, example in enumerate(examples, offset)]
+    
+    columns = _example_stats(collect_tables)
+    columns.add(section_name, examples, [ats for ats, _ in scores], [quality for _, quality in scores])
+    
+    near_duplicates = None
+    if near_duplicate_threshold:
+        # Assinaturas calculadas no worker; o processo principal só junta e agrupa
+        near_duplicates = NearDuplicateDetector(near_duplicate_threshold)
+        for idx, example in enumerate(examples, offset):
+            near_duplicates.add_example(section_name, idx, example)
+        near_duplicates.flush()
+    return diagnostics, columns, near_duplicates, len(examples)
+
+def _validate_jsonl_shard(section_name: str, offset: int, shard_path: str, expected: int,
+                          max_samples: int = DEFAULT_MAX_SAMPLES, near_duplicate_threshold: float = 0,
+                          collect_tables: bool = False) -> tuple:
+    """Worker: lê e valida um shard JSONL, confirmando o nº de exemplos do índice"""
+    path = Path(shard_path)
+    if not path.exists():
+        diagnostics = Diagnostics(max_samples)
+        diagnostics.add('shard_missing', shard=path.name)
+        return diagnostics, _example_stats(collect_tables), None, 0
+    
+    try:
+        diagnostics, columns, near_duplicates, count = _validate_text_shard(section_name, offset, iter_shard(path),
+                                                                            max_samples, near_duplicate_threshold,
+                                                                            collect_tables)
+    except (json.JSONDecodeError, OSError, EOFError) as e:
+        diagnostics = Diagnostics(max_samples)
+        diagnostics.add('shard_unreadable', shard=path.name, reason=str(e))
+        return diagnostics, _example_stats(collect_tables), None, 0
+    
+    if count != expected:
+        diagnostics.add('shard_count_mismatch', shard=path.name, count=count, expected=expected)
+    return diagnostics, columns, near_duplicates, count
+
+def parse_args():
+    """Argumentos da linha de comandos"""
+    parser = argparse.ArgumentParser(description="Valida os datasets processados")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Valida text_improvement e skills_by_area em streaming (memória constante)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Número de processos (0 = todos os cores); > 1 ativa a validação paralela "
+             "(text_improvement só em shards JSONL)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=5000,
+        help="Exemplos por bloco na validação em streaming de text_improvement.json (default: 5000)"
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        type=float,
+        help=f"Jaccard mínima para reportar exemplos quase duplicados (default: {DEFAULT_THRESHOLD}, "
+             f"desligado com --stream; 0 = desligado)"
+    )
+    parser.add_argument(
+        "--max-samples",
+        type=int,
+        default=DEFAULT_MAX_SAMPLES,
+        help=f"Exemplos guardados por código de erro/aviso (default: {DEFAULT_MAX_SAMPLES}); os restantes só são contados"
+    )
+    parser.add_argument(
+        "--diagnostics-out",
+        type=Path,
+        help="Grava os erros/avisos em JSON (contagem por código + amostras)"
+    )
+    parser.add_argument(
+        "--report-out",
+        type=Path,
+        help="Grava o relatório de distribuições em JSON (percentis, histogramas, breakdowns, keywords)"
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
 def main():
     """Função principal"""
-    validator = DatasetValidator()
-    success = validator.validate_all()
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    validator = DatasetValidator(streaming=args.stream, workers=workers, shard_size=args.shard_size,
+                                 near_duplicate_threshold=args.near_duplicates,
+                                 metrics=Metrics("validate", trace_memory=args.tracemalloc),
+                                 max_samples=args.max_samples, collect_tables=bool(args.report_out))
+    success = run_with_metrics(validator.metrics, validator.validate_all, args)
+    
+    if args.diagnostics_out:
+        validator.diagnostics.write(args.diagnostics_out)
+        print(f"🩺 Diagnósticos: {args.diagnostics_out}")
+    
+    if args.report_out:
+        write_report(build_report(validator.tables, validator.datasets_dir), args.report_out)
+        print(f"📈 Relatório: {args.report_out}")
     
     # Exit code: 0 = sucesso, 1 = falhou
     exit(0 if success else 1)